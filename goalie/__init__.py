@@ -6,6 +6,8 @@ from goalie.math import *  # noqa
 from goalie.metric import *  # noqa
 from goalie.mesh_seq import *  # noqa
 from goalie.options import *  # noqa
+from goalie.solver_cache import *  # noqa
+from goalie.result_cache import *  # noqa
 from goalie.point_seq import *  # noqa
 from goalie.function_data import *  # noqa
 from goalie.error_estimation import *  # noqa
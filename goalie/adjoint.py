@@ -6,6 +6,7 @@ from functools import wraps
 
 import firedrake
 import numpy as np
+import ufl
 from animate.utility import norm
 from firedrake.adjoint import pyadjoint
 from firedrake.adjoint_utils.solving import get_solve_blocks
@@ -57,9 +58,12 @@ def annotate_qoi(get_qoi):
             j = firedrake.assemble(qoi(*args, **kwargs))
             if pyadjoint.tape.annotate_tape():
                 j.block_variable.adj_value = 1.0
+                mesh_seq._qoi_block_variables.append(j.block_variable)
             return j
 
         mesh_seq.qoi = wrap_qoi
+        # Keep the unassembled QoI, so that it may be differentiated
+        mesh_seq._qoi_form = qoi
         return wrap_qoi
 
     return wrap_get_qoi
@@ -88,6 +92,15 @@ class AdjointMeshSeq(MeshSeq):
         :kwarg get_form: a function as described in :meth:`~.MeshSeq.get_form`
         :kwarg get_solver: a function as described in :meth:`~.MeshSeq.get_solver`
         :kwarg get_qoi: a function as described in :meth:`~.AdjointMeshSeq.get_qoi`
+        :kwarg qoi_type: the type of QoI, from 'end_time', 'time_integrated' and
+            'steady'
+        :type qoi_type: :class:`str`
+        :kwarg adjoint_method: the method used to solve the adjoint problem. Options are
+            'tape' (default), which annotates the forward solve using pyadjoint, and
+            'tape_free', which steps the adjoint equation backwards directly over the
+            forward solution, with the adjoint operator derived from the form - see
+            :meth:`~.AdjointMeshSeq.solve_adjoint` for details
+        :type adjoint_method: :class:`str`
         """
         self.qoi_type = kwargs.pop("qoi_type")
         if self.qoi_type not in ["end_time", "time_integrated", "steady"]:
@@ -96,8 +109,15 @@ class AdjointMeshSeq(MeshSeq):
                 " Choose from 'end_time', 'time_integrated', or 'steady'."
             )
         self._get_qoi = kwargs.get("get_qoi")
+        self.adjoint_method = kwargs.pop("adjoint_method", "tape")
+        if self.adjoint_method not in ["tape", "tape_free"]:
+            raise ValueError(
+                f"Adjoint method '{self.adjoint_method}' not recognised."
+                " Choose from 'tape' or 'tape_free'."
+            )
         self.J = 0
         super().__init__(time_partition, initial_meshes, **kwargs)
+        self.qoi_contributions = np.zeros(len(self))
         if self.qoi_type == "steady" and not self.steady:
             raise ValueError(
                 "QoI type is set to 'steady' but the time partition is not steady."
@@ -107,6 +127,11 @@ class AdjointMeshSeq(MeshSeq):
                 f"Time partition is steady but the QoI type is set to '{self.qoi_type}'."
             )
         self._controls = None
+        self._qoi_block_variables = []
+        self._tapes = {}
+        self._block_index = None
+        self._output_positions = {}
+        self._dependency_positions = {}
         self.qoi_values = []
 
     @property
@@ -178,12 +203,52 @@ class AdjointMeshSeq(MeshSeq):
             self.J = qoi(**solver_kwargs.get("qoi_kwargs", {}))
         return checkpoints
 
+    def _solve_block_index(self):
+        """
+        Get an index of the solve blocks on the working tape, rebuilding it if the tape
+        has changed since it was last built.
+
+        The index holds the solve blocks associated with each field, along with the
+        (field, subinterval) pairs which have already been validated.
+
+        :returns: the index, or ``None`` if there is no tape
+        :rtype: :class:`dict`
+        """
+        tape = pyadjoint.get_working_tape()
+        if tape is None:
+            return None
+        blocks = tape.get_blocks()
+        index = self._block_index
+        if (
+            index is not None
+            and index["tape"] is tape
+            and index["num_blocks"] == len(blocks)
+            and (
+                len(blocks) == 0
+                or (index["first"] is blocks[0] and index["last"] is blocks[-1])
+            )
+        ):
+            return index
+        self._block_index = {
+            "tape": tape,
+            "num_blocks": len(blocks),
+            "first": blocks[0] if len(blocks) > 0 else None,
+            "last": blocks[-1] if len(blocks) > 0 else None,
+            "solve_blocks": get_solve_blocks() if len(blocks) > 0 else [],
+            "fields": {},
+            "validated": set(),
+        }
+        return self._block_index
+
     @PETSc.Log.EventDecorator()
     def get_solve_blocks(self, field, subinterval, has_adj_sol=True):
         r"""
         Get all blocks of the tape corresponding to solve steps for prognostic solution
         field on a given subinterval.
 
+        The tape is only scanned and the blocks validated once per annotation, with the
+        results being stored in an index.
+
         :arg field: name of the prognostic solution field
         :type field: :class:`str`
         :arg subinterval: subinterval index
@@ -194,35 +259,68 @@ class AdjointMeshSeq(MeshSeq):
         :returns: list of solve blocks
         :rtype: :class:`list` of :class:`pyadjoint.block.Block`\s
         """
-        tape = pyadjoint.get_working_tape()
-        if tape is None:
+        index = self._solve_block_index()
+        if index is None:
             self.warning("Tape does not exist!")
             return []
 
-        blocks = tape.get_blocks()
-        if len(blocks) == 0:
+        if index["num_blocks"] == 0:
             self.warning("Tape has no blocks!")
-            return blocks
+            return []
 
         # Restrict to solve blocks
-        solve_blocks = get_solve_blocks()
-        if len(solve_blocks) == 0:
+        if len(index["solve_blocks"]) == 0:
             self.warning("Tape has no solve blocks!")
-            return solve_blocks
+            return []
 
         # Select solve blocks whose tags correspond to the field name
-        solve_blocks = [
-            block
-            for block in solve_blocks
-            if isinstance(block.tag, str) and block.tag.startswith(field)
-        ]
+        if field not in index["fields"]:
+            index["fields"][field] = [
+                block
+                for block in index["solve_blocks"]
+                if isinstance(block.tag, str) and block.tag.startswith(field)
+            ]
+        solve_blocks = index["fields"][field]
         N = len(solve_blocks)
         if N == 0:
             self.warning(
                 f"No solve blocks associated with field '{field}'."
                 " Has ad_block_tag been used correctly?"
             )
+            return []
+        if (field, subinterval) not in index["validated"]:
+            self._validate_solve_blocks(field, subinterval, solve_blocks)
+            index["validated"].add((field, subinterval))
+        if not has_adj_sol:
             return solve_blocks
+
+        # Check that adjoint solutions exist
+        if all(block.adj_sol is None for block in solve_blocks):
+            self.warning(
+                "No block has an adjoint solution. Has the adjoint equation been solved?"
+            )
+
+        # Default adjoint solution to zero, rather than None
+        for block in solve_blocks:
+            if block.adj_sol is None:
+                block.adj_sol = firedrake.Function(
+                    self.function_spaces[field][subinterval], name=field
+                )
+        return solve_blocks
+
+    def _validate_solve_blocks(self, field, subinterval, solve_blocks):
+        r"""
+        Check that a list of solve blocks is consistent with the function spaces and
+        time partition for a given field and subinterval.
+
+        :arg field: name of the prognostic solution field
+        :type field: :class:`str`
+        :arg subinterval: subinterval index
+        :type subinterval: :class:`int`
+        :arg solve_blocks: list of solve blocks
+        :type solve_blocks: :class:`list` of :class:`pyadjoint.block.Block`\s
+        """
+        N = len(solve_blocks)
         self.debug(
             f"Field '{field}' on subinterval {subinterval} has {N} solve blocks."
         )
@@ -252,28 +350,35 @@ class AdjointMeshSeq(MeshSeq):
                 f" field '{field}' on subinterval {subinterval}: {num_timesteps} vs."
                 f" {N}."
             )
-        if not has_adj_sol:
-            return solve_blocks
-
-        # Check that adjoint solutions exist
-        if all(block.adj_sol is None for block in solve_blocks):
-            self.warning(
-                "No block has an adjoint solution. Has the adjoint equation been solved?"
-            )
 
-        # Default adjoint solution to zero, rather than None
-        for block in solve_blocks:
-            if block.adj_sol is None:
-                block.adj_sol = firedrake.Function(
-                    self.function_spaces[field][subinterval], name=field
-                )
-        return solve_blocks
+    @staticmethod
+    def _matches(block_variable, fs, name):
+        """
+        :arg block_variable: a block variable
+        :type block_variable: :class:`pyadjoint.block_variable.BlockVariable`
+        :arg fs: the expected function space
+        :type fs: :class:`firedrake.functionspaceimpl.FunctionSpace`
+        :arg name: the expected name
+        :type name: :class:`str`
+        :returns: ``True`` if the block variable corresponds to a
+            :class:`firedrake.function.Function` in the given space with the given name
+        :rtype: :class:`bool`
+        """
+        output = block_variable.output
+        return (
+            isinstance(output, firedrake.Function)
+            and output.function_space() == fs
+            and output.name() == name
+        )
 
     def _output(self, field, subinterval, solve_block):
         """
         For a given solve block and solution field, get the block's outputs corresponding
         to the solution from the current timestep.
 
+        The position of the output is stored once it has been determined, so that
+        subsequent blocks can be checked at that position first.
+
         :arg field: field of interest
         :type field: :class:`str`
         :arg subinterval: subinterval index
@@ -286,27 +391,24 @@ class AdjointMeshSeq(MeshSeq):
         # TODO #93: Inconsistent return value - can be None
         fs = self.function_spaces[field][subinterval]
 
+        # Check the previously resolved position first
+        outputs = solve_block._outputs
+        position = self._output_positions.get((field, subinterval))
+        if position is not None and position < len(outputs):
+            if self._matches(outputs[position], fs, field):
+                return outputs[position]
+
         # Loop through the solve block's outputs
-        candidates = []
-        for out in solve_block._outputs:
-            # Look for Functions with matching function spaces
-            if not isinstance(out.output, firedrake.Function):
-                continue
-            if out.output.function_space() != fs:
-                continue
-
-            # Look for Functions whose name matches that of the field
-            # NOTE: Here we assume that the user has set this correctly in their
-            #       get_solver method
-            if not out.output.name() == field:
-                continue
-
-            # Add to the list of candidates
-            candidates.append(out)
+        # NOTE: Here we assume that the user has set the name of the Function
+        #       correctly in their get_solver method
+        candidates = [
+            i for i, out in enumerate(outputs) if self._matches(out, fs, field)
+        ]
 
         # Check for existence and uniqueness
         if len(candidates) == 1:
-            return candidates[0]
+            self._output_positions[(field, subinterval)] = candidates[0]
+            return outputs[candidates[0]]
         elif len(candidates) > 1:
             raise AttributeError(
                 "Cannot determine a unique output index for the solution associated"
@@ -323,6 +425,9 @@ class AdjointMeshSeq(MeshSeq):
         For a given solve block and solution field, get the block's dependency which
         corresponds to the solution from the previous timestep.
 
+        The position of the dependency is stored once it has been determined, so that
+        subsequent blocks can be checked at that position first.
+
         :arg field: field of interest
         :type field: :class:`str`
         :arg subinterval: subinterval index
@@ -336,28 +441,26 @@ class AdjointMeshSeq(MeshSeq):
         if self.field_types[field] == "steady":
             return
         fs = self.function_spaces[field][subinterval]
+        name = f"{field}_old"
+
+        # Check the previously resolved position first
+        dependencies = solve_block._dependencies
+        position = self._dependency_positions.get((field, subinterval))
+        if position is not None and position < len(dependencies):
+            if self._matches(dependencies[position], fs, name):
+                return dependencies[position]
 
         # Loop through the solve block's dependencies
-        candidates = []
-        for dep in solve_block._dependencies:
-            # Look for Functions with matching function spaces
-            if not isinstance(dep.output, firedrake.Function):
-                continue
-            if dep.output.function_space() != fs:
-                continue
-
-            # Look for Functions whose name is the lagged version of the field's
-            # NOTE: Here we assume that the user has set this correctly in their
-            #       get_solver method
-            if not dep.output.name() == f"{field}_old":
-                continue
-
-            # Add to the list of candidates
-            candidates.append(dep)
+        # NOTE: Here we assume that the user has set the name of the Function
+        #       correctly in their get_solver method
+        candidates = [
+            i for i, dep in enumerate(dependencies) if self._matches(dep, fs, name)
+        ]
 
         # Check for existence and uniqueness
         if len(candidates) == 1:
-            return candidates[0]
+            self._dependency_positions[(field, subinterval)] = candidates[0]
+            return dependencies[candidates[0]]
         elif len(candidates) > 1:
             raise AttributeError(
                 "Cannot determine a unique dependency index for the lagged solution"
@@ -369,6 +472,13 @@ class AdjointMeshSeq(MeshSeq):
                 " dependencies."
             )
 
+    def _set_time_partition(self, time_partition):
+        # Tapes annotated with the previous timesteps cannot be replayed
+        if time_partition is not self.time_partition:
+            self._tapes = {}
+            self._block_index = None
+        super()._set_time_partition(time_partition)
+
     def _create_solutions(self):
         """
         Create the :class:`~.FunctionData` instance for holding solution data.
@@ -382,12 +492,19 @@ class AdjointMeshSeq(MeshSeq):
         adj_solver_kwargs=None,
         get_adj_values=False,
         test_checkpoint_qoi=False,
+        constant_adjoint_operator=False,
+        reuse_tape=False,
     ):
         """
         Solve an adjoint problem on a sequence of subintervals.
 
         As well as the quantity of interest value, solution fields are computed - see
-        :class:`~.AdjointSolutionData` for more information.
+        :class:`~.AdjointSolutionData` for more information. If the mesh sequence has a
+        result cache then these are reloaded from it where possible.
+
+        If the ``adjoint_method`` is 'tape_free' then the adjoint problem is solved
+        without annotating the tape - see
+        :meth:`~.AdjointMeshSeq._solve_adjoint_tape_free`.
 
         :kwarg solver_kwargs: parameters for the forward solver, as well as any
             parameters for the QoI, which should be included as a sub-dictionary with key
@@ -402,9 +519,83 @@ class AdjointMeshSeq(MeshSeq):
         :type get_adj_values: :class:`bool`
         :kwarg test_checkpoint_qoi: solve over the final subinterval when checkpointing
             so that the QoI value can be checked across runs
+        :kwarg constant_adjoint_operator: if ``True``, the adjoint operator is assumed to
+            be the same for every timestep of a subinterval, so that it is only factorised
+            once per subinterval and field, with the factorisation being used to
+            precondition all subsequent adjoint solves using GMRES. Operators which vary
+            in time are still solved correctly, albeit with more Krylov iterations. Note
+            that the adjoint operator is still assembled for every solve, so only the
+            cost of factorisation is saved.
+        :type constant_adjoint_operator: :class:`bool`
+        :kwarg reuse_tape: if ``True``, the tape annotated on each subinterval is kept
+            and, on subsequent calls, is replayed from the new initial condition rather
+            than being annotated again, provided the mesh is unchanged. This trades
+            memory for speed and assumes the solver keyword arguments are unchanged.
+        :type reuse_tape: :class:`bool`
         :returns: the solution data of the forward and adjoint solves
         :rtype: :class:`~.AdjointSolutionData`
         """
+        cache = self._result_cache
+        if cache is not None:
+            kwargs = {
+                "solver_kwargs": solver_kwargs,
+                "adj_solver_kwargs": adj_solver_kwargs,
+                "get_adj_values": get_adj_values,
+                "test_checkpoint_qoi": test_checkpoint_qoi,
+                "constant_adjoint_operator": constant_adjoint_operator,
+                "reuse_tape": reuse_tape,
+            }
+            key = cache.key(self, "adjoint", kwargs, version=self._problem_version)
+            self._create_solutions()
+            metadata = cache.load(key, self.solutions)
+            if metadata is not None:
+                self.J = metadata["J"]
+                self.qoi_contributions = np.array(metadata["qoi_contributions"])
+                return self.solutions
+        for _ in self._solve_adjoint(
+            solver_kwargs=solver_kwargs,
+            adj_solver_kwargs=adj_solver_kwargs,
+            get_adj_values=get_adj_values,
+            test_checkpoint_qoi=test_checkpoint_qoi,
+            constant_adjoint_operator=constant_adjoint_operator,
+            reuse_tape=reuse_tape,
+        ):
+            pass
+        if cache is not None:
+            cache.store(
+                key,
+                self.solutions,
+                J=float(self.J),
+                qoi_contributions=self.qoi_contributions.tolist(),
+            )
+        return self.solutions
+
+    def _solve_adjoint(
+        self,
+        solver_kwargs=None,
+        adj_solver_kwargs=None,
+        get_adj_values=False,
+        test_checkpoint_qoi=False,
+        constant_adjoint_operator=False,
+        reuse_tape=False,
+        first_subinterval=0,
+    ):
+        """
+        Generator for solving an adjoint problem on a sequence of subintervals, which
+        yields the index of each subinterval, in reverse order, once its solution data
+        are complete.
+
+        The contribution to the QoI value from each subinterval is recorded in
+        :attr:`qoi_contributions`.
+
+        :kwarg first_subinterval: the index of the earliest subinterval on which to
+            solve the adjoint problem. The sweep stops once this subinterval has been
+            processed, in which case the QoI value only includes contributions from the
+            later subintervals
+        :type first_subinterval: :class:`int`
+
+        All other keyword arguments are as for :meth:`~.AdjointMeshSeq.solve_adjoint`.
+        """
         # TODO #125: Support get_adj_values in AdjointSolutionData
         # TODO #126: Separate out qoi_kwargs
         solver_kwargs = solver_kwargs or {}
@@ -428,6 +619,7 @@ class AdjointMeshSeq(MeshSeq):
 
         # Reset the QoI to zero
         self.J = 0
+        self.qoi_contributions = np.zeros(num_subintervals)
 
         if get_adj_values:
             for field in self.fields:
@@ -440,6 +632,16 @@ class AdjointMeshSeq(MeshSeq):
                         ]
                     )
 
+        if self.adjoint_method == "tape_free":
+            yield from self._solve_adjoint_tape_free(
+                checkpoints,
+                solver_kwargs=solver_kwargs,
+                adj_solver_kwargs=adj_solver_kwargs,
+                get_adj_values=get_adj_values,
+                first_subinterval=first_subinterval,
+            )
+            return
+
         @PETSc.Log.EventDecorator("goalie.AdjointMeshSeq.solve_adjoint.evaluate_fwd")
         @wraps(solver)
         def wrapped_solver(subinterval, initial_condition_map, **kwargs):
@@ -470,50 +672,89 @@ class AdjointMeshSeq(MeshSeq):
 
         # Loop over subintervals in reverse
         seeds = {}
-        for i in reversed(range(num_subintervals)):
+        working_tape = pyadjoint.get_working_tape()
+        for i in reversed(range(first_subinterval, num_subintervals)):
+            J_start = float(self.J)
             stride = tp.num_timesteps_per_export[i]
             num_exports = tp.num_exports_per_subinterval[i]
 
-            # Clear tape and start annotation
-            if not pyadjoint.annotate_tape():
-                pyadjoint.continue_annotation()
-            tape = pyadjoint.get_working_tape()
-            if tape is not None:
-                tape.clear_tape()
-
-            # Initialise the solver generator
-            solver_gen = wrapped_solver(i, checkpoints[i], **solver_kwargs)
-
-            # Annotate tape on current subinterval
-            for _ in range(tp.num_timesteps_per_subinterval[i]):
-                next(solver_gen)
-            pyadjoint.pause_annotation()
-
-            # Final solution is used as the initial condition for the next subinterval
-            checkpoint = {
-                field: sol[0] if self.field_types[field] == "unsteady" else sol
-                for field, sol in self.fields.items()
-            }
+            if reuse_tape and self._tapes.get(i, {}).get("mesh") is self[i]:
+                # Replay the existing tape from the new initial condition
+                checkpoint = self._replay_tape(i, checkpoints[i])
+                tape = self._tapes[i]["tape"]
+            else:
+                # Clear tape and start annotation
+                if not pyadjoint.annotate_tape():
+                    pyadjoint.continue_annotation()
+                if reuse_tape:
+                    pyadjoint.set_working_tape(pyadjoint.Tape())
+                tape = pyadjoint.get_working_tape()
+                if tape is not None:
+                    tape.clear_tape()
+                    self._block_index = None
+                self._qoi_block_variables = []
+
+                # Initialise the solver generator
+                solver_gen = wrapped_solver(i, checkpoints[i], **solver_kwargs)
+
+                # Annotate tape on current subinterval
+                for _ in range(tp.num_timesteps_per_subinterval[i]):
+                    next(solver_gen)
+                pyadjoint.pause_annotation()
+
+                # Evaluate end time QoIs
+                if i == num_subintervals - 1:
+                    if self.qoi_type in ["end_time", "steady"]:
+                        pyadjoint.continue_annotation()
+                        qoi = self.get_qoi(i)
+                        self.J = qoi(**qoi_kwargs)
+                        if np.isclose(float(self.J), 0.0):
+                            self.warning("Zero QoI. Is it implemented as intended?")
+                        pyadjoint.pause_annotation()
+
+                # Final solution is used as the initial condition for the next
+                # subinterval
+                checkpoint = {
+                    field: (sol[0] if self.field_types[field] == "unsteady" else sol)
+                    for field, sol in self.fields.items()
+                }
+                if reuse_tape:
+                    self._tapes[i] = {
+                        "mesh": self[i],
+                        "tape": tape,
+                        "controls": self._controls,
+                        "checkpoint": checkpoint,
+                        "outputs": {
+                            field: sol.block_variable
+                            for field, sol in checkpoint.items()
+                        },
+                        "qoi": self._qoi_block_variables,
+                    }
 
             # Get seed vector for reverse propagation
-            if i == num_subintervals - 1:
-                if self.qoi_type in ["end_time", "steady"]:
-                    pyadjoint.continue_annotation()
-                    qoi = self.get_qoi(i)
-                    self.J = qoi(**qoi_kwargs)
-                    if np.isclose(float(self.J), 0.0):
-                        self.warning("Zero QoI. Is it implemented as intended?")
-                    pyadjoint.pause_annotation()
-            else:
+            if i < num_subintervals - 1:
                 for field, fs in self.function_spaces.items():
-                    checkpoint[field].block_variable.adj_value = self._transfer(
-                        seeds[field], fs[i]
+                    block_variable = (
+                        self._tapes[i]["outputs"][field]
+                        if reuse_tape
+                        else checkpoint[field].block_variable
                     )
+                    block_variable.adj_value = self._transfer(seeds[field], fs[i])
 
             # Update adjoint solver kwargs
             for field in self.fields:
+                field_adj_solver_kwargs = adj_solver_kwargs
+                if constant_adjoint_operator:
+                    # The Krylov method and preconditioner take precedence over any
+                    # provided, since the reused factorisation is only approximate
+                    cache = self._solver_cache
+                    field_adj_solver_kwargs = dict(adj_solver_kwargs)
+                    field_adj_solver_kwargs["solver_parameters"] = {
+                        **adj_solver_kwargs.get("solver_parameters", {}),
+                        **cache.factorisation_parameters(f"{i}_{field}", self[i]),
+                    }
                 for block in self.get_solve_blocks(field, i, has_adj_sol=False):
-                    block.adj_kwargs.update(adj_solver_kwargs)
+                    block.adj_kwargs.update(field_adj_solver_kwargs)
 
             # Solve adjoint problem
             tape = pyadjoint.get_working_tape()
@@ -621,19 +862,245 @@ class AdjointMeshSeq(MeshSeq):
                             " subinterval is zero."
                         )
 
-            # Clear the tape to reduce the memory footprint
-            tape.clear_tape()
+            # Clear the tape and any cached factorisations to reduce the memory footprint
+            if not reuse_tape:
+                tape.clear_tape()
+                self._block_index = None
+            if constant_adjoint_operator:
+                for field in self.fields:
+                    self._solver_cache.clear_factorisation(f"{i}_{field}")
+            self.qoi_contributions[i] = float(self.J) - J_start
+            yield i
 
         # Check the QoI value agrees with that due to the checkpointing run
-        if self.qoi_type == "time_integrated" and test_checkpoint_qoi:
+        full_sweep = first_subinterval == 0
+        if self.qoi_type == "time_integrated" and test_checkpoint_qoi and full_sweep:
             if not np.isclose(J_chk, self.J):
                 raise ValueError(
                     "QoI values computed during checkpointing and annotated"
                     f" run do not match ({J_chk} vs. {self.J})"
                 )
 
-        tape.clear_tape()
-        return self.solutions
+        if reuse_tape:
+            pyadjoint.set_working_tape(working_tape)
+        else:
+            tape.clear_tape()
+            self._block_index = None
+
+    @PETSc.Log.EventDecorator()
+    def _replay_tape(self, subinterval, initial_condition_map):
+        """
+        Recompute the tape stored for a subinterval from a new initial condition and
+        prepare it for evaluating the adjoint.
+
+        :arg subinterval: the subinterval index
+        :type subinterval: :class:`int`
+        :arg initial_condition_map: a dictionary of initial conditions, keyed by field
+            name
+        :type initial_condition_map: :class:`dict` with :class:`str` keys and
+            :class:`firedrake.function.Function` values
+        :returns: the final solution fields on the subinterval
+        :rtype: :class:`dict` with :class:`str` keys and
+            :class:`firedrake.function.Function` values
+        """
+        stored = self._tapes[subinterval]
+        tape = stored["tape"]
+        pyadjoint.set_working_tape(tape)
+        self._controls = stored["controls"]
+        for field, control in zip(self.fields, self._controls):
+            control.update(initial_condition_map[field])
+            control.mark_as_control()
+        with pyadjoint.stop_annotating():
+            tape.reset_blocks()
+            tape.recompute()
+        for control in self._controls:
+            control.unmark_as_control()
+        tape.reset_variables()
+
+        # Reseed the QoI contributions and update the QoI value
+        for block_variable in stored["qoi"]:
+            block_variable.adj_value = 1.0
+            self.J += float(block_variable.saved_output)
+        if self.qoi_type in ["end_time", "steady"] and subinterval == len(self) - 1:
+            if np.isclose(float(self.J), 0.0):
+                self.warning("Zero QoI. Is it implemented as intended?")
+        return stored["checkpoint"]
+
+    def _solve_adjoint_tape_free(
+        self,
+        checkpoints,
+        solver_kwargs=None,
+        adj_solver_kwargs=None,
+        get_adj_values=False,
+        first_subinterval=0,
+    ):
+        r"""
+        Solve an adjoint problem on a sequence of subintervals without annotating the
+        tape.
+
+        On each subinterval, the forward problem is re-solved from the checkpoint and
+        the solution is stored at every timestep. The adjoint equation is then stepped
+        backwards directly, with the adjoint operator derived from the form returned by
+        :meth:`~.MeshSeq.get_form` and homogenised versions of the boundary conditions
+        returned by :meth:`~.MeshSeq.get_bcs`. The form is linearised about the stored
+        forward solution at each timestep, but its other coefficients are frozen, so
+        they are required to take the same values at every timestep. A
+        :class:`NotImplementedError` is raised if any of them change during the forward
+        solve.
+
+        Only problems with a single field are currently supported.
+
+        :arg checkpoints: the initial conditions on each subinterval
+        :type checkpoints: :class:`list` of :class:`dict`\s with :class:`str` keys and
+            :class:`firedrake.function.Function` values
+        :kwarg solver_kwargs: parameters for the forward solver, as well as any
+            parameters for the QoI, which should be included as a sub-dictionary with key
+            'qoi_kwargs'
+        :type solver_kwargs: :class:`dict` with :class:`str` keys and values which may
+            take various types
+        :kwarg adj_solver_kwargs: parameters for the adjoint solver
+        :type adj_solver_kwargs: :class:`dict` with :class:`str` keys and values which
+            may take various types
+        :kwarg get_adj_values: if ``True``, adjoint actions are also returned at exported
+            timesteps
+        :type get_adj_values: :class:`bool`
+        :kwarg first_subinterval: the index of the earliest subinterval on which to
+            solve the adjoint problem
+        :type first_subinterval: :class:`int`
+        :returns: a generator which yields the index of each subinterval, in reverse
+            order, once its solution data are complete
+        """
+        if len(self.fields) > 1:
+            raise NotImplementedError(
+                "Tape-free adjoint solves are only supported for a single field."
+            )
+        solver_kwargs = solver_kwargs or {}
+        adj_solver_kwargs = adj_solver_kwargs or {}
+        tp = self.time_partition
+        qoi_kwargs = solver_kwargs.get("qoi_kwargs", {})
+        field = next(iter(self.fields))
+        steady_field = self.field_types[field] == "steady"
+        solutions = self.solutions.extract(layout="field")[field]
+
+        # Loop over subintervals in reverse
+        seed = adjoint_start = None
+        for i in reversed(range(first_subinterval, len(self))):
+            J_start = float(self.J)
+            with pyadjoint.stop_annotating():
+                fs = self.function_spaces[field][i]
+                stride = tp.num_timesteps_per_export[i]
+                num_timesteps = tp.num_timesteps_per_subinterval[i]
+                t_start = tp.subintervals[i][0]
+                dt = tp.timesteps[i]
+
+                # Solve forward over the subinterval, storing the solution at each step
+                self._reinitialise_fields(checkpoints[i])
+                u, u_ = (
+                    (self.fields[field], None) if steady_field else self.fields[field]
+                )
+                F = self.form(i)[field]
+                frozen = self._frozen_coefficients(F, (u, u_))
+                states = [self._acquire_function(fs).assign(u if steady_field else u_)]
+                solver_gen = self.solver(i, **solver_kwargs)
+                for _ in range(num_timesteps):
+                    next(solver_gen)
+                    states.append(self._acquire_function(fs).assign(u))
+                    for coefficient, value in frozen:
+                        if not np.array_equal(coefficient.dat.data_ro, value):
+                            raise NotImplementedError(
+                                "Tape-free adjoint solves require the coefficients of"
+                                f" the form to be time-independent, but '{coefficient}'"
+                                f" changed on the {self.th(i)} subinterval."
+                            )
+
+                # Evaluate the QoI and derive the adjoint operators from the form
+                qoi = self.get_qoi(i)
+                qoi_form = self._qoi_form
+                if self.qoi_type in ["end_time", "steady"] and i == len(self) - 1:
+                    self.J = qoi(**qoi_kwargs)
+                    if np.isclose(float(self.J), 0.0):
+                        self.warning("Zero QoI. Is it implemented as intended?")
+                bcs = firedrake.homogenize(self.get_bcs()(i).get(field, []))
+                adj_F = ufl.adjoint(ufl.derivative(F, u))
+                adj_F_old = None if steady_field else ufl.adjoint(ufl.derivative(F, u_))
+
+                # Step the adjoint equation backwards in time
+                adjoint = firedrake.Function(fs)
+                adjoint_next = self._acquire_function(fs)
+                if adjoint_start is not None:
+                    self._transfer(adjoint_start, adjoint_next)
+                adj_value = None
+                for n in reversed(range(num_timesteps)):
+                    u.assign(states[n + 1])
+                    if not steady_field:
+                        u_.assign(states[n])
+
+                    # Assemble the right-hand side from the QoI and the later timestep
+                    rhs = firedrake.Cofunction(fs.dual())
+                    if self.qoi_type == "time_integrated":
+                        dJdu = ufl.derivative(qoi_form(t_start + n * dt), u)
+                        rhs += firedrake.assemble(dJdu)
+                    elif i == len(self) - 1 and n == num_timesteps - 1:
+                        dJdu = ufl.derivative(qoi_form(**qoi_kwargs), u)
+                        rhs += firedrake.assemble(dJdu)
+                    if n < num_timesteps - 1:
+                        rhs += adj_value
+                    elif seed is not None:
+                        rhs += self._transfer(seed, fs)
+
+                    # Solve the adjoint equation and compute its action on the lagged
+                    # field
+                    A = firedrake.assemble(adj_F, bcs=bcs)
+                    for bc in bcs:
+                        bc.apply(rhs)
+                    firedrake.solve(A, adjoint, rhs, **adj_solver_kwargs)
+                    if not steady_field:
+                        adj_value = firedrake.assemble(-ufl.action(adj_F_old, adjoint))
+
+                    # Update the solution data at export times
+                    if (n + 1) % stride == 0:
+                        j = (n + 1) // stride - 1
+                        solutions.forward[i][j].assign(states[n + 1])
+                        solutions.adjoint[i][j].assign(adjoint)
+                        if not self.steady:
+                            solutions.forward_old[i][j].assign(states[n])
+                            solutions.adjoint_next[i][j].assign(adjoint_next)
+                        if get_adj_values and adj_value is not None:
+                            solutions.adj_value[i][j].assign(adj_value)
+                    adjoint_next.assign(adjoint)
+
+                # Check non-zero adjoint solution
+                if np.isclose(norm(solutions.adjoint[i][0]), 0.0):
+                    self.warning(
+                        f"Adjoint solution for field '{field}' on {self.th(i)}"
+                        " subinterval is zero."
+                    )
+
+                # The adjoint action on the initial condition seeds the previous
+                # subinterval
+                seed = adj_value
+                adjoint_start = adjoint
+                self._release_function(adjoint_next, *states)
+            self.qoi_contributions[i] = float(self.J) - J_start
+            yield i
+
+    @staticmethod
+    def _frozen_coefficients(form, solution):
+        r"""
+        :arg form: the form to consider
+        :type form: :class:`ufl.form.Form`
+        :arg solution: the current and lagged solutions, which are excluded
+        :type solution: :class:`tuple` of :class:`firedrake.function.Function`\s
+        :returns: the other coefficients and constants of the form, along with copies
+            of their current values
+        :rtype: :class:`list` of :class:`tuple`\s
+        """
+        exclude = {id(f) for f in solution if f is not None}
+        return [
+            (c, c.dat.data_ro.copy())
+            for c in (*form.coefficients(), *form.constants())
+            if id(c) not in exclude
+        ]
 
     @staticmethod
     def th(num):
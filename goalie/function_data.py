@@ -3,9 +3,11 @@ Nested dictionaries of solution data :class:`~.Function`\s.
 """
 
 from abc import ABC, abstractmethod
+from functools import partial
 
 import firedrake.function as ffunc
 import firedrake.functionspace as ffs
+import numpy as np
 
 from .utility import AttrDict
 
@@ -16,6 +18,47 @@ __all__ = [
 ]
 
 
+class _SubintervalData(list):
+    """
+    A list of field data indexed by subinterval, whose entries are only allocated when
+    they are first accessed and may be freed once they are no longer required.
+    """
+
+    def __init__(self, allocate, num_subintervals):
+        """
+        :arg allocate: function which maps a subinterval index to its field data
+        :arg num_subintervals: the number of subintervals
+        """
+        super().__init__([None] * num_subintervals)
+        self._allocate = allocate
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        value = super().__getitem__(index)
+        if value is None:
+            value = self._allocate(range(len(self))[index])
+            super().__setitem__(index, value)
+        return value
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reversed__(self):
+        for i in reversed(range(len(self))):
+            yield self[i]
+
+    def free(self, index):
+        """
+        Free the field data associated with a subinterval. It is reallocated if it is
+        accessed again.
+
+        :arg index: the subinterval index
+        """
+        super().__setitem__(index, None)
+
+
 class FunctionData(ABC):
     """
     Abstract base class for classes holding field data.
@@ -32,6 +75,7 @@ class FunctionData(ABC):
         self.time_partition = time_partition
         self.function_spaces = function_spaces
         self._data = None
+        self._views = {}
         self.labels = self._label_dict[
             "steady" if time_partition.steady else "unsteady"
         ]
@@ -39,17 +83,14 @@ class FunctionData(ABC):
     def _create_data(self):
         assert self._label_dict
         tp = self.time_partition
+        self._views.clear()
         self._data = AttrDict(
             {
                 field: AttrDict(
                     {
-                        label: [
-                            [
-                                ffunc.Function(fs, name=f"{field}_{label}")
-                                for j in range(tp.num_exports_per_subinterval[i] - 1)
-                            ]
-                            for i, fs in enumerate(self.function_spaces[field])
-                        ]
+                        label: _SubintervalData(
+                            partial(self._allocate, field, label), tp.num_subintervals
+                        )
                         for label in self._label_dict[field_type]
                     }
                 )
@@ -57,6 +98,49 @@ class FunctionData(ABC):
             }
         )
 
+    def _view(self, layout, build):
+        """
+        Get a cached view of the field data in a given layout, building it if required.
+
+        :arg layout: the layout
+        :type layout: :class:`str`
+        :arg build: function which builds the view
+        :returns: the view
+        """
+        if self._data is None:
+            self._create_data()
+        view = self._views.get(layout)
+        if view is None:
+            view = self._views[layout] = build()
+        return view
+
+    def _allocate(self, field, label, subinterval):
+        """
+        Allocate the field data for a given field, label and subinterval.
+        """
+        tp = self.time_partition
+        fs = self.function_spaces[field][subinterval]
+        return [
+            ffunc.Function(fs, name=f"{field}_{label}")
+            for j in range(tp.num_exports_per_subinterval[subinterval] - 1)
+        ]
+
+    def free(self, subinterval):
+        r"""
+        Free the field data associated with a subinterval, so that memory may be
+        reclaimed once it is no longer required. The data are reallocated as zero
+        :class:`~.Function`\s if they are accessed again.
+
+        :arg subinterval: the subinterval index
+        :type subinterval: :class:`int`
+        """
+        if self._data is None:
+            return
+        for by_label in self._data.values():
+            for data in by_label.values():
+                if isinstance(data, _SubintervalData):
+                    data.free(subinterval)
+
     @property
     def _data_by_field(self):
         """
@@ -82,15 +166,20 @@ class FunctionData(ABC):
         whose first key is the field label and second key is the field name. Entries
         of the doubly-nested dictionary are doubly-nested lists, which retain the default
         layout: indexed first by subinterval and then by export.
+
+        The view is cached until the field data are reallocated.
         """
         tp = self.time_partition
-        return AttrDict(
-            {
-                label: AttrDict(
-                    {f: self._data_by_field[f][label] for f in tp.field_names}
-                )
-                for label in self.labels
-            }
+        return self._view(
+            "label",
+            lambda: AttrDict(
+                {
+                    label: AttrDict(
+                        {f: self._data_by_field[f][label] for f in tp.field_names}
+                    )
+                    for label in self.labels
+                }
+            ),
         )
 
     @property
@@ -101,6 +190,9 @@ class FunctionData(ABC):
         the default layout: with the first key being field name and the second key being
         the field label. Entries of the doubly-nested dictionaries are lists of field
         data, indexed by export.
+
+        The view is not cached, since it refers to the field data of every
+        subinterval, which are allocated when it is built.
         """
         tp = self.time_partition
         return [
@@ -195,24 +287,51 @@ class IndicatorData(FunctionData):
 
     Note that this class has a single dictionary with the field name as the key, rather
     than a doubly-nested dictionary.
+
+    In aggregated mode, the indicators are summed over the exports of each subinterval
+    as they are recorded, weighted by the timestep, so that there is a single indicator
+    per field and subinterval. Optionally, a record of the largest per-export
+    contributions may be kept alongside the aggregate.
     """
 
-    def __init__(self, time_partition, meshes):
+    def __init__(self, time_partition, meshes, aggregate=False, top_k=None):
         """
         :arg time_partition: the :class:`~.TimePartition` used to discretise the problem
             in time
         :arg meshes: the list of meshes used to discretise the problem in space
+        :kwarg aggregate: if ``True``, indicators are accumulated over exports
+        :type aggregate: :class:`bool`
+        :kwarg top_k: in aggregated mode, the number of largest per-export elementwise
+            contributions to record for each field and subinterval
+        :type top_k: :class:`int`
         """
+        if top_k is not None and not aggregate:
+            raise ValueError("The top_k option requires aggregate=True.")
+        if top_k is not None and top_k <= 0:
+            raise ValueError(f"top_k should be a positive integer, not {top_k}.")
+        self.aggregate = aggregate
+        self.top_k = top_k
         self._label_dict = {
             field_type: ("error_indicator",) for field_type in ("steady", "unsteady")
         }
+        # Subintervals which share a mesh also share a P0 space
+        P0_spaces = {}
+        for mesh in meshes:
+            if id(mesh) not in P0_spaces:
+                P0_spaces[id(mesh)] = ffs.FunctionSpace(mesh, "DG", 0)
         super().__init__(
             time_partition,
             {
-                key: [ffs.FunctionSpace(mesh, "DG", 0) for mesh in meshes]
+                key: [P0_spaces[id(mesh)] for mesh in meshes]
                 for key in time_partition.field_names
             },
         )
+        self.top_contributions = AttrDict(
+            {
+                field: [[] for _ in range(time_partition.num_subintervals)]
+                for field in time_partition.field_names
+            }
+        )
 
     @property
     def _data_by_field(self):
@@ -220,16 +339,75 @@ class IndicatorData(FunctionData):
         Extract indicator data array in the default layout: as a dictionary keyed with
         the field name. Entries of the dictionary are doubly-nested lists, indexed first
         by subinterval and then by export.
+
+        The view is cached until the indicator data are reallocated. Its items may be
+        reassigned, in which case the new values are used thereafter.
         """
-        if self._data is None:
-            self._create_data()
-        return AttrDict(
-            {
-                field: self._data[field]["error_indicator"]
-                for field in self.time_partition.field_names
-            }
+        return self._view(
+            "field",
+            lambda: AttrDict(
+                {
+                    field: self._data[field]["error_indicator"]
+                    for field in self.time_partition.field_names
+                }
+            ),
         )
 
+    def _allocate(self, field, label, subinterval):
+        if not self.aggregate:
+            return super()._allocate(field, label, subinterval)
+        fs = self.function_spaces[field][subinterval]
+        return [ffunc.Function(fs, name=f"{field}_{label}")]
+
+    def record(self, field, subinterval, export, indicator, weight=1.0):
+        r"""
+        Record the error indicator for a given field, subinterval and export.
+
+        In aggregated mode, the indicator is scaled by the weight and added to the
+        aggregate for the field and subinterval. If ``top_k`` was set then the largest
+        weighted elementwise values are merged into :attr:`top_contributions`, which
+        holds lists of ``(value, export, element)`` tuples, sorted by decreasing value.
+        Otherwise, the indicator is assigned to the corresponding export and the weight
+        is ignored.
+
+        :arg field: the field name
+        :type field: :class:`str`
+        :arg subinterval: the subinterval index
+        :type subinterval: :class:`int`
+        :arg export: the export index
+        :type export: :class:`int`
+        :arg indicator: the P0 error indicator
+        :type indicator: :class:`firedrake.function.Function`
+        :kwarg weight: the weight to apply in aggregated mode, usually the timestep
+        :type weight: :class:`float`
+        """
+        data = self._data_by_field[field][subinterval]
+        if not self.aggregate:
+            data[export].assign(indicator)
+            return
+        data[0].assign(data[0] + weight * indicator)
+        if self.top_k is None:
+            return
+        values = weight * indicator.dat.data_ro
+        k = min(self.top_k, len(values))
+        elements = np.argpartition(values, -k)[-k:]
+        record = self.top_contributions[field][subinterval]
+        record.extend((float(values[e]), export, int(e)) for e in elements)
+        record.sort(key=lambda item: item[0], reverse=True)
+        del record[self.top_k :]
+
+    def free(self, subinterval):
+        """
+        Free the indicator data associated with a subinterval, including any record of
+        its largest contributions.
+
+        :arg subinterval: the subinterval index
+        :type subinterval: :class:`int`
+        """
+        super().free(subinterval)
+        for record in self.top_contributions.values():
+            record[subinterval] = []
+
     @property
     def _data_by_label(self):
         """
@@ -244,6 +422,9 @@ class IndicatorData(FunctionData):
         Extract indicator data array in an alternative format: as a list indexed by
         subinterval. Entries of the list are dictionaries, keyed by field label.
         Entries of the dictionaries are lists of field data, indexed by export.
+
+        The view is not cached, since it refers to the indicator data of every
+        subinterval, which are allocated when it is built.
         """
         tp = self.time_partition
         return [
@@ -7,7 +7,21 @@ from collections.abc import Iterable
 import numpy as np
 import ufl
 from animate.interpolation import interpolate
-from firedrake import Function, FunctionSpace, MeshHierarchy, TransferManager
+from firedrake import (
+    DirichletBC,
+    Function,
+    FunctionSpace,
+    MeshHierarchy,
+    RelabeledMesh,
+    Submesh,
+    TestFunction,
+    TransferManager,
+    assemble,
+    dS,
+    jump,
+    solve,
+)
+from firedrake.exceptions import ConvergenceError
 from firedrake.petsc import PETSc
 
 from .adjoint import AdjointMeshSeq
@@ -18,15 +32,31 @@ from .options import GoalOrientedAdaptParameters
 
 __all__ = ["GoalOrientedMeshSeq"]
 
+# Cell label used to extract the submeshes for localised enrichment
+_PATCH_SUBDOMAIN_ID = 999
+
+# Facet label for the interface between a submesh and the rest of its parent mesh
+_INTERFACE_SUBDOMAIN_ID = 998
+
 
 class GoalOrientedMeshSeq(AdjointMeshSeq):
     """
     An extension of :class:`~.AdjointMeshSeq` to account for goal-oriented problems.
     """
 
+    _persisted_attributes = AdjointMeshSeq._persisted_attributes + (
+        "qoi_values",
+        "estimator_values",
+        "subinterval_estimator_values",
+        "subinterval_qoi_values",
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.estimator_values = []
+        self.subinterval_estimator_values = []
+        self.subinterval_qoi_values = []
+        self.multigrid_parameters = {}
 
     @PETSc.Log.EventDecorator()
     def get_enriched_mesh_seq(self, enrichment_method="p", num_enrichments=1):
@@ -39,6 +69,15 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
         * p-refinement (``enrichment_method='p'``) - increase the function space
           polynomial order by one globally.
 
+        The enriched mesh sequence is equipped with solver parameters for a multigrid
+        preconditioner, which uses the base mesh sequence as its coarsest level and is
+        wrapped in GMRES. These are stored as its ``multigrid_parameters`` attribute, so
+        that they may be used in user-defined solvers. For h-enrichment, geometric
+        multigrid is applied using the :class:`firedrake.mg.mesh.MeshHierarchy` from
+        which the enriched meshes are taken, with a single hierarchy being built for
+        each distinct mesh if meshes are shared. For p-enrichment, p-multigrid is applied,
+        with the base polynomial degree as the coarse level.
+
         :kwarg enrichment_method: the method for enriching the mesh sequence
         :type enrichment_method: :class:`str`
         :kwarg num_enrichments: the number of enrichments to apply
@@ -53,12 +92,22 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
 
         # Apply h-refinement
         if enrichment_method == "h":
-            if any(mesh == self.meshes[0] for mesh in self.meshes[1:]):
+            if not self._share_meshes and any(
+                mesh == self.meshes[0] for mesh in self.meshes[1:]
+            ):
                 raise ValueError(
                     "h-enrichment is not supported for shallow-copied meshes."
                 )
-            meshes = [MeshHierarchy(mesh, num_enrichments)[-1] for mesh in self.meshes]
+
+            # Refine each distinct mesh once, so that shared meshes remain shared
+            hierarchies = {}
+            for mesh in self.meshes:
+                if id(mesh) not in hierarchies:
+                    hierarchies[id(mesh)] = MeshHierarchy(mesh, num_enrichments)
+            meshes = [hierarchies[id(mesh)][-1] for mesh in self.meshes]
+            hierarchies = list(hierarchies.values())
         else:
+            hierarchies = []
             meshes = self.meshes
 
         # Construct object to hold enriched spaces
@@ -69,10 +118,17 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
             get_initial_condition=self._get_initial_condition,
             get_form=self._get_form,
             get_solver=self._get_solver,
+            get_bcs=self._get_bcs,
             get_qoi=self._get_qoi,
             qoi_type=self.qoi_type,
+            adjoint_method=self.adjoint_method,
+            share_meshes=self._share_meshes,
         )
         enriched_mesh_seq._update_function_spaces()
+        enriched_mesh_seq._solver_rtol = self._solver_rtol
+
+        # Keep the mesh hierarchies alive so that they may be used for multigrid
+        enriched_mesh_seq._hierarchies = hierarchies
 
         # Apply p-refinement
         if enrichment_method == "p":
@@ -86,6 +142,25 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
                         enriched_mesh_seq.meshes[n], element
                     )
 
+        # Set up multigrid preconditioning, using the base sequence as the coarse level.
+        # A Krylov method is wrapped around the preconditioner, since otherwise a
+        # single multigrid cycle would be applied
+        multigrid_parameters = {"ksp_type": "gmres", "ksp_rtol": 1.0e-05}
+        if enrichment_method == "h":
+            multigrid_parameters["pc_type"] = "mg"
+        else:
+            coarse_degree = min(
+                fs[0].ufl_element().degree() for fs in self.function_spaces.values()
+            )
+            multigrid_parameters.update(
+                {
+                    "pc_type": "python",
+                    "pc_python_type": "firedrake.PMGPC",
+                    "pmg_mg_coarse_degree": coarse_degree,
+                }
+            )
+        enriched_mesh_seq.multigrid_parameters = multigrid_parameters
+
         return enriched_mesh_seq
 
     @staticmethod
@@ -105,11 +180,19 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
         else:
             return interpolate
 
-    def _create_indicators(self):
+    def _create_indicators(self, aggregate=False, top_k=None):
         """
         Create the :class:`~.FunctionData` instance for holding error indicator data.
+
+        :kwarg aggregate: if ``True``, indicators are accumulated over exports
+        :type aggregate: :class:`bool`
+        :kwarg top_k: the number of largest per-export contributions to record in
+            aggregated mode
+        :type top_k: :class:`int`
         """
-        self._indicators = IndicatorData(self.time_partition, self.meshes)
+        self._indicators = IndicatorData(
+            self.time_partition, self.meshes, aggregate=aggregate, top_k=top_k
+        )
 
     @property
     def indicators(self):
@@ -121,17 +204,287 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
             self._create_indicators()
         return self._indicators
 
+    @PETSc.Log.EventDecorator()
+    def _mark_elements(self, marking_fraction):
+        r"""
+        Mark the elements with the largest error indicator values from the previous
+        call to :meth:`~.GoalOrientedMeshSeq.indicate_errors`.
+
+        Indicators are summed over fields and exports and transferred onto the current
+        meshes, if these have changed.
+
+        :arg marking_fraction: the fraction of elements to mark on each subinterval
+        :type marking_fraction: :class:`float`
+        :returns: a list of P0 marker :class:`firedrake.function.Function`\s, taking
+            the value one on marked elements and zero elsewhere, or ``None`` if no
+            indicators are available
+        :rtype: :class:`list` of :class:`firedrake.function.Function`\s
+        """
+        if not 0.0 < marking_fraction <= 1.0:
+            raise ValueError(
+                f"Marking fraction should lie in (0, 1], not {marking_fraction}."
+            )
+        if not hasattr(self, "_indicators"):
+            return None
+        markers = []
+        for i, mesh in enumerate(self):
+            P0 = FunctionSpace(mesh, "DG", 0)
+            aggregate = Function(P0)
+            for field in self.fields:
+                for indicator in self.indicators[field][i]:
+                    if indicator.function_space().mesh() != mesh:
+                        indicator = self._transfer(indicator, P0)
+                    aggregate += indicator
+            threshold = np.quantile(aggregate.vector().gather(), 1.0 - marking_fraction)
+            marker = Function(P0)
+            marker.dat.data_with_halos[:] = (
+                aggregate.dat.data_ro_with_halos >= threshold
+            ).astype(float)
+            markers.append(marker)
+        return markers
+
+    @staticmethod
+    def _patch_indicator(marker):
+        """
+        Extend a set of marked elements by a layer of neighbouring elements, i.e.,
+        those which share a vertex with a marked element.
+
+        :arg marker: a P0 field, taking the value one on marked elements and zero
+            elsewhere
+        :type marker: :class:`firedrake.function.Function`
+        :returns: a P0 field, taking the value one on the elements of the patch and
+            zero elsewhere
+        :rtype: :class:`firedrake.function.Function`
+        """
+        P0 = marker.function_space()
+        P1 = FunctionSpace(P0.mesh(), "CG", 1)
+        cells = P0.cell_node_map().values_with_halo[:, 0]
+        cell_vertices = P1.cell_node_map().values_with_halo
+        marked = marker.dat.data_ro_with_halos[cells] > 0.5
+        vertices = np.zeros(P1.node_set.total_size, dtype=bool)
+        vertices[cell_vertices[marked]] = True
+        patch = Function(P0)
+        patch.dat.data_with_halos[cells] = vertices[cell_vertices].any(axis=1)
+        return patch
+
+    def _get_local_mesh_seq(self, enriched_mesh_seq, index, marker):
+        """
+        Construct a mesh sequence for a single subinterval, whose mesh is a submesh of
+        the enriched mesh covering the marked elements, along with a layer of
+        neighbouring elements, and whose function spaces use the enriched elements.
+
+        The facets of the submesh which are interior to the enriched mesh are labelled
+        ``_INTERFACE_SUBDOMAIN_ID``, while the physical boundary keeps its labels.
+
+        :arg enriched_mesh_seq: the enriched mesh sequence
+        :type enriched_mesh_seq: :class:`~.GoalOrientedMeshSeq`
+        :arg index: the subinterval index
+        :type index: :class:`int`
+        :arg marker: a P0 field, taking the value one on marked elements and zero
+            elsewhere, defined on the enriched mesh
+        :type marker: :class:`firedrake.function.Function`
+        :returns: the local mesh sequence
+        :rtype: :class:`~.GoalOrientedMeshSeq`
+        """
+        enriched_spaces = enriched_mesh_seq.function_spaces
+        if any(len(fs[index]) > 1 for fs in enriched_spaces.values()):
+            raise NotImplementedError(
+                "Localised enrichment is not supported for mixed function spaces."
+            )
+        mesh = enriched_mesh_seq[index]
+        patch = self._patch_indicator(marker)
+
+        # Mark the interior facets across which the patch indicator jumps
+        HDivTrace0 = FunctionSpace(mesh, "HDiv Trace", 0)
+        jumps = assemble(abs(jump(patch)) * TestFunction(HDivTrace0)("+") * dS)
+        interface = Function(HDivTrace0)
+        interface.dat.data[:] = jumps.dat.data_ro > 0
+        mesh = RelabeledMesh(
+            mesh,
+            [patch, interface],
+            [_PATCH_SUBDOMAIN_ID, _INTERFACE_SUBDOMAIN_ID],
+        )
+        submesh = Submesh(mesh, mesh.topological_dimension(), _PATCH_SUBDOMAIN_ID)
+        local_mesh_seq = type(self)(
+            self.time_partition[index],
+            [submesh],
+            get_function_spaces=self._get_function_spaces,
+            get_initial_condition=self._get_initial_condition,
+            get_form=self._get_form,
+            get_solver=self._get_solver,
+            get_bcs=self._get_bcs,
+            get_qoi=self._get_qoi,
+            qoi_type=self.qoi_type,
+        )
+        local_mesh_seq._update_function_spaces()
+        for field, fs in enriched_spaces.items():
+            element = fs[index].ufl_element()
+            local_mesh_seq._fs[field][0] = FunctionSpace(submesh, element)
+        return local_mesh_seq
+
+    @PETSc.Log.EventDecorator()
+    def _solve_local_adjoint(
+        self, form, solution, adjoint, adjoint_next, qoi, bcs=None
+    ):
+        r"""
+        Solve the adjoint equation associated with a single field and timestep in an
+        enriched space on a submesh covering the marked elements.
+
+        The adjoint equation is obtained by linearising the form about the current
+        (transferred) forward solution. Its right-hand side is made up of the QoI
+        derivative and the adjoint action at the next timestep, with the lagged
+        dependence of the form frozen at the current timestep. On the interface between
+        the submesh and the rest of the mesh, the adjoint solution takes the values of
+        the (transferred) base adjoint solution. On the physical boundary, the
+        homogenised boundary conditions of the problem are applied.
+
+        :arg form: the form for the field in the enriched space on the submesh
+        :type form: :class:`ufl.form.Form`
+        :arg solution: the current and lagged forward solutions in the enriched space,
+            or just the current solution for steady fields
+        :type solution: :class:`tuple` or :class:`firedrake.function.Function`
+        :arg adjoint: the base adjoint solution, transferred to the enriched space
+        :type adjoint: :class:`firedrake.function.Function`
+        :arg adjoint_next: the base adjoint solution at the next timestep, transferred
+            to the enriched space
+        :type adjoint_next: :class:`firedrake.function.Function`
+        :arg qoi: the QoI contribution associated with the timestep, or ``None``
+        :type qoi: :class:`ufl.form.Form`
+        :kwarg bcs: the boundary conditions of the problem for the field on the submesh
+        :type bcs: :class:`list` of :class:`firedrake.bcs.DirichletBC`\s
+        :returns: the locally enriched adjoint solution
+        :rtype: :class:`firedrake.function.Function`
+        """
+        u, u_ = solution if isinstance(solution, tuple) else (solution, None)
+        rhs = []
+        if u_ is not None:
+            dFdu_ = ufl.derivative(form, u_)
+            rhs.append(-ufl.action(ufl.adjoint(dFdu_), adjoint_next))
+        if qoi is not None:
+            rhs.append(ufl.derivative(qoi, u))
+        rhs = [ufl.algorithms.expand_derivatives(L) for L in rhs]
+        rhs = [L for L in rhs if not L.empty()]
+        local_adjoint = Function(adjoint.function_space(), name=adjoint.name())
+        if len(rhs) == 0:
+            return local_adjoint
+
+        # Restrict the homogenised boundary conditions to the parts of the physical
+        # boundary which belong to the submesh and impose the base adjoint solution on
+        # the interface
+        fs = adjoint.function_space()
+        markers = set(fs.mesh().exterior_facets.unique_markers)
+        physical = tuple(sorted(markers - {_INTERFACE_SUBDOMAIN_ID}))
+        local_bcs = []
+        for bc in bcs or []:
+            sub_domain = bc.sub_domain
+            if sub_domain == "on_boundary":
+                sub_domain = physical
+            elif isinstance(sub_domain, str) or not isinstance(sub_domain, Iterable):
+                sub_domain = (sub_domain,)
+            sub_domain = tuple(marker for marker in sub_domain if marker in markers)
+            if len(sub_domain) > 0:
+                local_bcs.append(DirichletBC(bc.function_space(), 0, sub_domain))
+        if _INTERFACE_SUBDOMAIN_ID in markers:
+            local_bcs.append(DirichletBC(fs, adjoint, _INTERFACE_SUBDOMAIN_ID))
+        lhs = ufl.adjoint(ufl.derivative(form, u))
+        solve(lhs == sum(rhs[1:], rhs[0]), local_adjoint, bcs=local_bcs)
+        return local_adjoint
+
+    def _solve_enriched_adjoint(
+        self,
+        enriched_mesh_seq,
+        first_subinterval,
+        solver_kwargs,
+        fallback_solver_kwargs=None,
+    ):
+        """
+        Solve the adjoint problem on the enriched mesh sequence.
+
+        If fallback solver parameters are given and the enriched adjoint solves fail,
+        e.g., because multigrid could not be set up for them or did not converge, then
+        a warning is logged and the backward sweep is restarted using the fallback
+        parameters. Subintervals which have already been completed are not yielded
+        again.
+
+        :arg enriched_mesh_seq: the enriched mesh sequence
+        :type enriched_mesh_seq: :class:`~.GoalOrientedMeshSeq`
+        :arg first_subinterval: the index of the earliest subinterval on which to solve
+            the adjoint problem
+        :type first_subinterval: :class:`int`
+        :arg solver_kwargs: parameters for the forward and adjoint solvers
+        :type solver_kwargs: :class:`dict` with :class:`str` keys and values which may
+            take various types
+        :kwarg fallback_solver_kwargs: parameters to use if the solves fail
+        :type fallback_solver_kwargs: :class:`dict` with :class:`str` keys and values
+            which may take various types
+        :returns: a generator which yields the index of each subinterval, in reverse
+            order, once its solution data are complete
+        """
+        completed = 0
+        try:
+            for i in enriched_mesh_seq._solve_adjoint(
+                first_subinterval=first_subinterval, **solver_kwargs
+            ):
+                completed += 1
+                yield i
+        except (ConvergenceError, PETSc.Error) as error:
+            if fallback_solver_kwargs is None:
+                raise
+            self.warning(
+                "Enriched adjoint solves failed with multigrid preconditioning"
+                f" ({error}). Falling back to the solver parameters used without"
+                " multigrid."
+            )
+            sweep = enriched_mesh_seq._solve_adjoint(
+                first_subinterval=first_subinterval, **fallback_solver_kwargs
+            )
+            for n, i in enumerate(sweep):
+                if n >= completed:
+                    yield i
+
     @PETSc.Log.EventDecorator()
     def indicate_errors(
-        self, enrichment_kwargs=None, solver_kwargs=None, indicator_fn=get_dwr_indicator
+        self,
+        enrichment_kwargs=None,
+        solver_kwargs=None,
+        indicator_fn=get_dwr_indicator,
+        streaming=False,
+        aggregate=False,
+        top_k=None,
     ):
         """
         Compute goal-oriented error indicators for each subinterval based on solving the
-        adjoint problem in a globally enriched space.
+        adjoint problem in an enriched space.
+
+        By default, the enriched adjoint problem is solved globally. If the
+        ``'localised'`` enrichment option is set then the enriched adjoint problem is
+        only solved on the elements whose error indicators took the largest values on
+        the previous call, with the proportion of such elements given by the
+        ``'marking_fraction'`` option. The enriched adjoint problem is assembled and
+        solved on a submesh covering these elements and a layer of their neighbours,
+        with the base adjoint solution imposed on the interface with the rest of the
+        mesh. The error indicators are also assembled on the submesh, so that the cost
+        scales with the size of the marked region. Elsewhere, the base adjoint solution
+        is used and the error indicators vanish. If no indicators are available yet then
+        global enrichment is applied. Localised enrichment requires the enriched spaces
+        to be defined by point evaluation, e.g., Lagrange spaces, and any Dirichlet
+        boundary conditions to be provided using :meth:`~.MeshSeq.get_bcs`.
+
+        If the ``'multigrid'`` enrichment option is set then the enriched adjoint solves
+        are preconditioned using multigrid, with the base mesh sequence as the coarse
+        level - see :meth:`~.GoalOrientedMeshSeq.get_enriched_mesh_seq`. The enriched
+        forward solves are performed by the user-defined solver, so multigrid is only
+        applied there if that solver uses the enriched mesh sequence's
+        ``multigrid_parameters``. The mesh hierarchies are rebuilt on each call. If the
+        enriched adjoint solves fail with multigrid, e.g., because it cannot be set up
+        for them, then a warning is logged and they are repeated with the solver
+        parameters that would be used without multigrid, i.e., a direct solver by
+        default.
 
         :kwarg enrichment_kwargs: keyword arguments to pass to the global enrichment
             method - see :meth:`~.GoalOrientedMeshSeq.get_enriched_mesh_seq` for the
-            supported enrichment methods and options
+            supported enrichment methods and options - along with the ``'localised'``,
+            ``'marking_fraction'`` and ``'multigrid'`` options described above
         :type enrichment_kwargs: :class:`dict` with :class:`str` keys and values which
             may take various types
         :kwarg solver_kwargs: parameters for the forward solver, as well as any
@@ -142,28 +495,114 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
         :kwarg indicator_fn: function which maps the form, adjoint error and enriched
             space(s) as arguments to the error indicator
             :class:`firedrake.function.Function`
+        :kwarg streaming: if ``True``, the backward sweeps over the base and enriched
+            mesh sequences are stepped together, with the error indicators on each
+            subinterval being computed as soon as both sweeps have finished it. The
+            base and enriched solution data on that subinterval are then freed, so that
+            only one subinterval's worth of solution data is held at a time. Freed
+            solution data are reallocated as zero if they are accessed again, so this
+            option cannot be used by any consumer of the base solution data, such as
+            :meth:`~.GoalOrientedMeshSeq.fixed_point_iteration` (which passes them to
+            the adaptor and restores them for the best iteration) or
+            :meth:`~.MeshSeq.temporal_indicators`
+        :type streaming: :class:`bool`
+        :kwarg aggregate: if ``True``, the error indicators are summed over the exports
+            of each subinterval as they are computed, weighted by the timestep - see
+            :class:`~.IndicatorData`
+        :type aggregate: :class:`bool`
+        :kwarg top_k: in aggregated mode, the number of largest per-export elementwise
+            contributions to record for each field and subinterval
+        :type top_k: :class:`int`
         :returns: solution and indicator data objects
         :rtype1: :class:`~.AdjointSolutionData
         :rtype2: :class:`~.IndicatorData
         """
         solver_kwargs = solver_kwargs or {}
-        default_enrichment_kwargs = {"enrichment_method": "p", "num_enrichments": 1}
+        default_enrichment_kwargs = {
+            "enrichment_method": "p",
+            "num_enrichments": 1,
+            "localised": False,
+            "marking_fraction": 0.2,
+            "multigrid": False,
+        }
         enrichment_kwargs = dict(default_enrichment_kwargs, **(enrichment_kwargs or {}))
+        localised = enrichment_kwargs.pop("localised")
+        marking_fraction = enrichment_kwargs.pop("marking_fraction")
+        multigrid = enrichment_kwargs.pop("multigrid")
         enriched_mesh_seq = self.get_enriched_mesh_seq(**enrichment_kwargs)
         transfer = self._get_transfer_function(enrichment_kwargs["enrichment_method"])
 
+        # Determine the elements to enrich, based on the previous error indicators
+        markers = self._mark_elements(marking_fraction) if localised else None
+
+        # Subintervals which have been marked as converged keep their previous error
+        # indicators, provided their meshes are unchanged, so that the enriched
+        # backward sweep may stop before reaching them
+        previous = getattr(self, "_indicators", None)
+        num_converged = 0
+        if previous is not None and self.params and self.params.drop_out_converged:
+            P0_previous = next(iter(previous.function_spaces.values()))
+            for fs, mesh, converged in zip(P0_previous, self, self.converged):
+                if not converged or fs.mesh() != mesh:
+                    break
+                num_converged += 1
+
         # Reinitialise the error indicator data object
-        self._create_indicators()
+        self._create_indicators(aggregate=aggregate, top_k=top_k)
+        for f in self.fields:
+            for i in range(num_converged):
+                self.indicators[f][i] = previous[f][i]
+                contributions = previous.top_contributions[f][i]
+                self.indicators.top_contributions[f][i] = contributions
 
-        # Solve the forward and adjoint problems on the MeshSeq and its enriched version
-        self.solve_adjoint(**solver_kwargs)
-        enriched_mesh_seq.solve_adjoint(**solver_kwargs)
+        # Set up the forward and adjoint solves on the enriched MeshSeq
+        enriched_solver_kwargs = dict(solver_kwargs)
+        if multigrid:
+            adj_solver_kwargs = dict(solver_kwargs.get("adj_solver_kwargs") or {})
+            adj_solver_kwargs["solver_parameters"] = dict(
+                enriched_mesh_seq.multigrid_parameters,
+                **adj_solver_kwargs.get("solver_parameters", {}),
+            )
+            enriched_solver_kwargs["adj_solver_kwargs"] = adj_solver_kwargs
 
         FWD, ADJ = "forward", "adjoint"
         FWD_OLD = "forward" if self.steady else "forward_old"
         ADJ_NEXT = "adjoint" if self.steady else "adjoint_next"
-        P0_spaces = [FunctionSpace(mesh, "DG", 0) for mesh in self]
-        for i in range(len(self)):
+        P0_spaces = self.indicators.function_spaces[next(iter(self.fields))]
+
+        def record(f, i, j, indi_e):
+            """
+            Record the error indicator for a given field, subinterval and export.
+
+            :arg f: the field name
+            :type f: :class:`str`
+            :arg i: the subinterval index
+            :type i: :class:`int`
+            :arg j: the export index
+            :type j: :class:`int`
+            :arg indi_e: the error indicator in the enriched space
+            :type indi_e: :class:`firedrake.function.Function`
+            """
+            # Transfer back to the base space and take the absolute value, which may be
+            # done elementwise for P0 data
+            indi = self._transfer(indi_e, self._acquire_function(P0_spaces[i]))
+            indi.dat.data[:] = np.maximum(np.abs(indi.dat.data_ro), 1.0e-16)
+            self.indicators.record(
+                f, i, j, indi, weight=self.time_partition.timesteps[i]
+            )
+            self._release_function(indi)
+
+        def indicate(i):
+            """
+            Compute the error indicators on a given subinterval.
+
+            :arg i: the subinterval index
+            :type i: :class:`int`
+            """
+            if markers is not None:
+                indicate_local(i)
+                return
+
             # Get Functions
             u, u_, u_star, u_star_next, u_star_e = {}, {}, {}, {}, {}
             enriched_spaces = {
@@ -171,19 +610,21 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
             }
             mapping = {}
             for f, fs_e in enriched_spaces.items():
-                u[f] = Function(fs_e)
-                u_[f] = Function(fs_e)
+                u[f] = self._acquire_function(fs_e)
+                u_[f] = self._acquire_function(fs_e)
                 mapping[f] = (
                     (u[f], u_[f])
                     if enriched_mesh_seq.field_types[f] == "unsteady"
                     else u[f]
                 )
-                u_star[f] = Function(fs_e)
-                u_star_next[f] = Function(fs_e)
-                u_star_e[f] = Function(fs_e)
+                u_star[f] = self._acquire_function(fs_e)
+                u_star_next[f] = self._acquire_function(fs_e)
+                u_star_e[f] = self._acquire_function(fs_e)
 
-            # Get forms for each equation in enriched space
+            # Get forms for each equation in enriched space. The fields are released
+            # below, so the enriched sequence should not release them itself
             enriched_mesh_seq.fields = mapping
+            enriched_mesh_seq._pooled_fields = False
             forms = enriched_mesh_seq.form(i)
 
             # Loop over each timestep
@@ -216,47 +657,167 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
                     u_star_e[f] -= u_star[f]
 
                     # Evaluate error indicator
-                    indi_e = indicator_fn(forms[f], u_star_e[f])
+                    record(f, i, j, indicator_fn(forms[f], u_star_e[f]))
+
+            for f in self.fields:
+                self._release_function(u[f], u_[f], u_star[f], u_star_next[f])
+                self._release_function(u_star_e[f])
+
+        def indicate_local(i):
+            """
+            Compute the error indicators on a given subinterval by solving the enriched
+            adjoint problem on a submesh covering the marked elements.
 
-                    # Transfer back to the base space
-                    indi = self._transfer(indi_e, P0_spaces[i])
-                    indi.interpolate(abs(indi))
-                    self.indicators[f][i][j].interpolate(ufl.max_value(indi, 1.0e-16))
+            The base solutions are interpolated directly onto the submesh and the error
+            indicators are assembled there, so that no enriched fields are formed over
+            the whole mesh.
 
+            :arg i: the subinterval index
+            :type i: :class:`int`
+            """
+            # Set up the enriched problem on a submesh covering the marked elements
+            P0_e = FunctionSpace(enriched_mesh_seq[i], "DG", 0)
+            marker = markers[i]
+            if enrichment_kwargs["enrichment_method"] == "h":
+                marker = transfer(marker, P0_e)
+            local_mesh_seq = self._get_local_mesh_seq(enriched_mesh_seq, i, marker)
+            v, v_, v_star, v_star_next, local_mapping = {}, {}, {}, {}, {}
+            for f in self.fields:
+                fs_l = local_mesh_seq.function_spaces[f][0]
+                v[f] = Function(fs_l, name=f)
+                v_[f] = Function(fs_l, name=f"{f}_old")
+                local_mapping[f] = (
+                    (v[f], v_[f]) if self.field_types[f] == "unsteady" else v[f]
+                )
+                v_star[f] = Function(fs_l)
+                v_star_next[f] = Function(fs_l)
+            local_mesh_seq.fields = local_mapping
+            local_forms = local_mesh_seq.form(0)
+            local_bcs = local_mesh_seq.get_bcs()(0)
+            local_mesh_seq.get_qoi(0)
+            qoi = local_mesh_seq._qoi_form
+            qoi_kwargs = (solver_kwargs.get("solver_kwargs") or {}).get(
+                "qoi_kwargs", {}
+            )
+            stride = self.time_partition.num_timesteps_per_export[i]
+            dt = self.time_partition.timesteps[i]
+            t0 = self.time_partition.subintervals[i][0]
+
+            # Loop over each timestep, treating the lagged solutions of latter fields as
+            # described above
+            for j in range(self.time_partition.num_exports_per_subinterval[i] - 1):
+                for f_next in self.time_partition.field_names[1:]:
+                    v[f_next].interpolate(self.solutions[f_next][FWD_OLD][i][j])
+                for f in self.fields:
+                    v[f].interpolate(self.solutions[f][FWD][i][j])
+                    v_[f].interpolate(self.solutions[f][FWD_OLD][i][j])
+                    v_star[f].interpolate(self.solutions[f][ADJ][i][j])
+                    v_star_next[f].interpolate(self.solutions[f][ADJ_NEXT][i][j])
+                    if self.qoi_type == "time_integrated":
+                        qoi_form = qoi(t0 + (j + 1) * stride * dt)
+                    elif i == len(self) - 1 and j == len(self.solutions[f][ADJ][i]) - 1:
+                        qoi_form = qoi(**qoi_kwargs)
+                    else:
+                        qoi_form = None
+                    v_star_local = self._solve_local_adjoint(
+                        local_forms[f],
+                        local_mapping[f],
+                        v_star[f],
+                        v_star_next[f],
+                        qoi_form,
+                        bcs=local_bcs.get(f, []),
+                    )
+
+                    # The local correction vanishes outside of the submesh. For
+                    # unsteady fields, only the adjoint at the current timestep is
+                    # enriched, so the adjoint error reduces to half of it
+                    v_star_local -= v_star[f]
+                    if self.field_types[f] == "unsteady":
+                        v_star_local.assign(0.5 * v_star_local)
+
+                    # Evaluate the error indicator on the submesh and extend it by zero
+                    indi_l = indicator_fn(local_forms[f], v_star_local)
+                    indi_e = Function(P0_e).interpolate(indi_l, allow_missing_dofs=True)
+                    record(f, i, j, indi_e)
+
+        # Solve the forward and adjoint problems on the MeshSeq and its enriched version
+        enriched_sweep = None
+        if markers is None and num_converged < len(self):
+            enriched_sweep = self._solve_enriched_adjoint(
+                enriched_mesh_seq,
+                num_converged,
+                enriched_solver_kwargs,
+                fallback_solver_kwargs=solver_kwargs if multigrid else None,
+            )
+        if not streaming:
+            self.solve_adjoint(**solver_kwargs)
+            if enriched_sweep is not None:
+                for _ in enriched_sweep:
+                    pass
+            for i in range(num_converged, len(self)):
+                indicate(i)
+            return self.solutions, self.indicators
+
+        # Alternatively, step the backward sweeps on both MeshSeqs together, computing
+        # the error indicators on each subinterval as soon as both sweeps have finished
+        # it and then freeing the solution data
+        for i in self._solve_adjoint(**solver_kwargs):
+            if i < num_converged:
+                continue
+            if enriched_sweep is not None:
+                if next(enriched_sweep, None) != i:
+                    raise ValueError(
+                        "Enriched backward sweep is out of step with the base sweep on"
+                        f" the {self.th(i)} subinterval."
+                    )
+            indicate(i)
+            self.solutions.free(i)
+            if enriched_sweep is not None:
+                enriched_mesh_seq.solutions.free(i)
+        if enriched_sweep is not None:
+            for _ in enriched_sweep:
+                pass
         return self.solutions, self.indicators
 
     @PETSc.Log.EventDecorator()
-    def error_estimate(self, absolute_value=False):
+    def error_estimate(self, absolute_value=False, by_subinterval=False):
         r"""
         Deduce the error estimator value associated with error indicator fields defined
         over the mesh sequence.
 
         :kwarg absolute_value: if ``True``, the modulus is taken on each element
         :type absolute_value: :class:`bool`
+        :kwarg by_subinterval: if ``True``, the contribution from each subinterval is
+            returned, rather than the total
+        :type by_subinterval: :class:`bool`
         :returns: the error estimator value
-        :rtype: :class:`float`
+        :rtype: :class:`float` or :class:`numpy.ndarray`
         """
         assert isinstance(self.indicators, IndicatorData)
         if not isinstance(absolute_value, bool):
             raise TypeError(
                 f"Expected 'absolute_value' to be a bool, not '{type(absolute_value)}'."
             )
-        estimator = 0
+        estimator = np.zeros(len(self))
         for field, by_field in self.indicators.items():
             if field not in self.time_partition.field_names:
                 raise ValueError(
                     f"Key '{field}' does not exist in the TimePartition provided."
                 )
             assert not isinstance(by_field, Function) and isinstance(by_field, Iterable)
-            for by_mesh, dt in zip(by_field, self.time_partition.timesteps):
+            for i, (by_mesh, dt) in enumerate(
+                zip(by_field, self.time_partition.timesteps)
+            ):
                 assert not isinstance(by_mesh, Function) and isinstance(
                     by_mesh, Iterable
                 )
+                # Aggregated indicators are already weighted by the timestep
+                weight = 1.0 if self.indicators.aggregate else dt
                 for indicator in by_mesh:
                     if absolute_value:
                         indicator.interpolate(abs(indicator))
-                    estimator += dt * indicator.vector().gather().sum()
-        return estimator
+                    estimator[i] += weight * indicator.vector().gather().sum()
+        return estimator if by_subinterval else estimator.sum()
 
     def check_estimator_convergence(self):
         """
@@ -282,6 +843,82 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
                 return True
         return False
 
+    def check_subinterval_convergence(self):
+        r"""
+        Check for convergence of the fixed point iteration on individual subintervals.
+
+        A subinterval is deemed to have converged if its contribution to the error
+        estimator is smaller than the fraction ``estimator_fraction`` of the total, or
+        if the relative differences in its contributions to both the error estimator
+        and the QoI are smaller than the specified tolerances.
+
+        Only early subintervals are marked as converged, since changes on a given
+        subinterval propagate to all later subintervals through the forward solution.
+
+        :return: an array, whose entries are ``True`` if convergence is detected on the
+            corresponding subinterval
+        :rtype: :class:`list` of :class:`bool`\s
+        """
+        converged = self.converged.copy()
+        if len(self.subinterval_estimator_values) < max(2, self.params.miniter + 1):
+            return converged
+        ee_, ee = self.subinterval_estimator_values[-2:]
+        qoi_, qoi = self.subinterval_qoi_values[-2:]
+        for i in range(len(self)):
+            if converged[i] or not self.check_convergence[i]:
+                continue
+            negligible = abs(ee[i]) < self.params.estimator_fraction * abs(ee.sum())
+            stable = abs(ee[i] - ee_[i]) < self.params.estimator_rtol * abs(ee_[i])
+            stable &= abs(qoi[i] - qoi_[i]) < self.params.qoi_rtol * abs(qoi_[i])
+            if negligible or stable:
+                converged[i] = True
+                pyrint(
+                    f"Error estimator converged on subinterval {i} after"
+                    f" {self.fp_iteration + 1} iterations."
+                )
+
+        # Check only early subintervals are marked as converged
+        if not converged.all():
+            first_not_converged = converged.argsort()[0]
+            converged[first_not_converged:] = False
+
+        return converged
+
+    def _load_iteration_state(self, checkpoint_dir):
+        """
+        As in :meth:`~.MeshSeq._load_iteration_state`, but also restoring the
+        per-subinterval estimator and QoI values as arrays.
+        """
+        state = super()._load_iteration_state(checkpoint_dir)
+        if state is not None:
+            self.subinterval_estimator_values = [
+                np.array(values) for values in self.subinterval_estimator_values
+            ]
+            self.subinterval_qoi_values = [
+                np.array(values) for values in self.subinterval_qoi_values
+            ]
+        return state
+
+    def _inexact_solver_kwargs(self, solver_kwargs):
+        """
+        Relax the KSP relative tolerance of the adjoint solver according to the current
+        inexact solve tolerance.
+
+        :arg solver_kwargs: keyword arguments for :meth:`~.AdjointMeshSeq.solve_adjoint`
+        :type solver_kwargs: :class:`dict` with :class:`str` keys and values which may
+            take various types
+        :returns: the keyword arguments with relaxed adjoint solver parameters
+        :rtype: :class:`dict`
+        """
+        if self._solver_rtol is None:
+            return solver_kwargs
+        adj_solver_kwargs = dict(solver_kwargs.get("adj_solver_kwargs") or {})
+        solver_parameters = dict(adj_solver_kwargs.get("solver_parameters") or {})
+        rtol = max(solver_parameters.get("ksp_rtol", 1.0e-05), self._solver_rtol)
+        solver_parameters["ksp_rtol"] = rtol
+        adj_solver_kwargs["solver_parameters"] = solver_parameters
+        return {**solver_kwargs, "adj_solver_kwargs": adj_solver_kwargs}
+
     @PETSc.Log.EventDecorator()
     def fixed_point_iteration(
         self,
@@ -292,10 +929,42 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
         adaptor_kwargs=None,
         solver_kwargs=None,
         indicator_fn=get_dwr_indicator,
+        indicator_kwargs=None,
+        checkpoint_dir=None,
+        resume=False,
+        continuation=None,
     ):
         r"""
         Apply goal-oriented mesh adaptation using a fixed point iteration loop approach.
 
+        If any of the resource budgets in the parameters are set, the cost of the next
+        iteration is projected from those so far and the loop is stopped if it would
+        exceed a budget. In that case, the meshes, solution data and indicator data of
+        the iteration whose error estimate (or else QoI) was the most stable are
+        restored.
+
+        If a checkpoint directory is given then the meshes, parameters, counts, QoI and
+        error estimator values and convergence flags are written to it after each
+        iteration. With ``resume=True``, the loop restarts from the last iteration
+        recorded there. If the recorded loop had already converged then its meshes are
+        reused and only the final solve and error indication are performed.
+
+        A continuation schedule may be given as described in
+        :meth:`~.MeshSeq.fixed_point_iteration`. Its stages may also include an
+        ``'enrichment_kwargs'`` entry, which overrides the enrichment keyword arguments
+        for the stage, e.g., to use a cheaper enrichment method in early iterations.
+        Convergence is only checked once the production configuration is reached.
+
+        If the ``inexact_solves`` parameter is set then solver tolerances are relaxed in
+        early iterations, as described in :meth:`~.MeshSeq.fixed_point_iteration`, but
+        based upon the relative change in the error estimator (or else the QoI). This
+        applies to solvers obtained using :meth:`~.MeshSeq.get_cached_solver`, on both
+        the base and enriched mesh sequences, as well as to the KSP relative tolerance
+        of the adjoint solver.
+
+        If the ``timestep_adaptation`` parameter is set then the timesteps are adapted
+        after the meshes, as described in :meth:`~.MeshSeq.fixed_point_iteration`.
+
         :arg adaptor: function for adapting the mesh sequence. Its arguments are the mesh
             sequence and the solution and indicator data objects. It should return
             ``True`` if the convergence criteria checks are to be skipped for this
@@ -318,50 +987,123 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
         :kwarg indicator_fn: function which maps the form, adjoint error and enriched
             space(s) as arguments to the error indicator
             :class:`firedrake.function.Function`
+        :kwarg indicator_kwargs: other keyword arguments to pass to
+            :meth:`~.GoalOrientedMeshSeq.indicate_errors`, excluding ``streaming``
+        :type indicator_kwargs: :class:`dict` with :class:`str` keys and values which
+            may take various types
+        :kwarg checkpoint_dir: directory for writing the state of each iteration
+        :type checkpoint_dir: :class:`str`
+        :kwarg resume: should the loop be resumed from the state in ``checkpoint_dir``?
+        :type resume: :class:`bool`
+        :kwarg continuation: the stages of a continuation schedule
+        :type continuation: :class:`list` of :class:`dict`\s
         :returns: solution and indicator data objects
         :rtype1: :class:`~.AdjointSolutionData
         :rtype2: :class:`~.IndicatorData
         """
         # TODO #124: adaptor no longer needs solution and indicator data to be passed
         #            explicitly
+        if resume and checkpoint_dir is None:
+            raise ValueError("Resuming requires a checkpoint directory.")
         self.params = parameters or GoalOrientedAdaptParameters()
         enrichment_kwargs = enrichment_kwargs or {}
         adaptor_kwargs = adaptor_kwargs or {}
         solver_kwargs = solver_kwargs or {}
+        indicator_kwargs = indicator_kwargs or {}
+        if indicator_kwargs.get("streaming"):
+            raise ValueError(
+                "Streaming error indication cannot be used in the fixed point iteration,"
+                " since it frees the solution data required by the adaptor, timestep"
+                " adaptation and the restoration of the best iteration."
+            )
         self._reset_counts()
         self.qoi_values = []
         self.estimator_values = []
+        self.subinterval_estimator_values = []
+        self.subinterval_qoi_values = []
         self.converged[:] = False
         self.check_convergence[:] = True
+        self._reset_relaxation()
+        self._adapted_timesteps_per_export = None
+        first_iteration = 0
+        if resume:
+            state = self._load_iteration_state(checkpoint_dir)
+            if state is not None and state["finished"]:
+                self._set_time_partition(self._production_configuration())
+                self.indicate_errors(
+                    enrichment_kwargs=enrichment_kwargs,
+                    solver_kwargs=solver_kwargs,
+                    indicator_fn=indicator_fn,
+                    **indicator_kwargs,
+                )
+                return self.solutions, self.indicators
+            if state is not None:
+                first_iteration = self.fp_iteration + 1
+        stages = self._start_continuation(continuation)
+        self._start_budget()
+        self._start_inexact_solves()
+        change = None
 
-        for fp_iteration in range(self.params.maxiter):
+        for fp_iteration in range(first_iteration, self.params.maxiter):
             self.fp_iteration = fp_iteration
+            production = self._update_continuation(stages)
             if update_params is not None:
                 update_params(self.params, self.fp_iteration)
 
             # Indicate errors over all meshes
+            self._solver_rtol = self._inexact_rtol(change)
             self.indicate_errors(
-                enrichment_kwargs=enrichment_kwargs,
-                solver_kwargs=solver_kwargs,
+                enrichment_kwargs={
+                    **enrichment_kwargs,
+                    **self.continuation_stage.enrichment_kwargs,
+                },
+                solver_kwargs=self._inexact_solver_kwargs(solver_kwargs),
                 indicator_fn=indicator_fn,
+                **indicator_kwargs,
             )
+            self._record_solver_iterations()
 
             # Check for QoI convergence
             # TODO #23: Put this check inside the adjoint solve as an optional return
             #           condition so that we can avoid unnecessary extra solves
             self.qoi_values.append(self.J)
-            qoi_converged = self.check_qoi_convergence()
+            qoi_converged = production and self.check_qoi_convergence()
             if self.params.convergence_criteria == "any" and qoi_converged:
                 self.converged[:] = True
                 break
 
             # Check for error estimator convergence
-            self.estimator_values.append(self.error_estimate())
-            ee_converged = self.check_estimator_convergence()
+            estimates = self.error_estimate(by_subinterval=True)
+            self.estimator_values.append(estimates.sum())
+            ee_converged = production and self.check_estimator_convergence()
             if self.params.convergence_criteria == "any" and ee_converged:
                 self.converged[:] = True
                 break
 
+            # Check for convergence on individual subintervals, so that converged
+            # subintervals are skipped by the adaptor
+            self.subinterval_estimator_values.append(estimates)
+            self.subinterval_qoi_values.append(self.qoi_contributions.copy())
+            if production and self.params.drop_out_converged:
+                self.converged[:] = self.check_subinterval_convergence()
+
+            # Keep a record of the most stable iteration, in case the budget is exhausted
+            values = self.estimator_values
+            if len(values) < 2:
+                values = self.qoi_values
+            stability = None
+            if len(values) > 1 and values[-2] != 0:
+                stability = abs(values[-1] - values[-2]) / abs(values[-2])
+            change = stability
+            self._track_best_iteration(
+                stability,
+                list(self.meshes),
+                _solutions=self.solutions,
+                _indicators=self.indicators,
+                _adapted_timesteps_per_export=self._adapted_timesteps_per_export,
+                J=self.J,
+            )
+
             # Adapt meshes and log element counts
             continue_unconditionally = adaptor(
                 self, self.solutions, self.indicators, **adaptor_kwargs
@@ -372,9 +1114,12 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
                 )
             self.element_counts.append(self.count_elements())
             self.vertex_counts.append(self.count_vertices())
+            timesteps_changed = self._update_timesteps(production)
 
             # Check for element count convergence
-            self.converged[:] = self.check_element_count_convergence()
+            if production:
+                self.converged[:] = self.check_element_count_convergence()
+                self.converged[timesteps_changed] = False
             elem_converged = self.converged.all()
             if self.params.convergence_criteria == "any" and elem_converged:
                 break
@@ -382,6 +1127,15 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
             # Convergence check for 'all' mode
             if qoi_converged and ee_converged and elem_converged:
                 break
+
+            # Stop if the next iteration is projected to exceed the budget
+            if self._budget_exhausted():
+                self._restore_best_iteration()
+                if checkpoint_dir is not None:
+                    self._save_iteration_state(checkpoint_dir)
+                break
+            if checkpoint_dir is not None:
+                self._save_iteration_state(checkpoint_dir)
         else:
             if self.params.convergence_criteria == "all":
                 pyrint(f"Failed to converge in {self.params.maxiter} iterations.")
@@ -393,5 +1147,12 @@ class GoalOrientedMeshSeq(AdjointMeshSeq):
                             f"Failed to converge on subinterval {i} in"
                             f" {self.params.maxiter} iterations."
                         )
+        # Save before restoring the production configuration, so that the checkpoint
+        # is associated with the production time partition, rather than one whose
+        # timesteps have been adapted
+        if checkpoint_dir is not None and self.converged.all():
+            self._save_iteration_state(checkpoint_dir, finished=True)
+        self._finish_continuation()
+        self._report_inexact_solves()
 
         return self.solutions, self.indicators
@@ -2,31 +2,104 @@
 Sequences of meshes corresponding to a :class:`~.TimePartition`.
 """
 
+import json
+import os
+import resource
+import sys
+import time
 from collections.abc import Iterable
 
 import firedrake
 import numpy as np
-from animate.interpolation import transfer
+from animate.interpolation import interpolate, transfer
 from animate.quality import QualityMeasure
 from animate.utility import Mesh
 from firedrake.adjoint import pyadjoint
 from firedrake.petsc import PETSc
 from firedrake.pyplot import triplot
+from mpi4py import MPI
 
 from .function_data import ForwardSolutionData
 from .log import DEBUG, debug, info, logger, pyrint, warning
+from .metric import _anderson_step, _metric_exp, _metric_log
 from .options import AdaptParameters
-from .utility import AttrDict
+from .solver_cache import SolverCache
+from .utility import AttrDict, create_directory
 
 __all__ = ["MeshSeq"]
 
 
+def _serialisable(value):
+    """
+    Convert iteration state into a form which may be written to JSON.
+
+    :arg value: the value to convert
+    :returns: the value, with arrays converted to (nested) lists and scalars converted
+        to Python builtins
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {key: _serialisable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_serialisable(item) for item in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return float(value)
+
+
+def _continuation_stage(**kwargs):
+    """
+    Create a stage of a continuation schedule for a fixed point iteration, filling in
+    the default values, which correspond to the production configuration.
+
+    :kwarg kwargs: the values to override
+    :returns: the continuation stage
+    :rtype: :class:`~.AttrDict`
+    """
+    stage = AttrDict(
+        {
+            "num_iterations": 1,
+            "timestep_factor": 1,
+            "complexity_factor": 1.0,
+            "enrichment_kwargs": {},
+        }
+    )
+    for key, value in kwargs.items():
+        if key not in stage:
+            raise ValueError(f"Unexpected continuation stage key '{key}'.")
+        stage[key] = value
+    if not isinstance(stage.num_iterations, int) or stage.num_iterations < 1:
+        raise ValueError(
+            "Number of iterations in a continuation stage should be a positive integer,"
+            f" not {stage.num_iterations}."
+        )
+    if stage.complexity_factor <= 0:
+        raise ValueError(
+            f"Complexity factor should be positive, not {stage.complexity_factor}."
+        )
+    return stage
+
+
 class MeshSeq:
     """
     A sequence of meshes for solving a PDE associated with a particular
     :class:`~.TimePartition` of the temporal domain.
     """
 
+    # Attributes written to disk when checkpointing a fixed point iteration
+    _persisted_attributes = (
+        "element_counts",
+        "vertex_counts",
+        "converged",
+        "check_convergence",
+        "_adapted_timesteps_per_export",
+    )
+
     @PETSc.Log.EventDecorator()
     def __init__(self, time_partition, initial_meshes, **kwargs):
         r"""
@@ -41,6 +114,7 @@ class MeshSeq:
             :meth:`~.MeshSeq.get_initial_condition`
         :kwarg get_form: a function as described in :meth:`~.MeshSeq.get_form`
         :kwarg get_solver: a function as described in :meth:`~.MeshSeq.get_solver`
+        :kwarg get_bcs: a function as described in :meth:`~.MeshSeq.get_bcs`
         :kwarg transfer_method: the method to use for transferring fields between
             meshes. Options are "project" (default) and "interpolate". See
             :func:`animate.interpolation.transfer` for details
@@ -48,23 +122,49 @@ class MeshSeq:
         :kwarg transfer_kwargs: kwargs to pass to the chosen transfer method
         :type transfer_kwargs: :class:`dict` with :class:`str` keys and values which may
             take various types
+        :kwarg share_meshes: if ``True`` and a single mesh is provided, it is shared by
+            all subintervals, rather than being copied for each of them
+        :type share_meshes: :class:`bool`
+        :kwarg result_cache: an on-disk cache from which the results of solves are
+            reloaded, rather than being recomputed
+        :type result_cache: :class:`~.ResultCache`
+        :kwarg problem_version: an identifier for the problem definition, which is
+            included in the keys of the result cache and should be changed whenever the
+            problem is modified
         """
         self.time_partition = time_partition
         self.fields = {field_name: None for field_name in time_partition.field_names}
         self.field_types = dict(zip(self.fields, time_partition.field_types))
         self.subintervals = time_partition.subintervals
         self.num_subintervals = time_partition.num_subintervals
-        self.set_meshes(initial_meshes)
+        self._solver_cache = SolverCache()
+        self._function_pool = {}
+        self._pooled_fields = False
         self._fs = None
+        self._fs_versions = None
+        self._share_meshes = kwargs.get("share_meshes", False)
+        self._result_cache = kwargs.get("result_cache")
+        self._problem_version = kwargs.get("problem_version")
+        self.set_meshes(initial_meshes)
         self._get_function_spaces = kwargs.get("get_function_spaces")
         self._get_initial_condition = kwargs.get("get_initial_condition")
         self._get_form = kwargs.get("get_form")
         self._get_solver = kwargs.get("get_solver")
+        self._get_bcs = kwargs.get("get_bcs")
         self._transfer_method = kwargs.get("transfer_method", "project")
         self._transfer_kwargs = kwargs.get("transfer_kwargs", {})
         self.steady = time_partition.steady
         self.check_convergence = np.array([True] * len(self), dtype=bool)
         self.converged = np.array([False] * len(self), dtype=bool)
+        self._complexity_ratios = [None] * len(self)
+        self._metric_complexities = [None] * len(self)
+        self._reset_relaxation()
+        self._solver_rtol = None
+        self.solver_iterations_saved = None
+        self._production_time_partition = None
+        self._adapted_timesteps_per_export = None
+        self._continuation_index = None
+        self.continuation_stage = _continuation_stage()
         self.fp_iteration = 0
         self.params = None
         self.sections = [{} for mesh in self]
@@ -129,7 +229,13 @@ class MeshSeq:
         :arg mesh: the mesh to use for that subinterval
         :type subinterval: :class:`firedrake.MeshGeometry`
         """
+        old_mesh = self.meshes[subinterval]
         self.meshes[subinterval] = mesh
+        if mesh is not old_mesh:
+            self._mesh_versions[subinterval] += 1
+        if old_mesh not in self.meshes:
+            self._solver_cache.invalidate(old_mesh)
+            self._purge_function_pool()
 
     def count_elements(self):
         r"""
@@ -162,6 +268,12 @@ class MeshSeq:
         r"""
         Set all meshes in the sequence and deduce various properties.
 
+        If a single mesh is provided then it is copied for each subinterval, unless the
+        sequence was created with ``share_meshes=True``, in which case the same mesh is
+        used for all subintervals. Subintervals which share a mesh also share function
+        spaces and cached solvers, and fields are transferred between them by
+        assignment.
+
         :arg meshes: list of meshes to use in the sequence, or a single mesh to use for
             all subintervals
         :type meshes: :class:`list` of :class:`firedrake.MeshGeometry`\s or
@@ -169,8 +281,17 @@ class MeshSeq:
         """
         # TODO #122: Refactor to use the set method
         if not isinstance(meshes, Iterable):
-            meshes = [Mesh(meshes) for subinterval in self.subintervals]
+            if self._share_meshes:
+                meshes = [meshes for subinterval in self.subintervals]
+            else:
+                meshes = [Mesh(meshes) for subinterval in self.subintervals]
+        old_meshes = getattr(self, "meshes", [])
+        for old_mesh in old_meshes:
+            if old_mesh not in meshes:
+                self._solver_cache.invalidate(old_mesh)
         self.meshes = meshes
+        self._update_mesh_versions(old_meshes)
+        self._purge_function_pool()
         dim = np.array([mesh.topological_dimension() for mesh in meshes])
         if dim.min() != dim.max():
             raise ValueError("Meshes must all have the same topological dimension.")
@@ -188,6 +309,28 @@ class MeshSeq:
                 )
             debug(100 * "-")
 
+    def _update_mesh_versions(self, old_meshes):
+        r"""
+        Increment the version counter associated with each subinterval whose mesh has
+        been replaced, so that only the corresponding function spaces are rebuilt.
+
+        :arg old_meshes: the meshes previously held by the sequence
+        :type old_meshes: :class:`list` of :class:`firedrake.MeshGeometry`\s
+        """
+        if len(old_meshes) != len(self.meshes):
+            self._mesh_versions = [0] * len(self.meshes)
+            self._fs = None
+        elif old_meshes is self.meshes:
+            # The list has been modified in place, so assume all meshes were replaced
+            self._mesh_versions = [version + 1 for version in self._mesh_versions]
+        else:
+            self._mesh_versions = [
+                version if new is old else version + 1
+                for version, old, new in zip(
+                    self._mesh_versions, old_meshes, self.meshes
+                )
+            ]
+
     def plot(self, fig=None, axes=None, **kwargs):
         """
         Plot the meshes comprising a 2D :class:`~.MeshSeq`.
@@ -314,6 +457,132 @@ class MeshSeq:
             raise NotImplementedError("'get_solver' needs implementing.")
         return self._get_solver(self)
 
+    def get_bcs(self):
+        """
+        Get the function mapping a subinterval index to a dictionary of the Dirichlet
+        boundary conditions applied to each field.
+
+        Boundary conditions only need to be provided in this way for methods which
+        operate on the form directly, rather than through the solver. If the function is
+        not provided then no Dirichlet boundary conditions are assumed.
+
+        Signature for the function to be returned:
+        ```
+        :arg index: the subinterval index
+        :type index: :class:`int`
+        :return: map from fields to the corresponding boundary conditions
+        :rtype: :class:`dict` with :class:`str` keys and
+            :class:`list` of :class:`firedrake.bcs.DirichletBC` values
+        ```
+
+        :returns: the function for obtaining the boundary conditions
+        :rtype: see docstring above
+        """
+        if self._get_bcs is None:
+            return lambda index: {}
+        return self._get_bcs(self)
+
+    def get_cached_solver(self, F, u, bcs=None, problem_kwargs=None, **solver_kwargs):
+        """
+        Get a variational solver, reusing one from a previous subinterval or fixed point
+        iteration where possible.
+
+        This is intended to be called from within the function returned by
+        :meth:`~.MeshSeq.get_solver`, in place of constructing a
+        :class:`firedrake.variational_solver.NonlinearVariationalSolver` or
+        :class:`firedrake.variational_solver.LinearVariationalSolver` directly. Cached
+        solvers are removed automatically when the corresponding mesh is replaced.
+
+        For linear problems whose operator does not change in time, passing
+        ``problem_kwargs={"constant_jacobian": True}`` means that the operator is only
+        assembled and factorised once and then reused for all subsequent solves,
+        including those on later subintervals with the same mesh.
+
+        Problems with the same form signature but different solution fields are given
+        separate solvers within a subinterval, so that they do not overwrite each
+        other's data.
+
+        :arg F: the form to solve, or an equation for a linear problem
+        :type F: :class:`ufl.form.Form` or :class:`ufl.equation.Equation`
+        :arg u: the solution field
+        :type u: :class:`firedrake.function.Function`
+        :kwarg bcs: boundary conditions to apply
+        :type bcs: :class:`firedrake.bcs.DirichletBC` or :class:`list` thereof
+        :kwarg problem_kwargs: keyword arguments for the variational problem
+        :type problem_kwargs: :class:`dict` with :class:`str` keys and values which may
+            take various types
+        :returns: the solver
+        :rtype: :class:`~.CachedSolver`
+
+        If inexact solves are enabled in a fixed point iteration then the relative
+        tolerances of the solver are relaxed accordingly - see
+        :meth:`~.MeshSeq.fixed_point_iteration`.
+
+        All other keyword arguments are passed to the solver.
+        """
+        solver = self._solver_cache.get(
+            F, u, bcs=bcs, problem_kwargs=problem_kwargs, **solver_kwargs
+        )
+        solver.relax_tolerances(self._solver_rtol)
+        return solver
+
+    def _acquire_function(self, function_space, name=None):
+        """
+        Get a zeroed :class:`firedrake.function.Function` from the pool of buffers
+        associated with the mesh sequence, allocating one if none are available.
+
+        Functions should be returned to the pool using
+        :meth:`~.MeshSeq._release_function` once they are no longer required.
+
+        :arg function_space: the function space for the function
+        :type function_space: :class:`firedrake.functionspaceimpl.FunctionSpace`
+        :kwarg name: the name to give the function
+        :type name: :class:`str`
+        :returns: the function
+        :rtype: :class:`firedrake.function.Function`
+        """
+        key = (function_space.mesh(), function_space.ufl_element())
+        pool = self._function_pool.get(key)
+        if not pool:
+            return firedrake.Function(function_space, name=name)
+        function = pool.pop()
+        function.dat.zero()
+        if name is not None:
+            function.rename(name)
+        return function
+
+    def _release_function(self, *functions):
+        r"""
+        Return :class:`firedrake.function.Function`\s to the pool of buffers associated
+        with the mesh sequence, so that they may be reused. Functions which are not
+        defined on meshes in the sequence are discarded, as are those which a cached
+        solver was built with. The latter are copied into and out of whenever the
+        cached solver acts upon other functions, so handing them out again would
+        alias distinct fields.
+
+        :arg functions: the functions to release
+        :type functions: :class:`firedrake.function.Function`
+        """
+        for function in functions:
+            fs = function.function_space()
+            if fs.mesh() not in self.meshes:
+                continue
+            if self._solver_cache.references(function):
+                continue
+            key = (fs.mesh(), fs.ufl_element())
+            self._function_pool.setdefault(key, []).append(function)
+
+    def _purge_function_pool(self):
+        """
+        Discard any pooled functions which are defined on meshes which are no longer
+        in the sequence.
+        """
+        self._function_pool = {
+            key: pool
+            for key, pool in self._function_pool.items()
+            if key[0] in self.meshes
+        }
+
     def _transfer(self, source, target_space, **kwargs):
         """
         Transfer a field between meshes using the specified transfer method.
@@ -330,8 +599,30 @@ class MeshSeq:
         :rtype: :class:`firedrake.function.Function` or
             :class:`firedrake.cofunction.Cofunction`
 
+        If the source and target are discretised using the same element on the same
+        mesh then the transfer reduces to an assignment.
+
         Extra keyword arguments are passed to :func:`goalie.interpolation.transfer`.
         """
+        source_space = source.function_space()
+        if isinstance(target_space, (firedrake.Function, firedrake.Cofunction)):
+            space = target_space.function_space()
+        else:
+            space = target_space
+        if (
+            source_space.mesh() is space.mesh()
+            and source_space.ufl_element() == space.ufl_element()
+        ):
+            is_cofunction = isinstance(source, firedrake.Cofunction)
+            if space is not target_space:
+                target = target_space
+            elif is_cofunction:
+                target = firedrake.Cofunction(space.dual())
+            else:
+                target = firedrake.Function(space)
+            if isinstance(target, firedrake.Cofunction) == is_cofunction:
+                return target.assign(source)
+
         # Update kwargs with those specified by the user
         transfer_kwargs = kwargs.copy()
         transfer_kwargs.update(self._transfer_kwargs)
@@ -398,14 +689,26 @@ class MeshSeq:
     def _update_function_spaces(self):
         """
         Update the function space dictionary associated with the mesh sequence.
+
+        Function spaces are only rebuilt for subintervals whose meshes have been
+        replaced since they were last built, as indicated by their version counters.
+        Where the same mesh is used for several subintervals,
+        :meth:`~.MeshSeq.get_function_spaces` is only called for it once.
         """
-        if self._fs is None or not self._function_spaces_consistent():
-            self._fs = AttrDict(
-                {
-                    field: [self.get_function_spaces(mesh)[field] for mesh in self]
-                    for field in self.fields
-                }
-            )
+        if self._fs is None:
+            self._fs = AttrDict({field: [None] * len(self) for field in self.fields})
+            self._fs_versions = [None] * len(self)
+        elif self._fs_versions == self._mesh_versions:
+            return
+        spaces = {}
+        for i, mesh in enumerate(self):
+            if self._fs_versions[i] == self._mesh_versions[i]:
+                continue
+            if id(mesh) not in spaces:
+                spaces[id(mesh)] = self.get_function_spaces(mesh)
+            for field in self.fields:
+                self._fs[field][i] = spaces[id(mesh)][field]
+        self._fs_versions = list(self._mesh_versions)
         assert (
             self._function_spaces_consistent()
         ), "Meshes and function spaces are inconsistent"
@@ -469,19 +772,35 @@ class MeshSeq:
         """
         Reinitialise fields and assign initial conditions on the given subinterval.
 
+        When the tape is not being annotated, the fields are drawn from the pool of
+        buffers associated with the mesh sequence and the previous fields are returned
+        to it, provided they were also drawn from the pool. Otherwise, new fields are
+        allocated, since previous ones may be referenced by the tape. The claims on
+        cached solvers are released, so that they may act upon the new fields.
+
         :arg initial_conditions: the initial conditions to assign to lagged solutions
         :type initial_conditions: :class:`dict` with :class:`str` keys and
             :class:`firedrake.function.Function` values
         """
+        self._solver_cache.release()
+        pooled = not pyadjoint.annotate_tape()
+        if pooled and self._pooled_fields:
+            for field, value in self.fields.items():
+                if field in initial_conditions:
+                    self._release_function(
+                        *(value if isinstance(value, tuple) else (value,))
+                    )
+        allocate = self._acquire_function if pooled else firedrake.Function
         for field, ic in initial_conditions.items():
             fs = ic.function_space()
             if self.field_types[field] == "steady":
-                self.fields[field] = firedrake.Function(fs, name=f"{field}").assign(ic)
+                self.fields[field] = allocate(fs, name=f"{field}").assign(ic)
             else:
                 self.fields[field] = (
-                    firedrake.Function(fs, name=field),
-                    firedrake.Function(fs, name=f"{field}_old").assign(ic),
+                    allocate(fs, name=field),
+                    allocate(fs, name=f"{field}_old").assign(ic),
                 )
+        self._pooled_fields = pooled
 
     @PETSc.Log.EventDecorator()
     def _solve_forward(self, update_solutions=True, solver_kwargs=None):
@@ -595,7 +914,8 @@ class MeshSeq:
         Solve a forward problem on a sequence of subintervals.
 
         A dictionary of solution fields is computed - see :class:`~.ForwardSolutionData`
-        for more details.
+        for more details. If the mesh sequence has a result cache then the solution
+        fields are reloaded from it where possible.
 
         :kwarg solver_kwargs: parameters for the forward solver
         :type solver_kwargs: :class:`dict` whose keys are :class:`str`\s and whose values
@@ -604,9 +924,19 @@ class MeshSeq:
         :rtype: :class:`~.ForwardSolutionData`
         """
         solver_kwargs = solver_kwargs or {}
+        cache = self._result_cache
+        if cache is not None:
+            key = cache.key(
+                self, "forward", solver_kwargs, version=self._problem_version
+            )
+            self._create_solutions()
+            if cache.load(key, self.solutions) is not None:
+                return self.solutions
         solver_gen = self._solve_forward(update_solutions=True, **solver_kwargs)
         for _ in range(len(self)):
             next(solver_gen)
+        if cache is not None:
+            cache.store(key, self.solutions)
 
         return self.solutions
 
@@ -653,6 +983,626 @@ class MeshSeq:
 
         return converged
 
+    def check_metric_convergence(self, metrics):
+        r"""
+        Check whether adapting the meshes to the given metrics is expected to change
+        their element counts, so that remeshing may be skipped where it is not.
+
+        The element count associated with a metric is predicted by multiplying its
+        complexity by a ratio, which is calibrated on each subinterval using the meshes
+        adapted to the metrics passed on the previous call. The complexities are kept
+        when the meshes are set, so that calibration carries over between fixed point
+        iterations. Subintervals whose predicted element count lies within the relative
+        tolerance ``element_rtol`` of the current count are marked as converged in
+        :attr:`~.MeshSeq.converged`. Nothing is predicted on a subinterval until its
+        ratio has been calibrated.
+
+        This method should be called by an adaptor once the metrics have been
+        normalised but before the meshes are adapted. Remeshing is not skipped
+        automatically: the adaptor should check :attr:`~.MeshSeq.converged` and only
+        adapt the meshes on subintervals which have not converged.
+
+        :arg metrics: the metrics for each subinterval
+        :type metrics: :class:`list` of :class:`animate.metric.RiemannianMetric`\s
+        :return: an array, whose entries are ``True`` if no change in element count is
+            predicted on the corresponding subinterval
+        :rtype: :class:`list` of :class:`bool`\s
+        """
+        if len(metrics) != len(self):
+            raise ValueError(
+                f"Number of metrics ({len(metrics)}) does not match the number of"
+                f" subintervals ({len(self)})."
+            )
+        params = self.params or AdaptParameters()
+        element_counts = self.count_elements()
+        converged = self.converged.copy()
+        for i, (metric, ne) in enumerate(zip(metrics, element_counts)):
+            # Calibrate the ratio using the mesh adapted to the previous metric
+            if self._metric_complexities[i] is not None:
+                self._complexity_ratios[i] = ne / self._metric_complexities[i]
+            complexity = metric.complexity()
+            self._metric_complexities[i] = complexity
+            ratio = self._complexity_ratios[i]
+            if converged[i] or not self.check_convergence[i] or ratio is None:
+                continue
+            if abs(ratio * complexity - ne) <= params.element_rtol * ne:
+                converged[i] = True
+                self.info(f"No change in element count predicted on subinterval {i}.")
+
+        # Check only early subintervals are marked as converged
+        if params.drop_out_converged and not converged.all():
+            first_not_converged = converged.argsort()[0]
+            converged[first_not_converged:] = False
+
+        # Meshes which are not adapted cannot be used for calibration
+        for i in np.where(converged)[0]:
+            self._metric_complexities[i] = None
+        self.converged[:] = converged
+        return converged
+
+    def _set_time_partition(self, time_partition):
+        """
+        Replace the time partition, for example when moving between the stages of a
+        continuation schedule. The meshes are retained, while the solution data are
+        reallocated for the new time partition when the problem is next solved.
+
+        :arg time_partition: the new time partition, which should have the same
+            subintervals and fields as the current one
+        :type time_partition: :class:`~.TimePartition`
+        """
+        tp = self.time_partition
+        if not np.allclose(time_partition.subintervals, tp.subintervals):
+            raise ValueError("Time partitions have different subintervals.")
+        if time_partition.field_names != tp.field_names:
+            raise ValueError("Time partitions have different fields.")
+        if time_partition.steady != self.steady:
+            raise ValueError("Cannot switch between steady and unsteady partitions.")
+        self.time_partition = time_partition
+
+    def _start_continuation(self, continuation):
+        r"""
+        Set up a continuation schedule for a fixed point iteration loop.
+
+        :arg continuation: the stages of the schedule, as dictionaries
+        :type continuation: :class:`list` of :class:`dict`\s
+        :returns: the validated stages
+        :rtype: :class:`list` of :class:`~.AttrDict`\s
+        """
+        stages = [_continuation_stage(**stage) for stage in continuation or []]
+        self._production_time_partition = self.time_partition
+        self._continuation_index = None
+        return stages
+
+    def _update_continuation(self, stages):
+        r"""
+        Move to the continuation stage associated with the current fixed point
+        iteration, coarsening the time partition as required.
+
+        :arg stages: the stages of the continuation schedule
+        :type stages: :class:`list` of :class:`~.AttrDict`\s
+        :returns: ``True`` if the production configuration has been reached
+        :rtype: :class:`bool`
+        """
+        index = len(stages)
+        end = 0
+        for i, stage in enumerate(stages):
+            end += stage.num_iterations
+            if self.fp_iteration < end:
+                index = i
+                break
+        if index != self._continuation_index:
+            self._continuation_index = index
+            if index == len(stages):
+                self.continuation_stage = _continuation_stage()
+                self._set_time_partition(self._production_configuration())
+                if stages:
+                    pyrint("Continuation complete. Using the production configuration.")
+            else:
+                stage = self.continuation_stage = stages[index]
+                factor = stage.timestep_factor
+                tp = self._production_time_partition
+                self._set_time_partition(tp if factor == 1 else tp.coarsen(factor))
+                pyrint(
+                    f"Continuation stage {index + 1}/{len(stages)}: timestep factor"
+                    f" {factor}, complexity factor {stage.complexity_factor}."
+                )
+        return index == len(stages)
+
+    def _finish_continuation(self):
+        """
+        Restore the production configuration at the end of a fixed point iteration
+        loop.
+        """
+        if self._production_time_partition is not None:
+            self._set_time_partition(self._production_configuration())
+        self._production_time_partition = None
+        self._continuation_index = None
+        self.continuation_stage = _continuation_stage()
+
+    def _production_configuration(self):
+        """
+        :returns: the time partition of the production configuration, with any
+            timesteps chosen by :meth:`~.MeshSeq.adapt_timesteps` applied
+        :rtype: :class:`~.TimePartition`
+        """
+        tp = self._production_time_partition or self.time_partition
+        tspe = self._adapted_timesteps_per_export
+        return tp if tspe is None else tp.resample(tspe)
+
+    @PETSc.Log.EventDecorator()
+    def temporal_indicators(self):
+        """
+        Compute temporal error indicators for each subinterval from the forward solution
+        data, as the largest relative change in :math:`L^2` norm between consecutive
+        exports of any unsteady field.
+
+        Subintervals with fewer than two exports provide no information, so their
+        indicators are infinite.
+
+        :returns: the temporal error indicator for each subinterval
+        :rtype: :class:`numpy.ndarray`
+        """
+        indicators = np.zeros(len(self))
+        for field, by_label in self.solutions.items():
+            if self.field_types[field] == "steady":
+                continue
+            for i, exports in enumerate(by_label["forward"]):
+                if len(exports) < 2:
+                    indicators[i] = np.inf
+                for before, after in zip(exports[:-1], exports[1:]):
+                    scale = max(firedrake.norm(before), firedrake.norm(after))
+                    if scale > 0:
+                        change = firedrake.norm(after - before) / scale
+                        indicators[i] = max(indicators[i], change)
+        return indicators
+
+    @PETSc.Log.EventDecorator()
+    def adapt_timesteps(self):
+        r"""
+        Adapt the number of timesteps per export on each subinterval using the temporal
+        error indicators from :meth:`~.MeshSeq.temporal_indicators`.
+
+        The number of timesteps per export is chosen so that the relative change in the
+        solution over each timestep is approximately ``timestep_rtol``. The export times
+        are retained and the timesteps of the production configuration are treated as
+        the finest permitted, so that only unneeded timesteps are removed. Subintervals
+        with fewer than two exports keep their finest timesteps and a warning is
+        logged, since no temporal error indicator is available for them. The solution
+        data are reallocated for the new time partition when the problem is next
+        solved.
+
+        :returns: flags indicating the subintervals whose timesteps have changed
+        :rtype: :class:`numpy.ndarray` of :class:`bool`\s
+        """
+        finest = self._production_time_partition or self.time_partition
+        current = self.time_partition.num_timesteps_per_export
+        indicators = self.temporal_indicators()
+        uninformed = np.where(np.isinf(indicators))[0]
+        if len(uninformed) > 0:
+            self.warning(
+                "Timesteps cannot be adapted on subintervals with fewer than two"
+                f" exports: {', '.join(map(str, uninformed))}. Their finest timesteps"
+                " are used."
+            )
+        tspe = [
+            int(np.clip(np.ceil(indicator / self.params.timestep_rtol), 1, tspe_max))
+            if np.isfinite(indicator)
+            else tspe_max
+            for indicator, tspe_max in zip(indicators, finest.num_timesteps_per_export)
+        ]
+        changed = np.not_equal(tspe, current)
+        if changed.any():
+            num_timesteps = self.time_partition.num_timesteps
+            self._adapted_timesteps_per_export = tspe
+            self._set_time_partition(self._production_configuration())
+            pyrint(
+                f"Adapted timesteps on {changed.sum()} subintervals:"
+                f" {num_timesteps} -> {self.time_partition.num_timesteps} timesteps."
+            )
+        return changed
+
+    def _update_timesteps(self, production):
+        r"""
+        Adapt the timesteps for the next iteration of a fixed point iteration loop, if
+        the ``timestep_adaptation`` parameter is set. Timesteps are only adapted in the
+        production configuration and not in the final permitted iteration.
+
+        :arg production: has the production configuration been reached?
+        :type production: :class:`bool`
+        :returns: flags indicating the subintervals whose timesteps have changed
+        :rtype: :class:`numpy.ndarray` of :class:`bool`\s
+        """
+        params = self.params
+        final = self.fp_iteration == params.maxiter - 1
+        if production and params.timestep_adaptation and not final:
+            return self.adapt_timesteps()
+        return np.zeros(len(self), dtype=bool)
+
+    def _start_inexact_solves(self):
+        """
+        Start recording the solver iterations used in a fixed point iteration loop.
+        """
+        cache = self._solver_cache
+        self._solver_counts = (cache.num_solves, cache.linear_iterations)
+        self._inexact_history = []
+        self.solver_iterations_saved = None
+
+    def _inexact_rtol(self, change):
+        """
+        Determine the relative solver tolerance to use in the current iteration of a
+        fixed point iteration loop.
+
+        The tolerance is proportional to the relative change in the convergence
+        measure over the previous iteration, so that it tightens as convergence
+        approaches. It is capped at ``inexact_rtol``, which is also used if no change
+        is available yet. Solves in the final permitted iteration are exact.
+
+        :arg change: the relative change in the convergence measure, or ``None``
+        :type change: :class:`float`
+        :returns: the relaxed tolerance, or ``None`` if solves should be exact
+        :rtype: :class:`float`
+        """
+        params = self.params
+        if not params.inexact_solves or self.fp_iteration == params.maxiter - 1:
+            return None
+        if change is None:
+            return params.inexact_rtol
+        return min(params.inexact_rtol, params.inexact_factor * change)
+
+    def _record_solver_iterations(self):
+        """
+        Record the number of solves and linear solver iterations in the current
+        iteration of a fixed point iteration loop, along with the relaxed tolerance.
+        """
+        cache = self._solver_cache
+        num_solves, its = cache.num_solves, cache.linear_iterations
+        self._inexact_history.append(
+            (
+                self._solver_rtol or 0.0,
+                num_solves - self._solver_counts[0],
+                its - self._solver_counts[1],
+            )
+        )
+        self._solver_counts = (num_solves, its)
+
+    def _report_inexact_solves(self):
+        """
+        Report the linear solver iterations used in a fixed point iteration loop with
+        inexact solves, along with an estimate of the number saved.
+
+        The estimate assumes that every solve would have taken as many iterations as
+        the average solve in the iteration with the tightest tolerance.
+        """
+        self._solver_rtol = None
+        if not self.params.inexact_solves:
+            return
+        history = self._inexact_history
+        total = sum(its for _, _, its in history)
+        tightest = min(history, key=lambda entry: entry[0], default=(0.0, 0, 0))
+        if tightest[1] == 0:
+            pyrint(f"Inexact solves used {total} linear solver iterations.")
+            return
+        per_solve = tightest[2] / tightest[1]
+        saved = sum(per_solve * num_solves - its for _, num_solves, its in history)
+        self.solver_iterations_saved = max(int(round(saved)), 0)
+        pyrint(
+            f"Inexact solves used {total} linear solver iterations, saving an estimated"
+            f" {self.solver_iterations_saved}."
+        )
+
+    def _reset_relaxation(self):
+        """
+        Discard the history of metrics used by :meth:`~.MeshSeq.relax_metrics`.
+        """
+        self._relaxation_logs = [None] * len(self)
+        self._relaxation_inputs = []
+        self._relaxation_outputs = []
+
+    @PETSc.Log.EventDecorator()
+    def relax_metrics(self, metrics):
+        r"""
+        Relax the metrics computed in the current fixed point iteration using those of
+        previous iterations, in order to damp oscillations in the element counts.
+
+        The approach is determined by the ``metric_relaxation`` parameter:
+        * ``'none'``: the metrics are left unchanged;
+        * ``'log_euclidean'``: each metric :math:`\mathcal{M}` is replaced by the
+          log-Euclidean average
+          :math:`\exp(w\log\mathcal{M}+(1-w)\log\mathcal{M}_{\mathrm{prev}})`, where
+          :math:`w` is the ``relaxation_weight`` parameter and
+          :math:`\mathcal{M}_{\mathrm{prev}}` is the relaxed metric from the previous
+          iteration, interpolated onto the current mesh;
+        * ``'anderson'``: each metric is rescaled so that the metric complexities
+          follow Anderson acceleration of the fixed point iteration for the
+          complexities, with a history of length ``anderson_depth``.
+
+        This method should be called by an adaptor once the metrics have been
+        normalised but before the meshes are adapted.
+
+        :arg metrics: the metrics for each subinterval
+        :type metrics: :class:`list` of :class:`animate.metric.RiemannianMetric`\s
+        :returns: the relaxed metrics, which are modified in place
+        :rtype: :class:`list` of :class:`animate.metric.RiemannianMetric`\s
+        """
+        if len(metrics) != len(self):
+            raise ValueError(
+                f"Number of metrics ({len(metrics)}) does not match the number of"
+                f" subintervals ({len(self)})."
+            )
+        params = self.params or AdaptParameters()
+        if params.metric_relaxation == "log_euclidean":
+            weight = params.relaxation_weight
+            for i, metric in enumerate(metrics):
+                fs = metric.function_space()
+                dim = fs.mesh().topological_dimension()
+                log = _metric_log(metric.dat.data_ro, dim)
+                if self._relaxation_logs[i] is not None:
+                    previous = interpolate(self._relaxation_logs[i], fs)
+                    log = weight * log + (1 - weight) * previous.dat.data_ro
+                    metric.dat.data_wo[:] = _metric_exp(log, dim)
+                self._relaxation_logs[i] = firedrake.Function(fs)
+                self._relaxation_logs[i].dat.data_wo[:] = log
+        elif params.metric_relaxation == "anderson":
+            # The complexities of the new metrics are the result of applying the fixed
+            # point map to the complexities used in the previous iteration
+            complexities = np.array([metric.complexity() for metric in metrics])
+            targets = complexities
+            if self._relaxation_inputs:
+                self._relaxation_outputs.append(complexities)
+                depth = params.anderson_depth + 1
+                targets = _anderson_step(
+                    self._relaxation_inputs[-depth:], self._relaxation_outputs[-depth:]
+                )
+                if (targets <= 0).any():
+                    targets = complexities
+            self._relaxation_inputs.append(targets)
+            for metric, complexity, target in zip(metrics, complexities, targets):
+                dim = metric.function_space().mesh().topological_dimension()
+                metric.assign(pow(target / complexity, 2 / dim) * metric)
+        return metrics
+
+    def _start_budget(self):
+        """
+        Start measuring the resources used by a fixed point iteration loop.
+        """
+        self._budget_start = time.perf_counter()
+        self._iteration_start = self._budget_start
+        self._iteration_costs = []
+        self._best_iteration = None
+
+    @property
+    def _budget_set(self):
+        """
+        :returns: ``True`` if any resource budget is set in the parameters
+        :rtype: :class:`bool`
+        """
+        keys = ("max_wallclock", "max_core_hours", "max_memory")
+        return any(np.isfinite(self.params[key]) for key in keys)
+
+    @staticmethod
+    def _peak_memory():
+        """
+        :returns: the peak resident memory of any process, in megabytes
+        :rtype: :class:`float`
+        """
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak /= 1024**2 if sys.platform == "darwin" else 1024
+        return firedrake.COMM_WORLD.allreduce(peak, op=MPI.MAX)
+
+    def _track_best_iteration(self, stability, meshes, **state):
+        r"""
+        Keep a record of the current iteration if it is the most stable so far, so that
+        it may be restored if the resource budget is exhausted.
+
+        Records are only kept if a budget is set, since they retain the solution data
+        of the recorded iteration.
+
+        :arg stability: relative change in the convergence measure since the previous
+            iteration, or ``None`` if it is not yet available
+        :type stability: :class:`float`
+        :arg meshes: the meshes used in the current iteration
+        :type meshes: :class:`list` of :class:`firedrake.MeshGeometry`\s
+        :kwarg state: the attributes to restore, keyed by name
+        """
+        if not self._budget_set:
+            return
+        stability = np.inf if stability is None else stability
+        best = self._best_iteration
+        if best is None or stability <= best["stability"]:
+            self._best_iteration = {
+                "iteration": self.fp_iteration,
+                "stability": stability,
+                "meshes": meshes,
+                "state": state,
+            }
+
+    def _restore_best_iteration(self):
+        """
+        Restore the meshes and data of the most stable iteration recorded by
+        :meth:`~.MeshSeq._track_best_iteration`.
+        """
+        best = self._best_iteration
+        if best is None:
+            return
+        pyrint(f"Returning the most stable iteration, {best['iteration'] + 1}.")
+        for i, mesh in enumerate(best["meshes"]):
+            self[i] = mesh
+        for name, value in best["state"].items():
+            setattr(self, name, value)
+
+    def _budget_exhausted(self):
+        """
+        Record the cost of the iteration which has just completed, project the cost of
+        the next iteration from the measured history and determine whether it would
+        exceed any of the budgets in the parameters.
+
+        :returns: ``True`` if another iteration would exceed the budget
+        :rtype: :class:`bool`
+        """
+        comm = firedrake.COMM_WORLD
+        now = time.perf_counter()
+        duration = comm.allreduce(now - self._iteration_start, op=MPI.MAX)
+        self._iteration_costs.append((duration, self._peak_memory()))
+        self._iteration_start = now
+        if not self._budget_set:
+            return False
+
+        # Extrapolate linearly from the last two iterations, assuming that costs do not
+        # decrease
+        durations, memory = np.transpose(self._iteration_costs)
+        next_duration = durations[-1]
+        next_memory = memory[-1]
+        if len(durations) > 1:
+            next_duration = max(next_duration, 2 * durations[-1] - durations[-2])
+            next_memory = max(next_memory, 2 * memory[-1] - memory[-2])
+        elapsed = comm.allreduce(now - self._budget_start, op=MPI.MAX)
+        wallclock = elapsed + next_duration
+        projections = {
+            "wall-clock": (wallclock, self.params.max_wallclock),
+            "core-hour": (wallclock * comm.size / 3600, self.params.max_core_hours),
+            "memory": (next_memory, self.params.max_memory),
+        }
+        exceeded = [key for key, (value, limit) in projections.items() if value > limit]
+        if exceeded:
+            pyrint(
+                f"Stopping after {self.fp_iteration + 1} iterations, since another"
+                f" iteration is projected to exceed the {', '.join(exceeded)} budget."
+            )
+        return bool(exceeded)
+
+    def _time_partition_signature(self, time_partition=None):
+        """
+        :kwarg time_partition: the time partition to summarise, if not the current one
+        :type time_partition: :class:`~.TimePartition`
+        :returns: a summary of the time partition, used to check that checkpointed
+            iteration state belongs to the same configuration
+        :rtype: :class:`dict`
+        """
+        tp = time_partition or self.time_partition
+        return {
+            "start_time": float(tp.start_time),
+            "end_time": float(tp.end_time),
+            "num_subintervals": int(tp.num_subintervals),
+            "timesteps": _serialisable(tp.timesteps),
+            "field_names": list(tp.field_names),
+        }
+
+    @PETSc.Log.EventDecorator()
+    def _save_iteration_state(self, checkpoint_dir, finished=False):
+        """
+        Write the state of the current fixed point iteration to disk.
+
+        Each distinct mesh is written to its own HDF5 file using a
+        :class:`firedrake.checkpointing.CheckpointFile` and everything else is written
+        to ``state.json``. Files are written under temporary names and then renamed,
+        so that an interrupted write never leaves an inconsistent checkpoint.
+
+        :arg checkpoint_dir: directory to write the checkpoint to
+        :type checkpoint_dir: :class:`str`
+        :kwarg finished: has the fixed point iteration converged?
+        :type finished: :class:`bool`
+        """
+        comm = firedrake.COMM_WORLD
+        create_directory(checkpoint_dir, comm=comm)
+        mesh_files, mesh_names, mesh_indices = [], [], {}
+        for mesh in self.meshes:
+            if id(mesh) not in mesh_indices:
+                mesh_indices[id(mesh)] = len(mesh_files)
+                fname = f"mesh_{self.fp_iteration}_{len(mesh_files)}.h5"
+                path = os.path.join(checkpoint_dir, fname)
+                with firedrake.CheckpointFile(f"{path}.tmp", "w", comm=comm) as cf:
+                    cf.save_mesh(mesh)
+                mesh_files.append(fname)
+                mesh_names.append(mesh.name)
+        state = {
+            "fp_iteration": self.fp_iteration,
+            "finished": bool(finished),
+            "time_partition": self._time_partition_signature(
+                self._production_time_partition
+            ),
+            "params": _serialisable(dict(self.params)),
+            "mesh_files": mesh_files,
+            "mesh_names": mesh_names,
+            "meshes": [mesh_indices[id(mesh)] for mesh in self.meshes],
+        }
+        for name in self._persisted_attributes:
+            state[name] = _serialisable(getattr(self, name))
+        comm.barrier()
+        if comm.rank == 0:
+            for fname in mesh_files:
+                path = os.path.join(checkpoint_dir, fname)
+                os.replace(f"{path}.tmp", path)
+            path = os.path.join(checkpoint_dir, "state.json")
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(state, f)
+            os.replace(f"{path}.tmp", path)
+
+            # Remove meshes from previous iterations
+            for fname in os.listdir(checkpoint_dir):
+                if fname.startswith("mesh_") and fname.endswith(".h5"):
+                    if fname not in mesh_files:
+                        os.remove(os.path.join(checkpoint_dir, fname))
+        comm.barrier()
+
+    @PETSc.Log.EventDecorator()
+    def _load_iteration_state(self, checkpoint_dir):
+        """
+        Restore the state of a fixed point iteration written by
+        :meth:`~.MeshSeq._save_iteration_state`.
+
+        The current parameters are kept, with a warning being logged for any which
+        differ from those in the checkpoint.
+
+        :arg checkpoint_dir: directory to read the checkpoint from
+        :type checkpoint_dir: :class:`str`
+        :returns: the checkpointed state, or ``None`` if there is no checkpoint
+        :rtype: :class:`dict`
+        """
+        path = os.path.join(checkpoint_dir, "state.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            state = json.load(f)
+        signature = self._time_partition_signature(self._production_time_partition)
+        if state["time_partition"] != signature:
+            raise ValueError(
+                f"Checkpoint in '{checkpoint_dir}' does not match the time partition."
+            )
+
+        # Keep the current parameters, but warn if they have changed
+        params = _serialisable(dict(self.params))
+        mismatched = sorted(
+            key
+            for key in {*params, *state["params"]}
+            if params.get(key) != state["params"].get(key)
+        )
+        if mismatched:
+            self.warning(
+                "Resuming with parameters which differ from those in the checkpoint:"
+                f" {', '.join(mismatched)}. The new values are used."
+            )
+
+        # Load each distinct mesh once, so that shared meshes remain shared
+        comm = firedrake.COMM_WORLD
+        meshes = []
+        for fname, name in zip(state["mesh_files"], state["mesh_names"]):
+            mesh_path = os.path.join(checkpoint_dir, fname)
+            with firedrake.CheckpointFile(mesh_path, "r", comm=comm) as cf:
+                meshes.append(cf.load_mesh(name))
+        self.set_meshes([meshes[index] for index in state["meshes"]])
+
+        self.fp_iteration = state["fp_iteration"]
+        for name in self._persisted_attributes:
+            current = getattr(self, name)
+            if isinstance(current, np.ndarray):
+                current[:] = state[name]
+            else:
+                setattr(self, name, state[name])
+        pyrint(
+            f"Resuming from iteration {self.fp_iteration + 1} in '{checkpoint_dir}'."
+        )
+        return state
+
     @PETSc.Log.EventDecorator()
     def fixed_point_iteration(
         self,
@@ -661,10 +1611,48 @@ class MeshSeq:
         update_params=None,
         solver_kwargs=None,
         adaptor_kwargs=None,
+        checkpoint_dir=None,
+        resume=False,
+        continuation=None,
     ):
         r"""
         Apply mesh adaptation using a fixed point iteration loop approach.
 
+        If any of the resource budgets in the parameters are set, the cost of the next
+        iteration is projected from those so far and the loop is stopped if it would
+        exceed a budget. In that case, the meshes and solution data of the iteration
+        whose element counts were the most stable are restored.
+
+        If a checkpoint directory is given then the meshes, parameters, element and
+        vertex counts and convergence flags are written to it after each iteration.
+        With ``resume=True``, the loop restarts from the last iteration recorded there.
+        If the recorded loop had already converged then its meshes are reused and only
+        the final forward solve is performed.
+
+        A continuation schedule may be given as a list of stages, each of which is a
+        dictionary with the following optional keys:
+        * ``'num_iterations'``: the number of iterations in the stage (default 1);
+        * ``'timestep_factor'``: the factor by which the timesteps are coarsened, which
+          should divide the numbers of timesteps per export (default 1);
+        * ``'complexity_factor'``: the factor by which adaptors should scale their target
+          complexity, which they may access as the ``complexity_factor`` entry of
+          :attr:`~.MeshSeq.continuation_stage` (default 1.0).
+        The stages are applied in order, after which the production configuration is
+        used for the remaining iterations. Meshes are carried over between stages and
+        convergence is only checked once the production configuration is reached.
+
+        If the ``inexact_solves`` parameter is set then the relative tolerances of
+        solvers obtained using :meth:`~.MeshSeq.get_cached_solver` are relaxed in early
+        iterations, to ``inexact_factor`` times the relative change in the total element
+        count over the previous iteration, capped at ``inexact_rtol``. The number of
+        linear solver iterations used, and an estimate of the number saved, are reported
+        at the end.
+
+        If the ``timestep_adaptation`` parameter is set then the timesteps are adapted
+        between iterations using :meth:`~.MeshSeq.adapt_timesteps`, once the production
+        configuration is reached. Element count convergence is not declared on
+        subintervals whose timesteps have just changed.
+
         :arg adaptor: function for adapting the mesh sequence. Its arguments are the mesh
             sequence and the solution data object. It should return ``True`` if the
             convergence criteria checks are to be skipped for this iteration. Otherwise,
@@ -680,10 +1668,18 @@ class MeshSeq:
         :kwarg adaptor_kwargs: parameters to pass to the adaptor
         :type adaptor_kwargs: :class:`dict` with :class:`str` keys and values which may
             take various types
+        :kwarg checkpoint_dir: directory for writing the state of each iteration
+        :type checkpoint_dir: :class:`str`
+        :kwarg resume: should the loop be resumed from the state in ``checkpoint_dir``?
+        :type resume: :class:`bool`
+        :kwarg continuation: the stages of a continuation schedule
+        :type continuation: :class:`list` of :class:`dict`\s
         :returns: solution data object
         :rtype: :class:`~.ForwardSolutionData`
         """
         # TODO #124: adaptor no longer needs solution data to be passed explicitly
+        if resume and checkpoint_dir is None:
+            raise ValueError("Resuming requires a checkpoint directory.")
         self.params = parameters or AdaptParameters()
         solver_kwargs = solver_kwargs or {}
         adaptor_kwargs = adaptor_kwargs or {}
@@ -691,14 +1687,34 @@ class MeshSeq:
         self._reset_counts()
         self.converged[:] = False
         self.check_convergence[:] = True
-
-        for fp_iteration in range(self.params.maxiter):
+        self._reset_relaxation()
+        self._adapted_timesteps_per_export = None
+        first_iteration = 0
+        if resume:
+            state = self._load_iteration_state(checkpoint_dir)
+            if state is not None and state["finished"]:
+                self._set_time_partition(self._production_configuration())
+                self.solve_forward(solver_kwargs=solver_kwargs)
+                return self.solutions
+            if state is not None:
+                first_iteration = self.fp_iteration + 1
+        stages = self._start_continuation(continuation)
+        self._start_budget()
+        self._start_inexact_solves()
+        change = None
+
+        for fp_iteration in range(first_iteration, self.params.maxiter):
             self.fp_iteration = fp_iteration
+            production = self._update_continuation(stages)
             if update_params is not None:
                 update_params(self.params, self.fp_iteration)
+            meshes = list(self.meshes)
+            timesteps_per_export = self._adapted_timesteps_per_export
 
             # Solve the forward problem over all meshes
+            self._solver_rtol = self._inexact_rtol(change)
             self.solve_forward(solver_kwargs=solver_kwargs)
+            self._record_solver_iterations()
 
             # Adapt meshes, logging element and vertex counts
             continue_unconditionally = adaptor(self, self.solutions, **adaptor_kwargs)
@@ -708,11 +1724,31 @@ class MeshSeq:
                 )
             self.element_counts.append(self.count_elements())
             self.vertex_counts.append(self.count_vertices())
+            timesteps_changed = self._update_timesteps(production)
 
             # Check for element count convergence
-            self.converged[:] = self.check_element_count_convergence()
+            if production:
+                self.converged[:] = self.check_element_count_convergence()
+                self.converged[timesteps_changed] = False
             if self.converged.all():
                 break
+
+            # Stop if the next iteration is projected to exceed the budget
+            previous, current = np.sum(self.element_counts[-2:], axis=1)
+            stability = change = abs(current - previous) / previous
+            self._track_best_iteration(
+                stability,
+                meshes,
+                _solutions=self.solutions,
+                _adapted_timesteps_per_export=timesteps_per_export,
+            )
+            if self._budget_exhausted():
+                self._restore_best_iteration()
+                if checkpoint_dir is not None:
+                    self._save_iteration_state(checkpoint_dir)
+                break
+            if checkpoint_dir is not None:
+                self._save_iteration_state(checkpoint_dir)
         else:
             for i, conv in enumerate(self.converged):
                 if not conv:
@@ -720,5 +1756,12 @@ class MeshSeq:
                         f"Failed to converge on subinterval {i} in"
                         f" {self.params.maxiter} iterations."
                     )
+        # Save before restoring the production configuration, so that the checkpoint
+        # is associated with the production time partition, rather than one whose
+        # timesteps have been adapted
+        if checkpoint_dir is not None and self.converged.all():
+            self._save_iteration_state(checkpoint_dir, finished=True)
+        self._finish_continuation()
+        self._report_inexact_solves()
 
         return self.solutions
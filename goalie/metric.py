@@ -10,9 +10,14 @@ import ufl
 from animate.metric import RiemannianMetric
 from firedrake.petsc import PETSc
 
-from .log import debug
+from .log import debug, warning
 
-__all__ = ["enforce_variable_constraints", "space_time_normalise", "ramp_complexity"]
+__all__ = [
+    "enforce_variable_constraints",
+    "space_time_normalise",
+    "allocate_complexity",
+    "ramp_complexity",
+]
 
 
 @PETSc.Log.EventDecorator()
@@ -60,6 +65,256 @@ def enforce_variable_constraints(
     return metrics
 
 
+def _as_vertex_array(value):
+    """
+    Convert a metric parameter into a column array which can be broadcast against
+    vertex data.
+    """
+    if isinstance(value, firedrake.Function):
+        value = value.dat.data_ro
+    return np.reshape(np.asarray(value, dtype=float), (-1, 1))
+
+
+def _restrict_eigenvalues(
+    eigenvalues,
+    h_min=1.0e-30,
+    h_max=1.0e30,
+    a_max=1.0e5,
+    restrict_sizes=True,
+    restrict_anisotropy=True,
+):
+    """
+    Restrict the eigenvalues of a batch of metrics in the same way as
+    :meth:`~.RiemannianMetric.enforce_spd`.
+
+    :arg eigenvalues: eigenvalues at each vertex, with shape ``(num_vertices, dim)``
+    :type eigenvalues: :class:`numpy.ndarray`
+    :kwarg h_min: minimum tolerated element size
+    :kwarg h_max: maximum tolerated element size
+    :kwarg a_max: maximum tolerated element anisotropy
+    :kwarg restrict_sizes: if ``True``, minimum and maximum metric magnitudes are
+        enforced
+    :type restrict_sizes: :class:`bool`
+    :kwarg restrict_anisotropy: if ``True``, maximum anisotropy is enforced
+    :type restrict_anisotropy: :class:`bool`
+    :returns: the restricted eigenvalues
+    :rtype: :class:`numpy.ndarray`
+    """
+    eigenvalues = np.abs(eigenvalues)
+    if restrict_sizes:
+        h_min, h_max = _as_vertex_array(h_min), _as_vertex_array(h_max)
+        eigenvalues = np.clip(eigenvalues, pow(h_max, -2), pow(h_min, -2))
+    if restrict_anisotropy:
+        lower = eigenvalues.max(axis=1, keepdims=True) / pow(_as_vertex_array(a_max), 2)
+        eigenvalues = np.maximum(eigenvalues, lower)
+    return eigenvalues
+
+
+def _restrictions(mp, restrict_sizes=True, restrict_anisotropy=True):
+    """
+    Extract the keyword arguments for :func:`_restrict_eigenvalues` from a dictionary
+    of metric parameters, using the same defaults as PETSc.
+    """
+    return {
+        "h_min": mp.get("dm_plex_metric_h_min", 1.0e-30),
+        "h_max": mp.get("dm_plex_metric_h_max", 1.0e30),
+        "a_max": mp.get("dm_plex_metric_a_max", 1.0e5),
+        "restrict_sizes": restrict_sizes,
+        "restrict_anisotropy": restrict_anisotropy,
+    }
+
+
+def _spectral_map(data, dim, fn):
+    """
+    Apply a function to the eigenvalues of a batch of symmetric matrices.
+
+    :arg data: matrix data at each vertex, as stored by a
+        :class:`animate.metric.RiemannianMetric`
+    :type data: :class:`numpy.ndarray`
+    :arg dim: the spatial dimension
+    :type dim: :class:`int`
+    :arg fn: the function to apply to the eigenvalues
+    :returns: the mapped matrix data, with the same shape as the input
+    :rtype: :class:`numpy.ndarray`
+    """
+    values, vectors = np.linalg.eigh(data.reshape(-1, dim, dim))
+    mapped = np.einsum("nij,nj,nkj->nik", vectors, fn(values), vectors)
+    return mapped.reshape(data.shape)
+
+
+def _metric_log(data, dim):
+    """
+    Compute the matrix logarithm of metric data at each vertex.
+    """
+    return _spectral_map(data, dim, lambda values: np.log(np.abs(values) + 1.0e-300))
+
+
+def _metric_exp(data, dim):
+    """
+    Compute the matrix exponential of (logarithmic) metric data at each vertex.
+    """
+    return _spectral_map(data, dim, np.exp)
+
+
+def _anderson_step(inputs, outputs):
+    r"""
+    Compute the next iterate of a fixed point iteration :math:`x = g(x)` using Anderson
+    acceleration.
+
+    :arg inputs: the history of iterates :math:`x_k`, oldest first
+    :type inputs: :class:`list` of :class:`numpy.ndarray`\s
+    :arg outputs: the corresponding values :math:`g(x_k)`
+    :type outputs: :class:`list` of :class:`numpy.ndarray`\s
+    :returns: the extrapolated iterate
+    :rtype: :class:`numpy.ndarray`
+    """
+    g = np.transpose(outputs)
+    f = g - np.transpose(inputs)
+    if g.shape[1] == 1:
+        return g[:, -1]
+    gamma = np.linalg.lstsq(np.diff(f, axis=1), f[:, -1], rcond=None)[0]
+    return g[:, -1] - np.diff(g, axis=1) @ gamma
+
+
+def _normalisation_scaling(eigenvalues, p, num_timesteps):
+    r"""
+    Compute the vertexwise scaling applied by space-time normalisation, excluding the
+    global normalisation factor.
+
+    :arg eigenvalues: the absolute eigenvalues of the metric at each vertex, with shape
+        ``(num_vertices, dim)``
+    :type eigenvalues: :class:`numpy.ndarray`
+    :arg p: the normalisation order
+    :type p: :class:`float`
+    :arg num_timesteps: the number of timesteps on the subinterval
+    :type num_timesteps: :class:`int`
+    :returns: the scaling at each vertex
+    :rtype: :class:`numpy.ndarray`
+    """
+    if np.isinf(p):
+        return np.ones(len(eigenvalues))
+    d = eigenvalues.shape[1]
+    scaling = pow(np.prod(eigenvalues, axis=1), -1 / (2 * p + d))
+    return scaling * pow(num_timesteps, -2 / (2 * p + d))
+
+
+def _vertex_weights(metric, boundary=False):
+    """
+    Compute the weights for integrating over the domain, or its boundary, using the
+    vertex values of a P1 metric.
+
+    :arg metric: the metric
+    :type metric: :class:`~.RiemannianMetric`
+    :kwarg boundary: if ``True``, the weights are for integrating over the boundary
+    :type boundary: :class:`bool`
+    :returns: the weight associated with each vertex
+    :rtype: :class:`numpy.ndarray`
+    """
+    mesh = metric.function_space().mesh()
+    v = firedrake.TestFunction(firedrake.FunctionSpace(mesh, "CG", 1))
+    dX = (ufl.ds if boundary else ufl.dx)(mesh)
+    return firedrake.assemble(v * dX).dat.data_ro
+
+
+@PETSc.Log.EventDecorator()
+def _solve_global_factor(
+    metrics,
+    time_partition,
+    metric_parameters,
+    global_factor,
+    target,
+    boundary=False,
+    restrict_sizes=True,
+    restrict_anisotropy=True,
+    complexity_rtol=1.0e-03,
+    complexity_maxiter=10,
+    eigenvalues=None,
+):
+    r"""
+    Iterate on the global normalisation factor so that the space-time complexity of
+    the normalised metrics, after applying size and anisotropy restrictions, matches
+    the target.
+
+    The metrics are eigendecomposed once and the achieved complexity is then evaluated
+    for each trial factor in a single vectorised pass over the vertex data, using
+    vertex-lumped quadrature. The secant method is applied to the logarithm of the
+    achieved complexity as a function of the logarithm of the factor.
+
+    :arg metrics: the metrics associated with each subinterval, which should be SPD
+    :type metrics: :class:`list` of :class:`~.RiemannianMetric`\s
+    :arg time_partition: temporal discretisation for the problem at hand, or the
+        sub-time partitions corresponding to the metrics
+    :type time_partition: :class:`TimePartition` or :class:`list` thereof
+    :arg metric_parameters: the metric parameters for each subinterval
+    :type metric_parameters: :class:`list` of :class:`dict`\s
+    :arg global_factor: the initial guess for the global normalisation factor
+    :type global_factor: :class:`float`
+    :arg target: the target space-time complexity
+    :type target: :class:`float`
+    :kwarg eigenvalues: pre-computed absolute eigenvalues of each metric at each vertex
+    :type eigenvalues: :class:`list` of :class:`numpy.ndarray`\s
+    :returns: the global normalisation factor
+    :rtype: :class:`float`
+    """
+    d = metrics[0].function_space().mesh().topological_dimension()
+    if eigenvalues is None:
+        eigenvalues = [
+            np.abs(np.linalg.eigvalsh(metric.dat.data_ro.reshape(-1, d, d)))
+            for metric in metrics
+        ]
+    data = []
+    for metric, mp, S, values in zip(
+        metrics, metric_parameters, time_partition, eigenvalues
+    ):
+        scaling = _normalisation_scaling(
+            values, mp["dm_plex_metric_p"], S.num_timesteps
+        )
+        restrictions = _restrictions(mp, restrict_sizes, restrict_anisotropy)
+        weights = _vertex_weights(metric, boundary=boundary)
+        comm = metric.function_space().mesh().comm
+        data.append((values, scaling, restrictions, weights, comm, S))
+
+    def log_complexity(log_factor):
+        complexity = 0
+        factor = np.exp(log_factor)
+        for values, scaling, restrictions, weights, comm, S in data:
+            restricted = _restrict_eigenvalues(
+                factor * scaling[:, None] * values, **restrictions
+            )
+            local = np.dot(weights, np.sqrt(np.prod(restricted, axis=1)))
+            complexity += S.num_timesteps * comm.allreduce(local)
+        return np.log(complexity)
+
+    log_target = np.log(target)
+    x = [np.log(float(global_factor))]
+    r = [log_complexity(x[0]) - log_target]
+    for _ in range(complexity_maxiter):
+        if abs(np.expm1(r[-1])) <= complexity_rtol:
+            break
+
+        # Without restrictions, the complexity scales with the factor to the power d/2
+        slope = 0.5 * d if len(x) == 1 else (r[-1] - r[-2]) / (x[-1] - x[-2])
+        if not slope > 0.0:
+            warning(
+                "space_time_normalise: target complexity cannot be achieved under the"
+                " metric restrictions."
+            )
+            break
+        x.append(x[-1] - r[-1] / slope)
+        r.append(log_complexity(x[-1]) - log_target)
+    else:
+        if abs(np.expm1(r[-1])) > complexity_rtol:
+            warning(
+                "space_time_normalise: achieved complexity did not converge to the"
+                f" target in {complexity_maxiter} iterations."
+            )
+    debug(
+        "space_time_normalise: achieved space-time complexity"
+        f"={np.exp(r[-1] + log_target):.4e}"
+    )
+    return np.exp(x[-1])
+
+
 @PETSc.Log.EventDecorator()
 def space_time_normalise(
     metrics,
@@ -69,12 +324,34 @@ def space_time_normalise(
     boundary=False,
     restrict_sizes=True,
     restrict_anisotropy=True,
+    complexity_rtol=None,
+    complexity_maxiter=10,
+    fused=False,
+    subinterval_targets=None,
 ):
     r"""
     Apply :math:`L^p` normalisation in both space and time.
 
     Based on Equation (1) in :cite:`Barral:2016`.
 
+    The global normalisation factor is computed analytically, so the space-time
+    complexity of the normalised metrics only matches the target before sizes and
+    anisotropy are restricted. If ``complexity_rtol`` is set then the factor is
+    instead iterated upon until the restricted metrics achieve the target.
+
+    By default, each metric is traversed several times, by successive calls to the
+    methods of :class:`~.RiemannianMetric`. If ``fused`` is set then the SPD
+    enforcement, normalisation, temporal scaling and restriction of sizes and
+    anisotropy are instead applied in a single vectorised pass over the data of each
+    metric, based on one batched eigendecomposition. Any size and anisotropy
+    restrictions should then be provided in the metric parameters, rather than being
+    enforced separately using :func:`enforce_variable_constraints`.
+
+    By default, the space-time complexity is distributed across subintervals according
+    to the metrics themselves. If ``subinterval_targets`` is provided, e.g. using
+    :func:`allocate_complexity`, then a separate normalisation factor is instead
+    computed for each subinterval, so that it achieves its own target.
+
     :arg metrics: the metrics associated with each subinterval
     :type metrics: :class:`list` of :class:`~.RiemannianMetric`\s
     :arg time_partition: temporal discretisation for the problem at hand
@@ -93,6 +370,17 @@ def space_time_normalise(
     :type restrict_sizes: :class:`bool`
     :kwarg restrict_anisotropy: if ``True``, maximum anisotropy is enforced
     :type restrict_anisotropy: :class:`bool`
+    :kwarg complexity_rtol: if set, the relative tolerance for the achieved space-time
+        complexity of the restricted metrics
+    :type complexity_rtol: :class:`float`
+    :kwarg complexity_maxiter: the maximum number of iterations used to solve for the
+        global normalisation factor
+    :type complexity_maxiter: :class:`int`
+    :kwarg fused: if ``True``, each metric is processed in a single pass
+    :type fused: :class:`bool`
+    :kwarg subinterval_targets: target (spatial) complexities for each subinterval,
+        which take precedence over `dm_plex_metric_target_complexity`
+    :type subinterval_targets: :class:`list` of :class:`float`\s
     :returns: the space-time normalised metrics
     :rtype: :class:`list` of :class:`~.RiemannianMetric`\s
     """
@@ -109,6 +397,19 @@ def space_time_normalise(
             "Number of metrics does not match number of sets of metric parameters:"
             f" {len(metrics)} vs. {len(metric_parameters)}."
         )
+    if subinterval_targets is not None:
+        if global_factor is not None:
+            raise ValueError(
+                "The global_factor and subinterval_targets options are incompatible."
+            )
+        if len(subinterval_targets) != len(metrics):
+            raise ValueError(
+                "Number of metrics does not match number of subinterval targets:"
+                f" {len(metrics)} vs. {len(subinterval_targets)}."
+            )
+        for target in subinterval_targets:
+            if target <= 0.0:
+                raise ValueError(f"Subinterval target '{target}' is not positive.")
 
     # Preparation step
     metric_parameters = metric_parameters.copy()
@@ -132,36 +433,98 @@ def space_time_normalise(
             raise ValueError(
                 f"Normalisation order '{p}' should be one or greater or np.inf."
             )
-        target = mp.get("dm_plex_metric_target_complexity")
-        if target is None:
-            raise ValueError(
-                "Target complexity 'dm_plex_metric_target_complexity' must be set."
-            )
-        if target <= 0.0:
-            raise ValueError(f"Target complexity '{target}' is not positive.")
+        if subinterval_targets is None:
+            target = mp.get("dm_plex_metric_target_complexity")
+            if target is None:
+                raise ValueError(
+                    "Target complexity 'dm_plex_metric_target_complexity' must be set."
+                )
+            if target <= 0.0:
+                raise ValueError(f"Target complexity '{target}' is not positive.")
         metric.set_parameters(mp)
-        metric.enforce_spd(restrict_sizes=False, restrict_anisotropy=False)
+        if not fused:
+            metric.enforce_spd(restrict_sizes=False, restrict_anisotropy=False)
 
-    # Compute global normalisation factor
-    if global_factor is None:
-        integral = 0
+    # In fused mode, the eigendecomposition of each metric is computed once and the
+    # absolute values of its eigenvalues are taken in place of enforcing SPD
+    decompositions = eigenvalues = None
+    if fused:
+        decompositions = [
+            np.linalg.eigh(metric.dat.data_ro.reshape(-1, d, d)) for metric in metrics
+        ]
+        eigenvalues = [np.abs(values) for values, _ in decompositions]
+
+    # Compute global normalisation factor, or one factor per subinterval
+    if global_factor is not None:
+        factors = [global_factor] * len(metrics)
+    else:
+        integrals = []
         p = mp["dm_plex_metric_p"]
         exponent = 0.5 if np.isinf(p) else p / (2 * p + d)
         for metric, S in zip(metrics, time_partition):
             dX = (ufl.ds if boundary else ufl.dx)(metric.function_space().mesh())
             scaling = pow(S.num_timesteps, 2 * exponent)
-            integral += scaling * firedrake.assemble(
-                pow(ufl.det(metric), exponent) * dX
+            determinant = abs(ufl.det(metric)) if fused else ufl.det(metric)
+            integrals.append(
+                scaling * firedrake.assemble(pow(determinant, exponent) * dX)
+            )
+        if subinterval_targets is None:
+            target = mp["dm_plex_metric_target_complexity"]
+            groups = [range(len(metrics))]
+            targets = [target * time_partition.num_timesteps]
+        else:
+            groups = [[i] for i in range(len(metrics))]
+            targets = [
+                target * S.num_timesteps
+                for target, S in zip(subinterval_targets, time_partition)
+            ]
+        factors = [None] * len(metrics)
+        for group, target in zip(groups, targets):
+            debug(f"space_time_normalise: target space-time complexity={target:.4e}")
+            factor = pow(target / sum(integrals[i] for i in group), 2 / d)
+            if complexity_rtol is not None:
+                factor = _solve_global_factor(
+                    [metrics[i] for i in group],
+                    [time_partition[i] for i in group],
+                    [metric_parameters[i] for i in group],
+                    factor,
+                    target,
+                    boundary=boundary,
+                    restrict_sizes=restrict_sizes,
+                    restrict_anisotropy=restrict_anisotropy,
+                    complexity_rtol=complexity_rtol,
+                    complexity_maxiter=complexity_maxiter,
+                    eigenvalues=None
+                    if eigenvalues is None
+                    else [eigenvalues[i] for i in group],
+                )
+            for i in group:
+                factors[i] = firedrake.Constant(factor)
+    for i, factor in enumerate(factors):
+        debug(f"space_time_normalise: scale factor {i}={float(factor):.4e}")
+
+    if fused:
+        for metric, mp, S, (_, vectors), values, factor in zip(
+            metrics,
+            metric_parameters,
+            time_partition,
+            decompositions,
+            eigenvalues,
+            factors,
+        ):
+            scaling = _normalisation_scaling(values, p, S.num_timesteps)
+            values = _restrict_eigenvalues(
+                float(factor) * scaling[:, None] * values,
+                **_restrictions(mp, restrict_sizes, restrict_anisotropy),
             )
-        target = mp["dm_plex_metric_target_complexity"] * time_partition.num_timesteps
-        debug(f"space_time_normalise: target space-time complexity={target:.4e}")
-        global_factor = firedrake.Constant(pow(target / integral, 2 / d))
-    debug(f"space_time_normalise: global scale factor={float(global_factor):.4e}")
+            data = np.einsum("nij,nj,nkj->nik", vectors, values, vectors)
+            metric.dat.data_wo[:] = data.reshape(metric.dat.data_ro.shape)
+        return metrics
 
-    for metric, S in zip(metrics, time_partition):
+    for metric, S, factor in zip(metrics, time_partition, factors):
         # Normalise according to the global normalisation factor
         metric.normalise(
-            global_factor=global_factor,
+            global_factor=factor,
             restrict_sizes=False,
             restrict_anisotropy=False,
         )
@@ -177,6 +540,66 @@ def space_time_normalise(
     return metrics
 
 
+def allocate_complexity(
+    estimates, costs, time_partition, budget=None, convergence_rate=1.0
+):
+    r"""
+    Allocate complexity across subintervals so as to minimise the total estimated error
+    subject to a space-time budget.
+
+    The error on subinterval :math:`i` is modelled as
+    :math:`\eta_i(C_i/C_i^{(0)})^{-r}`, where :math:`\eta_i` is its current error
+    estimate, :math:`C_i^{(0)}` and :math:`C_i` are its current and new complexities and
+    :math:`r` is the convergence rate. Minimising the sum of these errors subject to
+    :math:`\sum_i n_iC_i=B`, where :math:`n_i` is the number of timesteps on subinterval
+    :math:`i` and :math:`B` is the budget, gives
+
+    .. math::
+        C_i\propto\left(\frac{\eta_i(C_i^{(0)})^r}{n_i}\right)^{1/(r+1)}.
+
+    The allocated complexities are in the same units as the costs. If these are element
+    counts then they should be converted to metric complexities before passing them to
+    :func:`space_time_normalise` as ``subinterval_targets``.
+
+    :arg estimates: the error estimate for each subinterval
+    :type estimates: :class:`list` of :class:`float`\s
+    :arg costs: the current cost of each subinterval, i.e., its complexity multiplied by
+        its number of timesteps
+    :type costs: :class:`list` of :class:`float`\s
+    :arg time_partition: temporal discretisation for the problem at hand
+    :type time_partition: :class:`TimePartition`
+    :kwarg budget: the total space-time cost to allocate, which defaults to the current
+        total cost
+    :type budget: :class:`float`
+    :kwarg convergence_rate: the rate at which the error decreases with complexity
+    :type convergence_rate: :class:`float`
+    :returns: the allocated (spatial) complexity for each subinterval
+    :rtype: :class:`list` of :class:`float`\s
+    """
+    estimates = np.array(estimates, dtype=float)
+    costs = np.array(costs, dtype=float)
+    num_timesteps = np.array(time_partition.num_timesteps_per_subinterval, dtype=float)
+    if not len(estimates) == len(costs) == len(num_timesteps):
+        raise ValueError(
+            "Number of estimates, costs and subintervals do not match:"
+            f" {len(estimates)} vs. {len(costs)} vs. {len(num_timesteps)}."
+        )
+    if not np.all(estimates > 0.0):
+        raise ValueError(f"Error estimates must be positive, not {estimates}.")
+    if not np.all(costs > 0.0):
+        raise ValueError(f"Costs must be positive, not {costs}.")
+    if convergence_rate <= 0.0:
+        raise ValueError(f"Convergence rate must be positive, not {convergence_rate}.")
+    budget = costs.sum() if budget is None else budget
+    if budget <= 0.0:
+        raise ValueError(f"Budget must be positive, not {budget}.")
+    r = convergence_rate
+    complexities = costs / num_timesteps
+    allocation = pow(estimates * pow(complexities, r) / num_timesteps, 1 / (r + 1))
+    allocation *= budget / np.dot(num_timesteps, allocation)
+    return allocation.tolist()
+
+
 def ramp_complexity(base, target, iteration, num_iterations=3):
     """
     Ramp up the target complexity over the first few iterations.
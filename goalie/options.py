@@ -1,3 +1,5 @@
+import numpy as np
+
 from .utility import AttrDict
 
 __all__ = [
@@ -24,6 +26,17 @@ class AdaptParameters(AttrDict):
         self["maxiter"] = 35  # Maximum iteration count
         self["element_rtol"] = 0.001  # Relative tolerance for element count
         self["drop_out_converged"] = False  # Drop out converged subintervals?
+        self["max_wallclock"] = np.inf  # Wall-clock time budget in seconds
+        self["max_core_hours"] = np.inf  # Core-hour budget
+        self["max_memory"] = np.inf  # Peak memory budget per process in megabytes
+        self["metric_relaxation"] = "none"  # Relaxation applied to metrics
+        self["relaxation_weight"] = 0.5  # Weight of the new metric when relaxing
+        self["anderson_depth"] = 3  # History length for Anderson acceleration
+        self["inexact_solves"] = False  # Relax solver tolerances in early iterations?
+        self["inexact_rtol"] = 0.01  # Loosest relaxed solver tolerance
+        self["inexact_factor"] = 0.1  # Ratio of solver tolerance to convergence change
+        self["timestep_adaptation"] = False  # Adapt the timestep on each subinterval?
+        self["timestep_rtol"] = 0.01  # Target relative solution change per timestep
 
         if not isinstance(parameters, dict):
             raise TypeError(
@@ -40,6 +53,18 @@ class AdaptParameters(AttrDict):
         self._check_type("maxiter", int)
         self._check_type("element_rtol", (float, int))
         self._check_type("drop_out_converged", bool)
+        self._check_type("max_wallclock", (float, int))
+        self._check_type("max_core_hours", (float, int))
+        self._check_type("max_memory", (float, int))
+        self._check_type("metric_relaxation", str)
+        self._check_value("metric_relaxation", ["none", "log_euclidean", "anderson"])
+        self._check_type("relaxation_weight", (float, int))
+        self._check_type("anderson_depth", int)
+        self._check_type("inexact_solves", bool)
+        self._check_type("inexact_rtol", (float, int))
+        self._check_type("inexact_factor", (float, int))
+        self._check_type("timestep_adaptation", bool)
+        self._check_type("timestep_rtol", (float, int))
 
     def _check_type(self, key, expected):
         """
@@ -100,11 +125,13 @@ class GoalOrientedAdaptParameters(AdaptParameters):
 
         self["qoi_rtol"] = 0.001  # Relative tolerance for QoI
         self["estimator_rtol"] = 0.001  # Relative tolerance for estimator
+        self["estimator_fraction"] = 0.0  # Negligible fraction of estimator
         self["convergence_criteria"] = "any"  # Mode for convergence checking
 
         super().__init__(parameters=parameters)
 
         self._check_type("qoi_rtol", (float, int))
         self._check_type("estimator_rtol", (float, int))
+        self._check_type("estimator_fraction", (float, int))
         self._check_type("convergence_criteria", str)
         self._check_value("convergence_criteria", ["all", "any"])
@@ -40,7 +40,9 @@ class PointSeq(MeshSeq):
 
         :arg mesh: the vertex-only mesh
         """
+        old_meshes = getattr(self, "meshes", [])
         self.meshes = [mesh for _ in self.subintervals]
+        self._update_mesh_versions(old_meshes)
         self.dim = mesh.topological_dimension()
         assert self.dim == 0
         self._reset_counts()
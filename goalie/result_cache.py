@@ -0,0 +1,339 @@
+"""
+On-disk caching of forward and adjoint solution data across runs.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import firedrake
+import numpy as np
+import ufl
+from firedrake.petsc import PETSc
+from mpi4py import MPI
+
+__all__ = ["ResultCache"]
+
+
+def _digest(array):
+    """
+    :arg array: an array
+    :type array: :class:`numpy.ndarray`
+    :returns: a SHA-256 hash of the array's contents
+    :rtype: :class:`str`
+    """
+    return hashlib.sha256(np.ascontiguousarray(array).tobytes()).hexdigest()
+
+
+def _canonical(obj):
+    r"""
+    Convert an object into a form which may be serialised as JSON and which is the
+    same for equal objects in independent runs.
+
+    Firedrake :class:`~firedrake.function.Function`\s and
+    :class:`~firedrake.constant.Constant`\s are represented by their values and UFL
+    forms by their signatures and the values of their coefficients.
+
+    :arg obj: the object to convert
+    :returns: the converted object
+    :raises TypeError: if the object has no such representation
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, dict):
+        return {str(key): _canonical(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(value) for value in obj]
+    if isinstance(obj, firedrake.Constant):
+        return {"Constant": _canonical(obj.dat.data_ro)}
+    if isinstance(obj, (firedrake.Function, firedrake.Cofunction)):
+        return {
+            type(obj).__name__: str(obj.function_space().ufl_element()),
+            "data": [_digest(dat.data_ro) for dat in obj.dat],
+        }
+    if isinstance(obj, ufl.Form):
+        return {
+            "Form": obj.signature(),
+            "coefficients": _canonical(obj.coefficients()),
+            "constants": _canonical(obj.constants()),
+        }
+    raise TypeError(
+        f"Cannot compute a result cache key for an object of type"
+        f" '{type(obj).__name__}'."
+    )
+
+
+class ResultCache:
+    """
+    A content-addressed on-disk cache for the solution data and QoI values computed by
+    :meth:`~.MeshSeq.solve_forward` and :meth:`~.AdjointMeshSeq.solve_adjoint`.
+
+    Entries are keyed by a SHA-256 hash of the meshes, the finite elements of the
+    function spaces, the :class:`~.TimePartition`, the solver keyword arguments and a
+    user-supplied problem version. The problem version should be changed whenever the
+    problem is modified in a way that none of these capture, such as a change to the
+    form or the initial condition.
+
+    Each entry is a directory holding a compressed NumPy archive of the locally owned
+    data on each MPI rank and a metadata file. Entries are written to a temporary
+    directory and renamed into place, and the cache index is guarded by a file lock,
+    so that multiple jobs may safely share a cache directory. Once either of the size
+    limits is exceeded, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self, directory, max_size=np.inf, max_entries=np.inf, comm=firedrake.COMM_WORLD
+    ):
+        """
+        :arg directory: the directory to store cache entries in
+        :type directory: :class:`str`
+        :kwarg max_size: the maximum total size of the cache, in megabytes
+        :type max_size: :class:`float`
+        :kwarg max_entries: the maximum number of cache entries
+        :type max_entries: :class:`int`
+        :kwarg comm: MPI communicator
+        :type comm: :class:`mpi4py.MPI.Intracomm`
+        """
+        if max_size <= 0:
+            raise ValueError(f"Maximum cache size should be positive, not {max_size}.")
+        if max_entries <= 0:
+            raise ValueError(
+                f"Maximum number of cache entries should be positive, not {max_entries}."
+            )
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.comm = comm
+        if comm.rank == 0:
+            os.makedirs(self.directory, exist_ok=True)
+        comm.barrier()
+
+    @contextmanager
+    def _lock(self, exclusive=True):
+        """
+        Hold a lock on the cache directory, which is shared with other jobs. Only the
+        root rank takes the lock, since it is the only rank which modifies the index.
+
+        :kwarg exclusive: should the lock be exclusive, rather than shared?
+        :type exclusive: :class:`bool`
+        """
+        if self.comm.rank != 0:
+            yield
+            return
+        with open(os.path.join(self.directory, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    @PETSc.Log.EventDecorator()
+    def key(self, mesh_seq, kind, solver_kwargs=None, version=None):
+        r"""
+        Compute the key associated with a solve over a mesh sequence.
+
+        The key accounts for the mesh sequence's meshes, function spaces and time
+        partition, as well as the relaxed solver tolerance used by inexact solves, if
+        any. Every keyword argument of the solve which affects its result should be
+        included in ``solver_kwargs``. These are hashed by value, with
+        :class:`~firedrake.function.Function`\s and
+        :class:`~firedrake.constant.Constant`\s being represented by their data and
+        UFL forms by their signatures, so that keys match across runs. Changes to the
+        problem definition itself, such as the form or the initial condition, are not
+        detected and should be signalled by changing the problem version.
+
+        This is a collective operation.
+
+        :arg mesh_seq: the mesh sequence
+        :type mesh_seq: :class:`~.MeshSeq`
+        :arg kind: the kind of solve, e.g. ``'forward'`` or ``'adjoint'``
+        :type kind: :class:`str`
+        :kwarg solver_kwargs: the keyword arguments passed to the solver
+        :type solver_kwargs: :class:`dict` with :class:`str` keys and values which may
+            take various types
+        :kwarg version: a version identifier for the problem definition
+        :returns: the key
+        :rtype: :class:`str`
+        :raises TypeError: if any of the keyword arguments cannot be hashed by value
+        """
+        sha = hashlib.sha256()
+        header = {
+            "class": type(mesh_seq).__qualname__,
+            "kind": kind,
+            "version": version,
+            "time_partition": mesh_seq._time_partition_signature(),
+            "solver_kwargs": solver_kwargs or {},
+            "solver_rtol": mesh_seq._solver_rtol,
+            "ranks": self.comm.size,
+        }
+        sha.update(json.dumps(_canonical(header), sort_keys=True).encode())
+        for mesh in mesh_seq.meshes:
+            coordinates = mesh.coordinates
+            sha.update(np.ascontiguousarray(coordinates.dat.data_ro).tobytes())
+            cells = coordinates.function_space().cell_node_list
+            sha.update(np.ascontiguousarray(cells).tobytes())
+        for field, spaces in mesh_seq.function_spaces.items():
+            sha.update(field.encode())
+            for fs in spaces:
+                sha.update(str(fs.ufl_element()).encode())
+
+        # Combine the hashes of the data owned by each rank
+        digests = self.comm.allgather(sha.hexdigest())
+        return hashlib.sha256("".join(digests).encode()).hexdigest()
+
+    @staticmethod
+    def _functions(solutions):
+        r"""
+        :arg solutions: the solution data
+        :type solutions: :class:`~.FunctionData`
+        :returns: each component of each :class:`firedrake.function.Function` in the
+            solution data, keyed by field, label, subinterval, export and component
+        :rtype: :class:`dict` with :class:`str` keys and
+            :class:`firedrake.function.Function` values
+        """
+        functions = {}
+        for field, by_label in solutions.items():
+            for label, by_subinterval in by_label.items():
+                for i, by_export in enumerate(by_subinterval):
+                    for j, f in enumerate(by_export):
+                        for k, sub in enumerate(f.subfunctions):
+                            functions[f"{field}:{label}:{i}:{j}:{k}"] = sub
+        return functions
+
+    @PETSc.Log.EventDecorator()
+    def load(self, key, solutions):
+        """
+        Load a cache entry into solution data.
+
+        This is a collective operation.
+
+        :arg key: the key of the entry
+        :type key: :class:`str`
+        :arg solutions: the solution data to load into
+        :type solutions: :class:`~.FunctionData`
+        :returns: the metadata stored with the entry, or ``None`` if there is no valid
+            entry for the key
+        :rtype: :class:`dict`
+        """
+        path = self._path(key)
+        comm = self.comm
+        with self._lock(exclusive=False):
+            exists = comm.bcast(os.path.isdir(path) if comm.rank == 0 else None)
+            if not exists:
+                return None
+            try:
+                with np.load(os.path.join(path, f"rank{comm.rank}.npz")) as data:
+                    stored = dict(data)
+                with open(os.path.join(path, "metadata.json")) as f:
+                    metadata = json.load(f)
+                functions = self._functions(solutions)
+                valid = stored.keys() == functions.keys() and all(
+                    stored[name].shape == f.dat.data_ro.shape
+                    for name, f in functions.items()
+                )
+            except (OSError, ValueError):
+                valid = False
+            if not comm.allreduce(valid, op=MPI.LAND):
+                return None
+            for name, f in functions.items():
+                f.dat.data_wo[:] = stored[name]
+
+            # Mark the entry as recently used
+            if comm.rank == 0:
+                os.utime(os.path.join(path, "metadata.json"))
+        return metadata
+
+    @PETSc.Log.EventDecorator()
+    def store(self, key, solutions, **metadata):
+        """
+        Store solution data as a cache entry, evicting the least recently used entries
+        if a size limit is exceeded.
+
+        This is a collective operation.
+
+        :arg key: the key of the entry
+        :type key: :class:`str`
+        :arg solutions: the solution data to store
+        :type solutions: :class:`~.FunctionData`
+        :kwarg metadata: other JSON serialisable values to store with the entry
+        """
+        comm = self.comm
+        tmp = None
+        if comm.rank == 0:
+            tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        tmp = comm.bcast(tmp)
+        arrays = {name: f.dat.data_ro for name, f in self._functions(solutions).items()}
+        np.savez_compressed(os.path.join(tmp, f"rank{comm.rank}.npz"), **arrays)
+        comm.barrier()
+        if comm.rank == 0:
+            with open(os.path.join(tmp, "metadata.json"), "w") as f:
+                json.dump(metadata, f)
+            with self._lock():
+                path = self._path(key)
+                if os.path.isdir(path):
+                    # Another job has stored the same result in the meantime
+                    shutil.rmtree(tmp)
+                    os.utime(os.path.join(path, "metadata.json"))
+                else:
+                    os.rename(tmp, path)
+                self._evict()
+        comm.barrier()
+
+    def _entries(self):
+        r"""
+        :returns: the key, last access time and size in bytes of each entry
+        :rtype: :class:`list` of :class:`tuple`\s
+        """
+        entries = []
+        for key in os.listdir(self.directory):
+            path = self._path(key)
+            if key.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                accessed = os.path.getmtime(os.path.join(path, "metadata.json"))
+                size = sum(
+                    os.path.getsize(os.path.join(path, fname))
+                    for fname in os.listdir(path)
+                )
+            except OSError:
+                continue
+            entries.append((key, accessed, size))
+        return entries
+
+    def _evict(self):
+        """
+        Remove the least recently used entries until the size limits are satisfied.
+        Should only be called on the root rank, while holding the exclusive lock.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        while entries and (
+            total > self.max_size * 1024**2 or len(entries) > self.max_entries
+        ):
+            key, _, size = entries.pop(0)
+            shutil.rmtree(self._path(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        if self.comm.rank == 0:
+            with self._lock():
+                for key, _, _ in self._entries():
+                    shutil.rmtree(self._path(key), ignore_errors=True)
+        self.comm.barrier()
+
+    def __len__(self):
+        return self.comm.bcast(len(self._entries()) if self.comm.rank == 0 else None)
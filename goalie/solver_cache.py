@@ -0,0 +1,434 @@
+"""
+Caching of solvers and factorisations across timesteps, subintervals and fixed point
+iterations.
+"""
+
+import weakref
+
+import firedrake
+import ufl
+from firedrake.adjoint import pyadjoint
+from firedrake.petsc import PETSc
+
+__all__ = ["CachedSolver", "SolverCache", "ReusedFactorisationPC"]
+
+# Solver caches which hold factorisations for ReusedFactorisationPC, keyed by id
+_caches = weakref.WeakValueDictionary()
+
+
+def _freeze(obj):
+    """
+    Convert an object into a hashable representation, for use in a cache key.
+
+    Dictionaries and sequences are converted recursively, while unhashable objects
+    are identified by their ``id``.
+    """
+    if isinstance(obj, dict):
+        return tuple(sorted((key, _freeze(value)) for key, value in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(value) for value in obj)
+    try:
+        hash(obj)
+    except TypeError:
+        return id(obj)
+    return obj
+
+
+def _form_coefficients(F, u):
+    """
+    Extract the coefficients and constants of a form or equation, other than the
+    solution field.
+
+    :arg F: the form or equation
+    :type F: :class:`ufl.form.Form` or :class:`ufl.equation.Equation`
+    :arg u: the solution field
+    :type u: :class:`firedrake.function.Function`
+    :returns: the coefficients and constants, in a consistent order
+    :rtype: :class:`list`
+    """
+    forms = [F.lhs, F.rhs] if isinstance(F, ufl.equation.Equation) else [F]
+    coefficients = []
+    for form in forms:
+        if not isinstance(form, ufl.form.BaseForm):
+            continue
+        for c in list(form.coefficients()) + list(form.constants()):
+            if c is not u and c not in coefficients:
+                coefficients.append(c)
+    return coefficients
+
+
+def _signature(F):
+    r"""
+    :arg F: a form or equation
+    :type F: :class:`ufl.form.Form` or :class:`ufl.equation.Equation`
+    :returns: a signature which is independent of the coefficient objects in the form
+    :rtype: :class:`tuple` of :class:`str`\s
+    """
+    if isinstance(F, ufl.equation.Equation):
+        return tuple(
+            form.signature() if isinstance(form, ufl.form.BaseForm) else repr(form)
+            for form in (F.lhs, F.rhs)
+        )
+    return (F.signature(),)
+
+
+class CachedSolver:
+    """
+    A wrapper around a :class:`firedrake.variational_solver.NonlinearVariationalSolver`
+    or :class:`firedrake.variational_solver.LinearVariationalSolver` which is stored in
+    a :class:`~.SolverCache`.
+
+    When the wrapper is retrieved from the cache for a form whose coefficients are
+    different objects to those which the underlying solver was built with, their
+    values are copied into the solver's coefficients before solving and the solution is
+    copied back out afterwards. All other attributes are those of the underlying solver.
+    """
+
+    def __init__(self, solver, u, coefficients, bcs):
+        r"""
+        :arg solver: the underlying solver
+        :type solver: :class:`firedrake.variational_solver.NonlinearVariationalSolver`
+            or :class:`firedrake.variational_solver.LinearVariationalSolver`
+        :arg u: the solution field that the solver was built with
+        :type u: :class:`firedrake.function.Function`
+        :arg coefficients: the coefficients that the solver was built with
+        :type coefficients: :class:`list`
+        :arg bcs: the boundary conditions that the solver was built with
+        :type bcs: :class:`list` of :class:`firedrake.bcs.DirichletBC`\s
+        """
+        self.solver = solver
+        self.num_solves = 0
+        self.linear_iterations = 0
+        self._rtols = None
+        self._u = u
+        self._coefficients = coefficients
+        self._bcs = bcs
+        self._targets = None
+
+    def __getattr__(self, name):
+        return getattr(self.solver, name)
+
+    def _set_targets(self, u, coefficients, bcs):
+        """
+        Set the solution field, coefficients and boundary conditions that the solver
+        should act upon.
+
+        :returns: ``True`` if the targets are compatible with the cached solver
+        :rtype: :class:`bool`
+        """
+        if u is self._u:
+            self._targets = None
+            return all(c is c_ for c, c_ in zip(coefficients, self._coefficients))
+        if len(coefficients) != len(self._coefficients):
+            return False
+        for c, c_ in zip(coefficients, self._coefficients):
+            if type(c) is not type(c_):
+                return False
+            if isinstance(c, firedrake.Function):
+                if c.function_space() != c_.function_space():
+                    return False
+            elif c.ufl_shape != c_.ufl_shape:
+                return False
+        self._targets = (u, coefficients, bcs)
+        return True
+
+    def relax_tolerances(self, rtol=None):
+        """
+        Relax the relative tolerances of the underlying SNES and KSP so that they are no
+        tighter than a given value, or restore the tolerances the solver was built with.
+
+        :kwarg rtol: the relaxed relative tolerance, or ``None`` to restore the original
+            tolerances
+        :type rtol: :class:`float`
+        """
+        if rtol is None and self._rtols is None:
+            return
+        snes = self.solver.snes
+        ksp = snes.getKSP()
+        if self._rtols is None:
+            self._rtols = (snes.getTolerances()[0], ksp.getTolerances()[0])
+        snes_rtol, ksp_rtol = self._rtols
+        if rtol is not None:
+            snes_rtol, ksp_rtol = max(snes_rtol, rtol), max(ksp_rtol, rtol)
+        snes.setTolerances(rtol=snes_rtol)
+        ksp.setTolerances(rtol=ksp_rtol)
+
+    @PETSc.Log.EventDecorator("goalie.CachedSolver.solve")
+    def solve(self, *args, **kwargs):
+        """
+        Solve the variational problem, copying data in and out of the underlying solver
+        where required.
+
+        All arguments are passed to the underlying solver.
+        """
+        self.num_solves += 1
+        if self._targets is None:
+            out = self.solver.solve(*args, **kwargs)
+        else:
+            u, coefficients, bcs = self._targets
+            for c, c_ in zip(coefficients, self._coefficients):
+                c_.assign(c)
+            for bc, bc_ in zip(bcs, self._bcs):
+                bc_.function_arg = bc.function_arg
+            self._u.assign(u)
+            out = self.solver.solve(*args, **kwargs)
+            u.assign(self._u)
+        self.linear_iterations += self.solver.snes.getLinearSolveIterations()
+        return out
+
+
+class SolverCache:
+    """
+    A cache of variational solvers, keyed by the function space of the solution field,
+    the signature of the form, the boundary conditions and the solver options.
+
+    Reusing a solver means reusing its assembled sparsity pattern, its preconditioner
+    setup and its SNES and KSP objects.
+
+    Each cached solver is claimed by the first solution field it is retrieved for and
+    is only reused for other solution fields once the claims have been released using
+    :meth:`~.SolverCache.release`, e.g., at the start of each subinterval. Problems with
+    the same key but different solution fields between releases therefore get solvers
+    of their own, rather than sharing one and overwriting each other's data.
+    """
+
+    def __init__(self):
+        self._solvers = {}
+        self._claims = {}
+        self._factorisations = {}
+        self.hits = 0
+        self.misses = 0
+        self._removed_counts = (0, 0)
+        _caches[id(self)] = self
+
+    def __len__(self):
+        return len(self._solvers)
+
+    @property
+    def num_solves(self):
+        """
+        :returns: the total number of solves using the cached solvers, including those
+            which have since been removed
+        :rtype: :class:`int`
+        """
+        solves = sum(solver.num_solves for solver in self._solvers.values())
+        return self._removed_counts[0] + solves
+
+    @property
+    def linear_iterations(self):
+        """
+        :returns: the total number of linear solver iterations performed by the cached
+            solvers, including those which have since been removed
+        :rtype: :class:`int`
+        """
+        its = sum(solver.linear_iterations for solver in self._solvers.values())
+        return self._removed_counts[1] + its
+
+    def _remove(self, key):
+        """
+        Remove a cached solver, retaining its solve and iteration counts.
+        """
+        solver = self._solvers.pop(key)
+        self._claims.pop(key, None)
+        num_solves, its = self._removed_counts
+        self._removed_counts = (
+            num_solves + solver.num_solves,
+            its + solver.linear_iterations,
+        )
+
+    def references(self, function):
+        """
+        :arg function: a function
+        :type function: :class:`firedrake.function.Function`
+        :returns: ``True`` if any cached solver was built with the function, either as
+            its solution field or as one of its coefficients
+        :rtype: :class:`bool`
+        """
+        return any(
+            function is solver._u or any(function is c for c in solver._coefficients)
+            for solver in self._solvers.values()
+        )
+
+    def release(self):
+        """
+        Release the claims on all cached solvers, so that they may be reused for other
+        solution fields.
+        """
+        self._claims.clear()
+
+    def _key(self, F, u, bcs, problem_kwargs, solver_kwargs):
+        bcs_key = tuple((bc.function_space(), _freeze(bc.sub_domain)) for bc in bcs)
+        return (
+            u.function_space(),
+            _signature(F),
+            bcs_key,
+            _freeze(problem_kwargs),
+            _freeze(solver_kwargs),
+        )
+
+    @PETSc.Log.EventDecorator()
+    def get(self, F, u, bcs=None, problem_kwargs=None, **solver_kwargs):
+        r"""
+        Get a solver for a variational problem, reusing a cached one if possible.
+
+        If the form is a :class:`ufl.equation.Equation` then a
+        :class:`firedrake.variational_solver.LinearVariationalSolver` is used.
+        Otherwise, a :class:`firedrake.variational_solver.NonlinearVariationalSolver`
+        is used.
+
+        Cached solvers built with different coefficient objects are not reused while
+        the tape is being annotated, so that the annotated solve acts directly upon the
+        solution field. Nor are cached solvers reused for a different solution field
+        until the claims on them have been released - see :class:`~.SolverCache`.
+
+        :arg F: the form or equation to solve
+        :type F: :class:`ufl.form.Form` or :class:`ufl.equation.Equation`
+        :arg u: the solution field
+        :type u: :class:`firedrake.function.Function`
+        :kwarg bcs: boundary conditions to apply
+        :type bcs: :class:`firedrake.bcs.DirichletBC` or :class:`list` thereof
+        :kwarg problem_kwargs: keyword arguments for the variational problem
+        :type problem_kwargs: :class:`dict` with :class:`str` keys and values which may
+            take various types
+        :returns: the solver
+        :rtype: :class:`~.CachedSolver`
+
+        All other keyword arguments are passed to the solver.
+        """
+        if bcs is None:
+            bcs = []
+        elif not isinstance(bcs, (list, tuple)):
+            bcs = [bcs]
+        problem_kwargs = problem_kwargs or {}
+        key = self._key(F, u, bcs, problem_kwargs, solver_kwargs)
+
+        # Skip over any solvers claimed by other solution fields
+        slot = 0
+        while self._claims.get((*key, slot), u) is not u:
+            slot += 1
+        key = (*key, slot)
+        self._claims[key] = u
+        coefficients = _form_coefficients(F, u)
+        cached = self._solvers.get(key)
+        if cached is not None and cached._set_targets(u, coefficients, bcs):
+            if cached._targets is None or not pyadjoint.annotate_tape():
+                self.hits += 1
+                return cached
+        self.misses += 1
+        if isinstance(F, ufl.equation.Equation):
+            problem = firedrake.LinearVariationalProblem(
+                F.lhs, F.rhs, u, bcs=bcs, **problem_kwargs
+            )
+            solver = firedrake.LinearVariationalSolver(problem, **solver_kwargs)
+        else:
+            problem = firedrake.NonlinearVariationalProblem(
+                F, u, bcs=bcs, **problem_kwargs
+            )
+            solver = firedrake.NonlinearVariationalSolver(problem, **solver_kwargs)
+        if key in self._solvers:
+            self._remove(key)
+        cached = CachedSolver(solver, u, coefficients, bcs)
+        self._solvers[key] = cached
+        return cached
+
+    def invalidate(self, mesh=None):
+        """
+        Remove cached solvers and factorisations.
+
+        :kwarg mesh: if provided, only solvers whose solution field is defined on this
+            mesh and factorisations associated with it are removed
+        :type mesh: :class:`firedrake.mesh.MeshGeometry`
+        """
+        for key in [
+            key for key in self._solvers if mesh is None or key[0].mesh() == mesh
+        ]:
+            self._remove(key)
+        for key in [
+            key
+            for key, (_mesh, _) in self._factorisations.items()
+            if mesh is None or _mesh == mesh
+        ]:
+            self.clear_factorisation(key)
+
+    def factorisation_parameters(self, key, mesh):
+        """
+        Get solver parameters which precondition a Krylov method using an LU
+        factorisation that is reused across all solves sharing a key - see
+        :class:`~.ReusedFactorisationPC`.
+
+        The factorisation is held by the cache, so that it is removed along with the
+        solvers for the mesh.
+
+        :arg key: the key identifying the factorisation to reuse
+        :type key: :class:`str`
+        :arg mesh: the mesh associated with the factorisation
+        :type mesh: :class:`firedrake.mesh.MeshGeometry`
+        :returns: solver parameters for applying the preconditioner
+        :rtype: :class:`dict`
+        """
+        if key not in self._factorisations:
+            self._factorisations[key] = (mesh, None)
+        return {
+            "mat_type": "aij",
+            "ksp_type": "gmres",
+            "pc_type": "python",
+            "pc_python_type": f"{__name__}.{ReusedFactorisationPC.__name__}",
+            "goalie_reuse_cache": str(id(self)),
+            "goalie_reuse_key": key,
+        }
+
+    def clear_factorisation(self, key):
+        """
+        Remove a cached factorisation.
+
+        :arg key: the key identifying the factorisation
+        :type key: :class:`str`
+        """
+        self._factorisations.pop(key, None)
+
+
+class ReusedFactorisationPC(firedrake.PCBase):
+    """
+    A Python preconditioner which reuses an LU factorisation across all solves which
+    share a key.
+
+    The factorisation is computed from the first operator encountered for a given key
+    and is held by a :class:`~.SolverCache`. Solver parameters for the preconditioner
+    should be obtained using :meth:`~.SolverCache.factorisation_parameters`. The
+    factorisation is never updated, so it is exact for linear systems whose operator is
+    constant across solves and still a good preconditioner for operators which vary
+    slowly. It is therefore always wrapped in a Krylov method.
+    """
+
+    _prefix = "goalie_reuse_"
+
+    def initialize(self, pc):
+        prefix = pc.getOptionsPrefix() or ""
+        options = PETSc.Options(prefix)
+        cache = _caches[int(options.getString("goalie_reuse_cache"))]
+        key = options.getString("goalie_reuse_key")
+        mesh, factorisation = cache._factorisations[key]
+        if factorisation is None:
+            _, P = pc.getOperators()
+            factorisation = PETSc.PC().create(comm=pc.comm)
+            factorisation.setOptionsPrefix(prefix + self._prefix)
+            factorisation.setOperators(P, P)
+            factorisation.setType("lu")
+            factorisation.setFromOptions()
+            factorisation.setUp()
+            cache._factorisations[key] = (mesh, factorisation)
+        self.factorisation = factorisation
+
+    def update(self, pc):
+        pass
+
+    def apply(self, pc, x, y):
+        self.factorisation.apply(x, y)
+
+    def applyTranspose(self, pc, x, y):
+        self.factorisation.applyTranspose(x, y)
+
+    def view(self, pc, viewer=None):
+        super().view(pc, viewer)
+        if viewer is not None:
+            viewer.printfASCII("Reused LU factorisation\n")
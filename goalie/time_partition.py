@@ -190,6 +190,82 @@ class TimePartition:
             field_types=self.field_types,
         )
 
+    def coarsen(self, factor):
+        """
+        Coarsen the timesteps on each subinterval by a given factor, retaining the same
+        subintervals and export times.
+
+        :arg factor: the factor to increase the timesteps by
+        :type factor: :class:`int`
+        :returns: the coarsened time partition
+        :rtype: :class:`~.TimePartition`
+        """
+        if not isinstance(factor, int) or factor < 1:
+            raise ValueError(
+                f"Coarsening factor should be a positive integer, not {factor}."
+            )
+        for i, tspe in enumerate(self.num_timesteps_per_export):
+            if tspe % factor != 0:
+                raise ValueError(
+                    f"Coarsening factor {factor} does not divide the number of"
+                    f" timesteps per export on subinterval {i}: {tspe}."
+                )
+        return TimePartition(
+            end_time=self.end_time,
+            num_subintervals=self.num_subintervals,
+            timesteps=[dt * factor for dt in self.timesteps],
+            field_names=self.field_names,
+            num_timesteps_per_export=[
+                tspe // factor for tspe in self.num_timesteps_per_export
+            ],
+            start_time=self.start_time,
+            subintervals=self.subintervals,
+            field_types=self.field_types,
+        )
+
+    def resample(self, num_timesteps_per_export):
+        r"""
+        Change the number of timesteps per export on each subinterval, retaining the
+        same subintervals and export times. The timesteps are scaled accordingly.
+
+        :arg num_timesteps_per_export: a list of numbers of timesteps per export for
+            each subinterval, or a single number to use for all subintervals
+        :type num_timesteps_per_export: :class:`list` of :class`int`\s or :class:`int`
+        :returns: the resampled time partition
+        :rtype: :class:`~.TimePartition`
+        """
+        if not isinstance(num_timesteps_per_export, Iterable):
+            num_timesteps_per_export = [num_timesteps_per_export] * len(self)
+        num_timesteps_per_export = list(num_timesteps_per_export)
+        if len(num_timesteps_per_export) != len(self):
+            raise ValueError(
+                "Number of timesteps per export does not match num_subintervals:"
+                f" {len(num_timesteps_per_export)} != {len(self)}."
+            )
+        for i, tspe in enumerate(num_timesteps_per_export):
+            if not isinstance(tspe, int) or tspe < 1:
+                raise ValueError(
+                    f"Number of timesteps per export on subinterval {i} should be a"
+                    f" positive integer, not {tspe}."
+                )
+        return TimePartition(
+            end_time=self.end_time,
+            num_subintervals=self.num_subintervals,
+            timesteps=[
+                dt * old / new
+                for dt, old, new in zip(
+                    self.timesteps,
+                    self.num_timesteps_per_export,
+                    num_timesteps_per_export,
+                )
+            ],
+            field_names=self.field_names,
+            num_timesteps_per_export=num_timesteps_per_export,
+            start_time=self.start_time,
+            subintervals=self.subintervals,
+            field_types=self.field_types,
+        )
+
     @property
     def num_timesteps(self):
         """
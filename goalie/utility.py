@@ -12,13 +12,27 @@ class AttrDict(dict):
     """
     Dictionary that provides both ``self[key]`` and ``self.key`` access to members.
 
-    **Disclaimer**: Copied from `stackoverflow
-    <http://stackoverflow.com/questions/4984647/accessing-dict-keys-like-an-attribute-in-python>`__.
+    Attribute access is redirected to the dictionary items, rather than aliasing the
+    instance ``__dict__`` to the dictionary itself, which avoids creating a reference
+    cycle for every instance.
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.__dict__ = self
+    __slots__ = ()
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __delattr__(self, key):
+        try:
+            del self[key]
+        except KeyError:
+            raise AttributeError(key) from None
 
 
 def effectivity_index(error_indicator, Je):
@@ -128,6 +128,20 @@ class TestIndicators2Estimator(ErrorEstimationTestCase):
             estimator, 1
         )  # 0.5 * (0.5 + 0.5) + 0.25 * 2 * (0.5 + 0.5)
 
+    def test_time_partition_aggregate(self):
+        mesh_seq = self.mesh_seq(
+            time_partition=TimePartition(1.0, 2, [0.5, 0.25], ["field"])
+        )
+        mesh_seq._create_indicators(aggregate=True)
+        indicator = form2indicator(self.one * dx)
+        mesh_seq.indicators.record("field", 0, 0, indicator, weight=0.5)
+        mesh_seq.indicators.record("field", 1, 0, indicator, weight=0.25)
+        mesh_seq.indicators.record("field", 1, 1, indicator, weight=0.25)
+        estimator = mesh_seq.error_estimate()
+        self.assertAlmostEqual(
+            estimator, 1
+        )  # 0.5 * (0.5 + 0.5) + 0.25 * 2 * (0.5 + 0.5)
+
     def test_time_instant_multiple_fields(self):
         mesh_seq = self.mesh_seq(
             time_partition=TimeInstant(["field1", "field2"], time=1.0)
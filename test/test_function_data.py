@@ -108,6 +108,33 @@ class BaseTestCases:
                     for f in sub_data[self.field][label]:
                         self.assertTrue(isinstance(f, Function))
 
+        def test_extract_cached(self):
+            data = self.solution_data.extract(layout="label")
+            self.assertIs(self.solution_data.extract(layout="label"), data)
+
+        def test_extract_subinterval_not_cached(self):
+            data = self.solution_data.extract(layout="subinterval")
+            self.assertIsNot(self.solution_data.extract(layout="subinterval"), data)
+
+        def test_extract_lazy(self):
+            self.solution_data.extract(layout="label")
+            for by_label in self.solution_data._data.values():
+                for data in by_label.values():
+                    self.assertTrue(all(entry is None for entry in list.__iter__(data)))
+
+        def _test_free(self, data):
+            f = data[0][0]
+            f.assign(1.0)
+            self.solution_data.free(0)
+            g = data[0][0]
+            self.assertIsNot(f, g)
+            self.assertEqual(len(data[0]), self.num_exports[0])
+            self.assertAlmostEqual(norm(g), 0.0)
+
+        def test_free(self):
+            data = self.solution_data.extract(layout="field")
+            self._test_free(data[self.field][self.labels[0]])
+
 
 class TestSteadyForwardSolutionData(BaseTestCases.TestFunctionData):
     """
@@ -201,6 +228,10 @@ class TestIndicatorData(BaseTestCases.TestFunctionData):
         data = self.solution_data.extract(layout="label")
         self._test_extract_by_field_or_label(data)
 
+    def test_free(self):
+        data = self.solution_data.extract(layout="field")
+        self._test_free(data[self.field])
+
     def test_extract_by_subinterval(self):
         data = self.solution_data.extract(layout="subinterval")
         self.assertTrue(isinstance(data, list))
@@ -212,6 +243,66 @@ class TestIndicatorData(BaseTestCases.TestFunctionData):
             for f in sub_data[self.field]:
                 self.assertTrue(isinstance(f, Function))
 
+    def test_assign(self):
+        P0_spaces = self.solution_data.function_spaces[self.field]
+        value = [[Function(fs)] for fs in P0_spaces]
+        self.solution_data.extract(layout="field")[self.field] = value
+        self.assertIs(self.solution_data[self.field], value)
+
+
+class TestAggregatedIndicatorData(unittest.TestCase):
+    """
+    Unit tests for :class:`~.IndicatorData` in aggregated mode.
+    """
+
+    def setUp(self):
+        self.field = "field"
+        self.time_partition = TimePartition(1.0, 2, [0.5, 0.25], self.field)
+        self.mesh = UnitSquareMesh(2, 2)
+        self.meshes = [self.mesh, self.mesh]
+        self.P0 = FunctionSpace(self.mesh, "DG", 0)
+
+    def indicator(self, cell):
+        indicator = Function(self.P0)
+        indicator.dat.data[cell] = 1.0
+        return indicator
+
+    def test_top_k_error(self):
+        with self.assertRaises(ValueError) as cm:
+            IndicatorData(self.time_partition, self.meshes, top_k=2)
+        msg = "The top_k option requires aggregate=True."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_top_k_value_error(self):
+        with self.assertRaises(ValueError) as cm:
+            IndicatorData(self.time_partition, self.meshes, aggregate=True, top_k=0)
+        msg = "top_k should be a positive integer, not 0."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_extract(self):
+        data = IndicatorData(self.time_partition, self.meshes, aggregate=True)
+        for by_subinterval in data.extract(layout="field")[self.field]:
+            self.assertEqual(len(by_subinterval), 1)
+            self.assertTrue(isinstance(by_subinterval[0], Function))
+
+    def test_record(self):
+        data = IndicatorData(self.time_partition, self.meshes, aggregate=True)
+        data.record(self.field, 1, 0, self.indicator(0), weight=0.25)
+        data.record(self.field, 1, 1, self.indicator(0), weight=0.25)
+        self.assertAlmostEqual(data[self.field][1][0].dat.data[0], 0.5)
+        self.assertAlmostEqual(norm(data[self.field][0][0]), 0.0)
+
+    def test_top_k(self):
+        data = IndicatorData(self.time_partition, self.meshes, aggregate=True, top_k=2)
+        data.record(self.field, 1, 0, self.indicator(3), weight=0.25)
+        indicator = self.indicator(5)
+        indicator.dat.data[5] = 2.0
+        indicator.dat.data[7] = 0.5
+        data.record(self.field, 1, 1, indicator, weight=0.25)
+        record = data.top_contributions[self.field][1]
+        self.assertEqual(record, [(0.5, 1, 5), (0.25, 0, 3)])
+        self.assertEqual(data.top_contributions[self.field][0], [])
+
 
 if __name__ == "__main__":
     unittest.main()
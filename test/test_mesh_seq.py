@@ -2,13 +2,27 @@
 Testing for the mesh sequence objects.
 """
 
+import os
 import re
+import tempfile
 import unittest
 
-from firedrake import Function, FunctionSpace, UnitCubeMesh, UnitSquareMesh
+import numpy as np
+from animate.metric import RiemannianMetric
+from firedrake import (
+    Function,
+    FunctionSpace,
+    Identity,
+    TensorFunctionSpace,
+    TestFunction,
+    UnitCubeMesh,
+    UnitSquareMesh,
+    dx,
+)
 from parameterized import parameterized
 
-from goalie.mesh_seq import MeshSeq
+from goalie.mesh_seq import MeshSeq, _continuation_stage
+from goalie.options import AdaptParameters
 from goalie.time_partition import TimeInterval, TimePartition
 
 
@@ -29,6 +43,30 @@ class TestGeneric(unittest.TestCase):
         mesh_seq[0] = mesh2
         self.assertEqual(mesh_seq[0], mesh2)
 
+    def test_copy_meshes(self):
+        mesh = UnitSquareMesh(1, 1)
+        mesh_seq = MeshSeq(self.time_partition, mesh)
+        self.assertIsNot(mesh_seq[0], mesh)
+        self.assertIsNot(mesh_seq[0], mesh_seq[1])
+
+    def test_share_meshes(self):
+        mesh = UnitSquareMesh(1, 1)
+        mesh_seq = MeshSeq(self.time_partition, mesh, share_meshes=True)
+        self.assertIs(mesh_seq[0], mesh)
+        self.assertIs(mesh_seq[1], mesh)
+
+    def test_transfer_assign(self):
+        mesh = UnitSquareMesh(1, 1)
+        mesh_seq = MeshSeq(self.time_partition, mesh, share_meshes=True)
+        V = FunctionSpace(mesh, "CG", 1)
+        source = Function(V).assign(1.0)
+        target = mesh_seq._transfer(source, FunctionSpace(mesh, "CG", 1))
+        self.assertIsNot(target, source)
+        self.assertTrue(np.allclose(target.dat.data_ro, 1.0))
+        target = Function(V)
+        self.assertIs(mesh_seq._transfer(source, target), target)
+        self.assertTrue(np.allclose(target.dat.data_ro, 1.0))
+
     def test_inconsistent_dim(self):
         meshes = [UnitSquareMesh(1, 1), UnitCubeMesh(1, 1, 1)]
         with self.assertRaises(ValueError) as cm:
@@ -125,6 +163,643 @@ class TestGeneric(unittest.TestCase):
         self.assertEqual(mesh_seq.count_vertices(), [64])
 
 
+class TestMetricConvergence(unittest.TestCase):
+    """
+    Unit tests for :meth:`MeshSeq.check_metric_convergence`.
+    """
+
+    def setUp(self):
+        self.time_interval = TimeInterval(1.0, [0.5], ["field"])
+        self.mesh = UnitSquareMesh(4, 4)
+
+    def metric(self, complexity):
+        metric = RiemannianMetric(TensorFunctionSpace(self.mesh, "CG", 1))
+        metric.interpolate(complexity * Identity(2))
+        return metric
+
+    def test_length_error(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        with self.assertRaises(ValueError) as cm:
+            mesh_seq.check_metric_convergence([])
+        msg = "Number of metrics (0) does not match the number of subintervals (1)."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_uncalibrated(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        self.assertFalse(mesh_seq.check_metric_convergence([self.metric(16.0)])[0])
+        self.assertFalse(mesh_seq.converged[0])
+
+    def test_no_change_predicted(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        mesh_seq.check_metric_convergence([self.metric(16.0)])
+        self.assertTrue(mesh_seq.check_metric_convergence([self.metric(16.0)])[0])
+        self.assertTrue(mesh_seq.converged[0])
+
+    def test_change_predicted(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        mesh_seq.check_metric_convergence([self.metric(16.0)])
+        self.assertFalse(mesh_seq.check_metric_convergence([self.metric(64.0)])[0])
+        self.assertFalse(mesh_seq.converged[0])
+
+    def test_set_meshes(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        mesh_seq.check_metric_convergence([self.metric(16.0)])
+        mesh_seq.set_meshes([UnitSquareMesh(4, 4)])
+        self.assertTrue(mesh_seq.check_metric_convergence([self.metric(16.0)])[0])
+
+
+class TestMetricRelaxation(unittest.TestCase):
+    """
+    Unit tests for :meth:`MeshSeq.relax_metrics`.
+    """
+
+    def setUp(self):
+        self.time_interval = TimeInterval(1.0, [0.5], ["field"])
+        self.mesh = UnitSquareMesh(4, 4)
+
+    def metric(self, complexity):
+        metric = RiemannianMetric(TensorFunctionSpace(self.mesh, "CG", 1))
+        metric.interpolate(complexity * Identity(2))
+        return metric
+
+    def mesh_seq(self, **parameters):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        mesh_seq.params = AdaptParameters(parameters)
+        return mesh_seq
+
+    def assertMetricEqual(self, metric, complexity):
+        expected = self.metric(complexity).dat.data_ro
+        self.assertTrue(np.allclose(metric.dat.data_ro, expected))
+
+    def test_length_error(self):
+        with self.assertRaises(ValueError) as cm:
+            self.mesh_seq().relax_metrics([])
+        msg = "Number of metrics (0) does not match the number of subintervals (1)."
+        self.assertEqual(str(cm.exception), msg)
+
+    @parameterized.expand(["none", "log_euclidean", "anderson"])
+    def test_first_iteration_unchanged(self, method):
+        mesh_seq = self.mesh_seq(metric_relaxation=method)
+        (metric,) = mesh_seq.relax_metrics([self.metric(4.0)])
+        self.assertMetricEqual(metric, 4.0)
+
+    def test_none(self):
+        mesh_seq = self.mesh_seq()
+        mesh_seq.relax_metrics([self.metric(1.0)])
+        (metric,) = mesh_seq.relax_metrics([self.metric(4.0)])
+        self.assertMetricEqual(metric, 4.0)
+
+    def test_log_euclidean(self):
+        mesh_seq = self.mesh_seq(metric_relaxation="log_euclidean")
+        mesh_seq.relax_metrics([self.metric(1.0)])
+        (metric,) = mesh_seq.relax_metrics([self.metric(4.0)])
+        self.assertMetricEqual(metric, 2.0)
+
+    def test_anderson(self):
+        mesh_seq = self.mesh_seq(metric_relaxation="anderson")
+        for complexity in (1.0, 4.0):
+            mesh_seq.relax_metrics([self.metric(complexity)])
+        (metric,) = mesh_seq.relax_metrics([self.metric(3.0)])
+        self.assertMetricEqual(metric, 3.25)
+
+
+class TestFunctionSpaces(unittest.TestCase):
+    """
+    Unit tests for the function spaces of a :class:`MeshSeq`.
+    """
+
+    def setUp(self):
+        self.time_partition = TimePartition(1.5, 3, 0.5, ["field"])
+        self.calls = []
+
+    def get_function_spaces(self, mesh):
+        self.calls.append(mesh)
+        return {"field": FunctionSpace(mesh, "CG", 1)}
+
+    def mesh_seq(self, meshes):
+        mesh_seq = MeshSeq(
+            self.time_partition, meshes, get_function_spaces=self.get_function_spaces
+        )
+        self.calls.clear()
+        return mesh_seq
+
+    def test_shared_mesh(self):
+        mesh_seq = self.mesh_seq([UnitSquareMesh(1, 1)] * 3)
+        spaces = mesh_seq.function_spaces["field"]
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(len(spaces), 3)
+
+    def test_no_rebuild(self):
+        mesh_seq = self.mesh_seq([UnitSquareMesh(1, 1) for _ in range(3)])
+        spaces = mesh_seq.function_spaces
+        self.assertEqual(len(self.calls), 3)
+        self.assertIs(mesh_seq.function_spaces, spaces)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_setitem(self):
+        mesh_seq = self.mesh_seq([UnitSquareMesh(1, 1) for _ in range(3)])
+        old = list(mesh_seq.function_spaces["field"])
+        self.calls.clear()
+        mesh = UnitSquareMesh(2, 2)
+        mesh_seq[1] = mesh
+        new = mesh_seq.function_spaces["field"]
+        self.assertEqual(self.calls, [mesh])
+        self.assertIs(new[0], old[0])
+        self.assertEqual(new[1].mesh(), mesh)
+        self.assertIs(new[2], old[2])
+
+    def test_set_meshes(self):
+        meshes = [UnitSquareMesh(1, 1) for _ in range(3)]
+        mesh_seq = self.mesh_seq(meshes)
+        old = list(mesh_seq.function_spaces["field"])
+        self.calls.clear()
+        mesh = UnitSquareMesh(2, 2)
+        mesh_seq.set_meshes([meshes[0], mesh, mesh])
+        new = mesh_seq.function_spaces["field"]
+        self.assertEqual(self.calls, [mesh])
+        self.assertIs(new[0], old[0])
+        self.assertEqual(new[1].mesh(), mesh)
+        self.assertEqual(new[2].mesh(), mesh)
+
+
+class TestFunctionPool(unittest.TestCase):
+    """
+    Unit tests for the pool of function buffers associated with a :class:`MeshSeq`.
+    """
+
+    def setUp(self):
+        self.time_interval = TimeInterval(1.0, [0.5], ["field"])
+        self.mesh = UnitSquareMesh(1, 1)
+        self.V = FunctionSpace(self.mesh, "CG", 1)
+
+    def test_reuse(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        f = mesh_seq._acquire_function(self.V)
+        f.assign(1.0)
+        mesh_seq._release_function(f)
+        g = mesh_seq._acquire_function(FunctionSpace(self.mesh, "CG", 1), name="g")
+        self.assertIs(g, f)
+        self.assertEqual(g.name(), "g")
+        self.assertTrue(np.allclose(g.dat.data_ro, 0.0))
+
+    def test_different_space(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        f = mesh_seq._acquire_function(self.V)
+        mesh_seq._release_function(f)
+        g = mesh_seq._acquire_function(FunctionSpace(self.mesh, "CG", 2))
+        self.assertIsNot(g, f)
+
+    def test_discard_other_mesh(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        mesh = UnitSquareMesh(2, 2)
+        mesh_seq._release_function(Function(FunctionSpace(mesh, "CG", 1)))
+        self.assertEqual(len(mesh_seq._function_pool), 0)
+
+    def test_purge(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        mesh_seq._release_function(Function(self.V))
+        self.assertEqual(len(mesh_seq._function_pool), 1)
+        mesh_seq[0] = UnitSquareMesh(2, 2)
+        self.assertEqual(len(mesh_seq._function_pool), 0)
+
+    def test_reinitialise_fields(self):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        ic = Function(self.V).assign(1.0)
+        mesh_seq._reinitialise_fields({"field": ic})
+        u, u_ = mesh_seq.fields["field"]
+        mesh_seq._reinitialise_fields({"field": ic})
+        self.assertEqual({*mesh_seq.fields["field"]}, {u, u_})
+        self.assertTrue(np.allclose(mesh_seq.fields["field"][1].dat.data_ro, 1.0))
+
+    def test_cached_solver(self):
+        def get_solver(mesh_seq):
+            def solver(i):
+                u, u_ = mesh_seq.fields["field"]
+                v = TestFunction(u.function_space())
+                F = (u - u_) * v * dx + 0.5 * u * v * dx
+                cached = mesh_seq.get_cached_solver(F, u)
+                num_timesteps = mesh_seq.time_partition.num_timesteps_per_subinterval[i]
+                for _ in range(num_timesteps):
+                    cached.solve()
+                    yield
+                    u_.assign(u)
+
+            return solver
+
+        mesh_seq = MeshSeq(
+            TimePartition(1.0, 2, 0.25, ["field"]),
+            self.mesh,
+            share_meshes=True,
+            get_function_spaces=lambda mesh: {"field": FunctionSpace(mesh, "R", 0)},
+            get_initial_condition=lambda mesh_seq: {
+                "field": Function(mesh_seq.function_spaces["field"][0]).assign(1.0)
+            },
+            get_solver=get_solver,
+        )
+        solutions = mesh_seq.solve_forward()["field"]
+        self.assertEqual(mesh_seq._solver_cache.hits, 1)
+        for i in range(2):
+            for j in range(2):
+                forward = solutions["forward"][i][j].dat.data_ro
+                forward_old = solutions["forward_old"][i][j].dat.data_ro
+                self.assertFalse(np.allclose(forward, forward_old))
+                self.assertTrue(np.allclose(forward, forward_old / 1.5))
+
+    def test_cached_solvers_same_signature(self):
+        def get_solver(mesh_seq):
+            def solver(i):
+                cached = {}
+                for field, (u, u_) in mesh_seq.fields.items():
+                    v = TestFunction(u.function_space())
+                    F = (u - u_) * v * dx + 0.5 * u * v * dx
+                    cached[field] = mesh_seq.get_cached_solver(F, u)
+                num_timesteps = mesh_seq.time_partition.num_timesteps_per_subinterval[i]
+                for _ in range(num_timesteps):
+                    for cached_solver in cached.values():
+                        cached_solver.solve()
+                    yield
+                    for u, u_ in mesh_seq.fields.values():
+                        u_.assign(u)
+
+            return solver
+
+        mesh_seq = MeshSeq(
+            TimePartition(1.0, 2, 0.25, ["a", "b"]),
+            self.mesh,
+            share_meshes=True,
+            get_function_spaces=lambda mesh: {
+                field: FunctionSpace(mesh, "R", 0) for field in ("a", "b")
+            },
+            get_initial_condition=lambda mesh_seq: {
+                field: Function(mesh_seq.function_spaces[field][0]).assign(value)
+                for field, value in (("a", 1.0), ("b", 2.0))
+            },
+            get_solver=get_solver,
+        )
+        solutions = mesh_seq.solve_forward()
+        self.assertEqual(len(mesh_seq._solver_cache), 2)
+        self.assertEqual(mesh_seq._solver_cache.hits, 2)
+        for i in range(2):
+            for j in range(2):
+                a = solutions["a"]["forward"][i][j].dat.data_ro
+                b = solutions["b"]["forward"][i][j].dat.data_ro
+                self.assertTrue(np.allclose(b, 2 * a))
+                self.assertTrue(np.allclose(a, (2 / 3) ** (2 * i + j + 1)))
+
+
+class TestBudget(unittest.TestCase):
+    """
+    Unit tests for the resource budgets of :meth:`MeshSeq.fixed_point_iteration`.
+    """
+
+    def setUp(self):
+        self.time_interval = TimeInterval(1.0, [0.5], ["field"])
+        self.mesh = UnitSquareMesh(1, 1)
+
+    def mesh_seq(self, **parameters):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        mesh_seq.params = AdaptParameters(parameters)
+        mesh_seq._start_budget()
+        return mesh_seq
+
+    def test_no_budget(self):
+        mesh_seq = self.mesh_seq()
+        self.assertFalse(mesh_seq._budget_exhausted())
+        self.assertEqual(len(mesh_seq._iteration_costs), 1)
+
+    @parameterized.expand(["max_wallclock", "max_core_hours", "max_memory"])
+    def test_exhausted(self, key):
+        mesh_seq = self.mesh_seq(**{key: 0.0})
+        self.assertTrue(mesh_seq._budget_exhausted())
+
+    def test_not_exhausted(self):
+        mesh_seq = self.mesh_seq(max_wallclock=3600.0)
+        self.assertFalse(mesh_seq._budget_exhausted())
+
+    def test_no_tracking_without_budget(self):
+        mesh_seq = self.mesh_seq()
+        mesh_seq._track_best_iteration(0.0, [self.mesh])
+        self.assertIsNone(mesh_seq._best_iteration)
+
+    def test_restore_best_iteration(self):
+        mesh_seq = self.mesh_seq(max_wallclock=3600.0)
+        meshes = [UnitSquareMesh(n, n) for n in (2, 3, 4)]
+        for iteration, (stability, mesh) in enumerate(zip([0.5, 0.1, 0.2], meshes)):
+            mesh_seq.fp_iteration = iteration
+            mesh_seq._track_best_iteration(stability, [mesh], J=iteration)
+        self.assertEqual(mesh_seq._best_iteration["iteration"], 1)
+        mesh_seq._restore_best_iteration()
+        self.assertIs(mesh_seq[0], meshes[1])
+        self.assertEqual(mesh_seq.J, 1)
+
+
+class TestCheckpoint(unittest.TestCase):
+    """
+    Unit tests for checkpointing :meth:`MeshSeq.fixed_point_iteration`.
+    """
+
+    def setUp(self):
+        self.time_partition = TimePartition(1.0, 2, 0.5, ["field"])
+        self.mesh = UnitSquareMesh(2, 2)
+        checkpoint_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(checkpoint_dir.cleanup)
+        self.checkpoint_dir = checkpoint_dir.name
+
+    def mesh_seq(self, meshes, **parameters):
+        mesh_seq = MeshSeq(self.time_partition, meshes)
+        mesh_seq.params = AdaptParameters(parameters)
+        mesh_seq.fp_iteration = 0
+        return mesh_seq
+
+    def test_resume_without_directory_error(self):
+        mesh_seq = self.mesh_seq([self.mesh, self.mesh])
+        with self.assertRaises(ValueError) as cm:
+            mesh_seq.fixed_point_iteration(lambda *args: False, resume=True)
+        self.assertEqual(str(cm.exception), "Resuming requires a checkpoint directory.")
+
+    def test_no_checkpoint(self):
+        mesh_seq = self.mesh_seq([self.mesh, self.mesh])
+        self.assertIsNone(mesh_seq._load_iteration_state(self.checkpoint_dir))
+
+    def test_time_partition_mismatch_error(self):
+        self.mesh_seq([self.mesh, self.mesh])._save_iteration_state(self.checkpoint_dir)
+        time_partition = TimePartition(1.0, 2, 0.25, ["field"])
+        mesh_seq = MeshSeq(time_partition, [self.mesh, self.mesh])
+        mesh_seq.params = AdaptParameters()
+        with self.assertRaises(ValueError) as cm:
+            mesh_seq._load_iteration_state(self.checkpoint_dir)
+        msg = (
+            f"Checkpoint in '{self.checkpoint_dir}' does not match the time partition."
+        )
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_save_load(self):
+        mesh_seq = self.mesh_seq([self.mesh, UnitSquareMesh(3, 3)], maxiter=5)
+        mesh_seq.fp_iteration = 2
+        mesh_seq.element_counts.append([8, 20])
+        mesh_seq.converged[:] = [True, False]
+        mesh_seq._save_iteration_state(self.checkpoint_dir, finished=True)
+
+        loaded = self.mesh_seq([UnitSquareMesh(1, 1)] * 2, maxiter=5)
+        state = loaded._load_iteration_state(self.checkpoint_dir)
+        self.assertTrue(state["finished"])
+        self.assertEqual(loaded.fp_iteration, 2)
+        self.assertEqual(loaded.params.maxiter, 5)
+        self.assertEqual(loaded.element_counts, [[8, 18], [8, 20]])
+        self.assertEqual(loaded.count_elements(), [8, 18])
+        self.assertEqual(loaded.converged.tolist(), [True, False])
+
+    def test_different_params(self):
+        mesh_seq = self.mesh_seq([self.mesh, self.mesh], maxiter=5)
+        mesh_seq._save_iteration_state(self.checkpoint_dir)
+        loaded = self.mesh_seq([self.mesh, self.mesh], maxiter=10, element_rtol=0.01)
+        with self.assertLogs("goalie", level="WARNING") as cm:
+            loaded._load_iteration_state(self.checkpoint_dir)
+        msg = (
+            "MeshSeq: Resuming with parameters which differ from those in the"
+            " checkpoint: element_rtol, maxiter. The new values are used."
+        )
+        self.assertEqual(cm.output, [f"WARNING:goalie:{msg}"])
+        self.assertEqual(loaded.params.maxiter, 10)
+        self.assertEqual(loaded.params.element_rtol, 0.01)
+
+    def test_shared_mesh(self):
+        self.mesh_seq([self.mesh, self.mesh])._save_iteration_state(self.checkpoint_dir)
+        mesh_seq = self.mesh_seq([UnitSquareMesh(1, 1), UnitSquareMesh(1, 1)])
+        mesh_seq._load_iteration_state(self.checkpoint_dir)
+        self.assertIs(mesh_seq[0], mesh_seq[1])
+        self.assertEqual(len(os.listdir(self.checkpoint_dir)), 2)
+
+    def test_remove_previous_meshes(self):
+        mesh_seq = self.mesh_seq([self.mesh, UnitSquareMesh(3, 3)])
+        mesh_seq._save_iteration_state(self.checkpoint_dir)
+        mesh_seq.fp_iteration = 1
+        mesh_seq._save_iteration_state(self.checkpoint_dir)
+        expected = {"state.json", "mesh_1_0.h5", "mesh_1_1.h5"}
+        self.assertEqual(set(os.listdir(self.checkpoint_dir)), expected)
+
+
+class TestContinuation(unittest.TestCase):
+    """
+    Unit tests for continuation schedules in :meth:`MeshSeq.fixed_point_iteration`.
+    """
+
+    def setUp(self):
+        self.time_partition = TimePartition(
+            1.0, 2, [0.125, 0.0625], ["field"], num_timesteps_per_export=[2, 4]
+        )
+        self.mesh = UnitSquareMesh(1, 1)
+
+    def test_unexpected_key_error(self):
+        with self.assertRaises(ValueError) as cm:
+            _continuation_stage(timesteps=2)
+        msg = "Unexpected continuation stage key 'timesteps'."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_num_iterations_error(self):
+        with self.assertRaises(ValueError) as cm:
+            _continuation_stage(num_iterations=0)
+        msg = (
+            "Number of iterations in a continuation stage should be a positive integer,"
+            " not 0."
+        )
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_complexity_factor_error(self):
+        with self.assertRaises(ValueError) as cm:
+            _continuation_stage(complexity_factor=0.0)
+        msg = "Complexity factor should be positive, not 0.0."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_subintervals_error(self):
+        mesh_seq = MeshSeq(self.time_partition, self.mesh)
+        with self.assertRaises(ValueError) as cm:
+            mesh_seq._set_time_partition(TimePartition(2.0, 2, 0.125, ["field"]))
+        msg = "Time partitions have different subintervals."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_schedule(self):
+        mesh_seq = MeshSeq(self.time_partition, self.mesh)
+        stages = mesh_seq._start_continuation(
+            [
+                {"num_iterations": 2, "timestep_factor": 2, "complexity_factor": 0.25},
+                {"complexity_factor": 0.5},
+            ]
+        )
+        expected = [
+            (False, [0.25, 0.125], 0.25),
+            (False, [0.25, 0.125], 0.25),
+            (False, [0.125, 0.0625], 0.5),
+            (True, [0.125, 0.0625], 1.0),
+        ]
+        for fp_iteration, (production, timesteps, complexity_factor) in enumerate(
+            expected
+        ):
+            mesh_seq.fp_iteration = fp_iteration
+            self.assertEqual(mesh_seq._update_continuation(stages), production)
+            self.assertEqual(mesh_seq.time_partition.timesteps, timesteps)
+            self.assertEqual(
+                mesh_seq.continuation_stage.complexity_factor, complexity_factor
+            )
+
+    def test_finish(self):
+        mesh_seq = MeshSeq(self.time_partition, self.mesh)
+        stages = mesh_seq._start_continuation([{"timestep_factor": 2}])
+        mesh_seq._update_continuation(stages)
+        self.assertNotEqual(mesh_seq.time_partition, self.time_partition)
+        mesh_seq._finish_continuation()
+        self.assertIs(mesh_seq.time_partition, self.time_partition)
+
+
+class TestInexactSolves(unittest.TestCase):
+    """
+    Unit tests for inexact solves in :meth:`MeshSeq.fixed_point_iteration`.
+    """
+
+    def setUp(self):
+        self.time_interval = TimeInterval(1.0, [0.5], ["field"])
+        self.mesh = UnitSquareMesh(1, 1)
+
+    def mesh_seq(self, **parameters):
+        mesh_seq = MeshSeq(self.time_interval, [self.mesh])
+        mesh_seq.params = AdaptParameters(parameters)
+        mesh_seq.fp_iteration = 0
+        mesh_seq._start_inexact_solves()
+        return mesh_seq
+
+    def test_disabled(self):
+        mesh_seq = self.mesh_seq()
+        self.assertIsNone(mesh_seq._inexact_rtol(None))
+        self.assertIsNone(mesh_seq._inexact_rtol(0.5))
+
+    @parameterized.expand([(None, 0.01), (1.0, 0.01), (0.05, 0.005)])
+    def test_rtol(self, change, expected):
+        mesh_seq = self.mesh_seq(inexact_solves=True)
+        self.assertAlmostEqual(mesh_seq._inexact_rtol(change), expected)
+
+    def test_final_iteration_exact(self):
+        mesh_seq = self.mesh_seq(inexact_solves=True, maxiter=3)
+        mesh_seq.fp_iteration = 2
+        self.assertIsNone(mesh_seq._inexact_rtol(0.5))
+
+    def test_no_solves(self):
+        mesh_seq = self.mesh_seq(inexact_solves=True)
+        mesh_seq._record_solver_iterations()
+        mesh_seq._report_inexact_solves()
+        self.assertIsNone(mesh_seq.solver_iterations_saved)
+        self.assertEqual(mesh_seq._inexact_history, [(0.0, 0, 0)])
+
+
+class TestTimestepAdaptation(unittest.TestCase):
+    """
+    Unit tests for temporal adaptation in :meth:`MeshSeq.fixed_point_iteration`.
+    """
+
+    def setUp(self):
+        self.time_partition = TimePartition(
+            1.0, 2, 0.0625, ["field"], num_timesteps_per_export=4
+        )
+        self.mesh = UnitSquareMesh(1, 1)
+
+    def mesh_seq(self, values, **parameters):
+        mesh_seq = MeshSeq(
+            self.time_partition,
+            self.mesh,
+            get_function_spaces=lambda mesh: {"field": FunctionSpace(mesh, "DG", 0)},
+        )
+        mesh_seq.params = AdaptParameters(parameters)
+        for exports, by_export in zip(mesh_seq.solutions["field"]["forward"], values):
+            for f, value in zip(exports, by_export):
+                f.assign(value)
+        return mesh_seq
+
+    def test_temporal_indicators(self):
+        mesh_seq = self.mesh_seq([[1.0, 1.0], [1.0, 2.0]])
+        indicators = mesh_seq.temporal_indicators()
+        self.assertTrue(np.allclose(indicators, [0.0, 0.5]))
+
+    def test_adapt_timesteps(self):
+        mesh_seq = self.mesh_seq([[1.0, 1.0], [1.0, 1.02]], timestep_rtol=0.01)
+        changed = mesh_seq.adapt_timesteps()
+        self.assertEqual(changed.tolist(), [True, True])
+        tp = mesh_seq.time_partition
+        self.assertEqual(tp.num_timesteps_per_export, [1, 2])
+        self.assertTrue(np.allclose(tp.timesteps, [0.25, 0.125]))
+        self.assertEqual(tp.subintervals, self.time_partition.subintervals)
+
+    def test_finest_timestep(self):
+        mesh_seq = self.mesh_seq([[1.0, 2.0], [1.0, 2.0]])
+        changed = mesh_seq.adapt_timesteps()
+        self.assertFalse(changed.any())
+        self.assertIs(mesh_seq.time_partition, self.time_partition)
+
+    def test_single_export_warning(self):
+        self.time_partition = TimePartition(
+            1.0, 2, 0.0625, ["field"], num_timesteps_per_export=8
+        )
+        mesh_seq = self.mesh_seq([[1.0], [2.0]])
+        with self.assertLogs("goalie", level="WARNING") as cm:
+            changed = mesh_seq.adapt_timesteps()
+        self.assertEqual(
+            cm.output[0],
+            "WARNING:goalie:MeshSeq: Timesteps cannot be adapted on subintervals with"
+            " fewer than two exports: 0, 1. Their finest timesteps are used.",
+        )
+        self.assertFalse(changed.any())
+
+    def test_disabled(self):
+        mesh_seq = self.mesh_seq([[1.0, 1.0], [1.0, 1.0]])
+        self.assertFalse(mesh_seq._update_timesteps(True).any())
+        self.assertIs(mesh_seq.time_partition, self.time_partition)
+
+    def test_resume(self):
+        def get_solver(mesh_seq):
+            def solver(i):
+                u, u_ = mesh_seq.fields["field"]
+                num_timesteps = mesh_seq.time_partition.num_timesteps_per_subinterval[i]
+                for _ in range(num_timesteps):
+                    u.assign(u_)
+                    yield
+                    u_.assign(u)
+
+            return solver
+
+        def mesh_seq():
+            return MeshSeq(
+                self.time_partition,
+                self.mesh,
+                get_function_spaces=lambda mesh: {
+                    "field": FunctionSpace(mesh, "DG", 0)
+                },
+                get_initial_condition=lambda mesh_seq: {
+                    "field": Function(mesh_seq.function_spaces["field"][0]).assign(1.0)
+                },
+                get_solver=get_solver,
+            )
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        checkpoint_dir = tmpdir.name
+        parameters = AdaptParameters({"timestep_adaptation": True})
+        adapted = mesh_seq()
+        adapted.fixed_point_iteration(
+            lambda *args: False, parameters=parameters, checkpoint_dir=checkpoint_dir
+        )
+        self.assertTrue(adapted.converged.all())
+        self.assertEqual(adapted.time_partition.num_timesteps_per_export, [1, 1])
+
+        resumed = mesh_seq()
+        resumed.fixed_point_iteration(
+            lambda *args: False,
+            parameters=parameters,
+            checkpoint_dir=checkpoint_dir,
+            resume=True,
+        )
+        self.assertEqual(resumed.fp_iteration, adapted.fp_iteration)
+        self.assertEqual(resumed.time_partition.num_timesteps_per_export, [1, 1])
+        self.assertTrue(np.allclose(resumed.time_partition.timesteps, [0.25, 0.25]))
+
+
 class TestStringFormatting(unittest.TestCase):
     """
     Test that the :meth:`__str__` and :meth:`__repr__` methods work as intended for
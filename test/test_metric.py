@@ -169,6 +169,180 @@ class TestMetricNormalisation(BaseClasses.MetricTestCase):
         # Check that the metrics coincide
         self.assertAlmostEqual(errornorm(M, M_st), 0)
 
+    @pytest.mark.slow
+    @parameterized.expand([(multiscale,), (interweaved,)])
+    def test_target_complexity_restricted(self, sensor):
+        """
+        Check that iterating on the global normalisation factor brings the complexity
+        of the restricted metric closer to the target.
+        """
+        mesh = mesh_for_sensors(2, 50)
+        target = 1000.0
+        metric_parameters = {
+            "dm_plex_metric_p": 1.0,
+            "dm_plex_metric_target_complexity": target,
+            "dm_plex_metric_h_min": 0.05,
+            "dm_plex_metric_h_max": 0.5,
+        }
+        M = RiemannianMetric(TensorFunctionSpace(mesh, "CG", 1))
+        M.compute_hessian(sensor(*mesh.coordinates))
+        M_iter = M.copy(deepcopy=True)
+        space_time_normalise([M], self.time_partition, metric_parameters)
+        space_time_normalise(
+            [M_iter], self.time_partition, metric_parameters, complexity_rtol=1.0e-03
+        )
+        error = abs(M.complexity() - target)
+        error_iter = abs(M_iter.complexity() - target)
+        self.assertLess(error_iter, error)
+        self.assertLess(error_iter, 0.05 * target)
+
+    def test_subinterval_targets_global_factor_error(self):
+        mp = {"dm_plex_metric_p": 1.0}
+        with self.assertRaises(ValueError) as cm:
+            space_time_normalise(
+                [self.simple_metric],
+                self.time_partition,
+                mp,
+                global_factor=1.0,
+                subinterval_targets=[1.0],
+            )
+        msg = "The global_factor and subinterval_targets options are incompatible."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_subinterval_targets_length_error(self):
+        mp = {"dm_plex_metric_p": 1.0}
+        with self.assertRaises(ValueError) as cm:
+            space_time_normalise(
+                [self.simple_metric],
+                self.time_partition,
+                mp,
+                subinterval_targets=[1.0, 2.0],
+            )
+        msg = "Number of metrics does not match number of subinterval targets: 1 vs. 2."
+        self.assertEqual(str(cm.exception), msg)
+
+    @pytest.mark.slow
+    @parameterized.expand([(1,), (np.inf,)])
+    def test_subinterval_targets(self, degree):
+        """
+        Check that each subinterval achieves its own target complexity.
+        """
+        mesh = mesh_for_sensors(2, 50)
+        time_partition = TimePartition(1.0, 2, [0.5, 0.25], "u")
+        metric_parameters = {"dm_plex_metric_p": degree}
+        metrics = []
+        for sensor in (bowl, multiscale):
+            M = RiemannianMetric(TensorFunctionSpace(mesh, "CG", 1))
+            M.compute_hessian(sensor(*mesh.coordinates))
+            metrics.append(M)
+        targets = [400.0, 1600.0]
+        space_time_normalise(
+            metrics,
+            time_partition,
+            metric_parameters,
+            restrict_sizes=False,
+            restrict_anisotropy=False,
+            subinterval_targets=targets,
+        )
+        for M, target in zip(metrics, targets):
+            self.assertAlmostEqual(M.complexity() / target, 1.0, places=2)
+
+    @pytest.mark.slow
+    @parameterized.expand(
+        [
+            (bowl, 1),
+            (hyperbolic, 2),
+            (multiscale, np.inf),
+            (interweaved, 1),
+        ]
+    )
+    def test_fused(self, sensor, degree):
+        """
+        Check that the fused normalisation gives the same metric as the default
+        approach.
+        """
+        mesh = mesh_for_sensors(2, 50)
+        metric_parameters = {
+            "dm_plex_metric_p": degree,
+            "dm_plex_metric_target_complexity": 1000.0,
+            "dm_plex_metric_h_min": 0.01,
+            "dm_plex_metric_h_max": 0.5,
+            "dm_plex_metric_a_max": 100.0,
+        }
+        M = RiemannianMetric(TensorFunctionSpace(mesh, "CG", 1))
+        M.compute_hessian(sensor(*mesh.coordinates))
+        M_fused = M.copy(deepcopy=True)
+        space_time_normalise([M], self.time_partition, metric_parameters)
+        space_time_normalise(
+            [M_fused], self.time_partition, metric_parameters, fused=True
+        )
+        self.assertFalse(np.isnan(M_fused.dat.data).any())
+        self.assertAlmostEqual(errornorm(M, M_fused) / norm(M), 0)
+
+
+class TestAllocateComplexity(unittest.TestCase):
+    """
+    Unit tests for :func:`allocate_complexity`.
+    """
+
+    def setUp(self):
+        self.time_partition = TimePartition(1.0, 2, [0.25, 0.125], "u")
+
+    def test_length_error(self):
+        with self.assertRaises(ValueError) as cm:
+            allocate_complexity([1.0], [1.0, 1.0], self.time_partition)
+        msg = "Number of estimates, costs and subintervals do not match: 1 vs. 2 vs. 2."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_estimates_non_positive_error(self):
+        with self.assertRaises(ValueError) as cm:
+            allocate_complexity([1.0, 0.0], [1.0, 1.0], self.time_partition)
+        self.assertIn("Error estimates must be positive", str(cm.exception))
+
+    def test_convergence_rate_non_positive_error(self):
+        with self.assertRaises(ValueError) as cm:
+            allocate_complexity(
+                [1.0, 1.0], [1.0, 1.0], self.time_partition, convergence_rate=0.0
+            )
+        msg = "Convergence rate must be positive, not 0.0."
+        self.assertEqual(str(cm.exception), msg)
+
+    @parameterized.expand([(None,), (1000.0,)])
+    def test_budget(self, budget):
+        costs = [200.0, 1200.0]
+        complexities = allocate_complexity(
+            [1.0, 2.0], costs, self.time_partition, budget=budget
+        )
+        cost = np.dot(self.time_partition.num_timesteps_per_subinterval, complexities)
+        self.assertAlmostEqual(cost, sum(costs) if budget is None else budget)
+
+    def test_uniform(self):
+        time_partition = TimePartition(1.0, 2, 0.125, "u")
+        complexities = allocate_complexity([1.0, 1.0], [400.0, 400.0], time_partition)
+        self.assertTrue(np.allclose(complexities, 100.0))
+
+    @parameterized.expand([(0.5,), (1.0,), (2.0,)])
+    def test_optimal(self, rate):
+        """
+        Check that perturbing the allocation within the budget does not reduce the
+        modelled error.
+        """
+        estimates, costs = np.array([1.0, 4.0]), np.array([200.0, 1200.0])
+        n = np.array(self.time_partition.num_timesteps_per_subinterval)
+        C0 = costs / n
+
+        def error(C):
+            return np.sum(estimates * pow(C / C0, -rate))
+
+        C = np.array(
+            allocate_complexity(
+                estimates, costs, self.time_partition, convergence_rate=rate
+            )
+        )
+        for delta in (-1.0, 1.0):
+            perturbed = C + delta * np.array([1.0 / n[0], -1.0 / n[1]])
+            self.assertLess(error(C), error(perturbed))
+
 
 class TestRampComplexity(unittest.TestCase):
     """
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from goalie.options import *
 
 
@@ -14,6 +16,17 @@ class TestAdaptParameters(unittest.TestCase):
             "maxiter": 35,
             "element_rtol": 0.001,
             "drop_out_converged": False,
+            "max_wallclock": np.inf,
+            "max_core_hours": np.inf,
+            "max_memory": np.inf,
+            "metric_relaxation": "none",
+            "relaxation_weight": 0.5,
+            "anderson_depth": 3,
+            "inexact_solves": False,
+            "inexact_rtol": 0.01,
+            "inexact_factor": 0.1,
+            "timestep_adaptation": False,
+            "timestep_rtol": 0.01,
         }
 
     def test_input(self):
@@ -51,7 +64,10 @@ class TestAdaptParameters(unittest.TestCase):
         ap = AdaptParameters()
         expected = (
             "AdaptParameters(miniter=3, maxiter=35, element_rtol=0.001,"
-            " drop_out_converged=False)"
+            " drop_out_converged=False, max_wallclock=inf, max_core_hours=inf,"
+            " max_memory=inf, metric_relaxation=none, relaxation_weight=0.5,"
+            " anderson_depth=3, inexact_solves=False, inexact_rtol=0.01,"
+            " inexact_factor=0.1, timestep_adaptation=False, timestep_rtol=0.01)"
         )
         self.assertEqual(repr(ap), expected)
 
@@ -79,6 +95,24 @@ class TestAdaptParameters(unittest.TestCase):
         msg = "Expected attribute 'drop_out_converged' to be of type 'bool', not 'int'."
         self.assertEqual(str(cm.exception), msg)
 
+    def test_max_wallclock_type_error(self):
+        with self.assertRaises(TypeError) as cm:
+            AdaptParameters({"max_wallclock": "3600"})
+        msg = (
+            "Expected attribute 'max_wallclock' to be of type 'float' or 'int', not"
+            " 'str'."
+        )
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_metric_relaxation_value_error(self):
+        with self.assertRaises(ValueError) as cm:
+            AdaptParameters({"metric_relaxation": "average"})
+        msg = (
+            "Unsupported value 'average' for 'metric_relaxation'. Choose from ['none',"
+            " 'log_euclidean', 'anderson']."
+        )
+        self.assertEqual(str(cm.exception), msg)
+
 
 class TestGoalOrientedAdaptParameters(unittest.TestCase):
     """
@@ -89,11 +123,23 @@ class TestGoalOrientedAdaptParameters(unittest.TestCase):
         self.defaults = {
             "qoi_rtol": 0.001,
             "estimator_rtol": 0.001,
+            "estimator_fraction": 0.0,
             "convergence_criteria": "any",
             "miniter": 3,
             "maxiter": 35,
             "element_rtol": 0.001,
             "drop_out_converged": False,
+            "max_wallclock": np.inf,
+            "max_core_hours": np.inf,
+            "max_memory": np.inf,
+            "metric_relaxation": "none",
+            "relaxation_weight": 0.5,
+            "anderson_depth": 3,
+            "inexact_solves": False,
+            "inexact_rtol": 0.01,
+            "inexact_factor": 0.1,
+            "timestep_adaptation": False,
+            "timestep_rtol": 0.01,
         }
 
     def test_defaults(self):
@@ -109,8 +155,12 @@ class TestGoalOrientedAdaptParameters(unittest.TestCase):
         ap = GoalOrientedAdaptParameters()
         expected = (
             "GoalOrientedAdaptParameters(qoi_rtol=0.001, estimator_rtol=0.001,"
-            " convergence_criteria=any, miniter=3, maxiter=35, element_rtol=0.001,"
-            " drop_out_converged=False)"
+            " estimator_fraction=0.0, convergence_criteria=any, miniter=3, maxiter=35,"
+            " element_rtol=0.001, drop_out_converged=False, max_wallclock=inf,"
+            " max_core_hours=inf, max_memory=inf, metric_relaxation=none,"
+            " relaxation_weight=0.5, anderson_depth=3, inexact_solves=False,"
+            " inexact_rtol=0.01, inexact_factor=0.1, timestep_adaptation=False,"
+            " timestep_rtol=0.01)"
         )
         self.assertEqual(repr(ap), expected)
 
@@ -143,6 +193,15 @@ class TestGoalOrientedAdaptParameters(unittest.TestCase):
         )
         self.assertEqual(str(cm.exception), msg)
 
+    def test_estimator_fraction_type_error(self):
+        with self.assertRaises(TypeError) as cm:
+            GoalOrientedAdaptParameters({"estimator_fraction": "0.1"})
+        msg = (
+            "Expected attribute 'estimator_fraction' to be of type 'float' or 'int',"
+            " not 'str'."
+        )
+        self.assertEqual(str(cm.exception), msg)
+
 
 if __name__ == "__main__":
     unittest.main()
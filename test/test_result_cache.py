@@ -0,0 +1,197 @@
+"""
+Unit tests for :class:`~.ResultCache`.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+import numpy as np
+from firedrake import Constant, Function, FunctionSpace, UnitSquareMesh
+
+from goalie.mesh_seq import MeshSeq
+from goalie.result_cache import ResultCache
+from goalie.time_partition import TimePartition
+
+
+class TestResultCache(unittest.TestCase):
+    """
+    Unit tests for storing and loading solution data with a :class:`ResultCache`.
+    """
+
+    def setUp(self):
+        self.time_partition = TimePartition(1.0, 2, 0.5, ["field"])
+        self.mesh = UnitSquareMesh(2, 2)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def get_function_spaces(self, mesh):
+        return {"field": FunctionSpace(mesh, "CG", 1)}
+
+    def mesh_seq(self, mesh=None, **kwargs):
+        return MeshSeq(
+            self.time_partition,
+            [mesh or self.mesh] * 2,
+            get_function_spaces=self.get_function_spaces,
+            **kwargs,
+        )
+
+    def store(self, cache, value, solver_kwargs=None, mesh=None):
+        mesh_seq = self.mesh_seq(mesh=mesh)
+        for f in mesh_seq.solutions["field"]["forward"][0]:
+            f.assign(value)
+        key = cache.key(mesh_seq, "forward", solver_kwargs)
+        cache.store(key, mesh_seq.solutions, value=value)
+        return key
+
+    def test_max_size_error(self):
+        with self.assertRaises(ValueError) as cm:
+            ResultCache(self.directory, max_size=0)
+        msg = "Maximum cache size should be positive, not 0."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_max_entries_error(self):
+        with self.assertRaises(ValueError) as cm:
+            ResultCache(self.directory, max_entries=0)
+        msg = "Maximum number of cache entries should be positive, not 0."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_key_deterministic(self):
+        cache = ResultCache(self.directory)
+        key = cache.key(self.mesh_seq(), "forward", {"a": 1})
+        self.assertEqual(key, cache.key(self.mesh_seq(), "forward", {"a": 1}))
+
+    def test_key_changes(self):
+        cache = ResultCache(self.directory)
+        key = cache.key(self.mesh_seq(), "forward")
+        self.assertNotEqual(key, cache.key(self.mesh_seq(), "adjoint"))
+        self.assertNotEqual(key, cache.key(self.mesh_seq(), "forward", {"a": 1}))
+        self.assertNotEqual(key, cache.key(self.mesh_seq(), "forward", version=1))
+        mesh_seq = self.mesh_seq(mesh=UnitSquareMesh(3, 3))
+        self.assertNotEqual(key, cache.key(mesh_seq, "forward"))
+
+    def test_key_solver_rtol(self):
+        cache = ResultCache(self.directory)
+        mesh_seq = self.mesh_seq()
+        key = cache.key(mesh_seq, "forward")
+        mesh_seq._solver_rtol = 1.0e-02
+        self.assertNotEqual(key, cache.key(mesh_seq, "forward"))
+
+    def test_key_by_value(self):
+        cache = ResultCache(self.directory)
+        V = FunctionSpace(self.mesh, "CG", 1)
+
+        def key(value):
+            kwargs = {"f": Function(V).assign(value), "c": Constant(value)}
+            return cache.key(self.mesh_seq(), "forward", kwargs)
+
+        self.assertEqual(key(1.0), key(1.0))
+        self.assertNotEqual(key(1.0), key(2.0))
+
+    def test_key_type_error(self):
+        cache = ResultCache(self.directory)
+        with self.assertRaises(TypeError) as cm:
+            cache.key(self.mesh_seq(), "forward", {"a": object()})
+        msg = "Cannot compute a result cache key for an object of type 'object'."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_key_independent_processes(self):
+        script = textwrap.dedent(
+            """
+            import sys
+
+            from firedrake import Constant, Function, FunctionSpace, UnitSquareMesh
+
+            from goalie.mesh_seq import MeshSeq
+            from goalie.result_cache import ResultCache
+            from goalie.time_partition import TimePartition
+
+            mesh = UnitSquareMesh(2, 2)
+            V = FunctionSpace(mesh, "CG", 1)
+            unused = [Function(V) for _ in range(int(sys.argv[2]))]
+            mesh_seq = MeshSeq(
+                TimePartition(1.0, 2, 0.5, ["field"]),
+                [mesh, mesh],
+                get_function_spaces=lambda mesh: {"field": FunctionSpace(mesh, "CG", 1)},
+            )
+            kwargs = {"f": Function(V).assign(1.0), "c": Constant(2.0)}
+            print(ResultCache(sys.argv[1]).key(mesh_seq, "forward", kwargs))
+            """
+        )
+        keys = [
+            subprocess.check_output(
+                [sys.executable, "-c", script, self.directory, str(num_unused)],
+                text=True,
+            ).split()[-1]
+            for num_unused in (0, 3)
+        ]
+        self.assertEqual(keys[0], keys[1])
+
+    def test_miss(self):
+        cache = ResultCache(self.directory)
+        mesh_seq = self.mesh_seq()
+        key = cache.key(mesh_seq, "forward")
+        self.assertIsNone(cache.load(key, mesh_seq.solutions))
+
+    def test_store_load(self):
+        cache = ResultCache(self.directory)
+        key = self.store(cache, 2.0)
+        mesh_seq = self.mesh_seq()
+        metadata = cache.load(key, mesh_seq.solutions)
+        self.assertEqual(metadata, {"value": 2.0})
+        f = mesh_seq.solutions["field"]["forward"][0][0]
+        self.assertTrue(np.allclose(f.dat.data_ro, 2.0))
+        self.assertEqual(len(cache), 1)
+
+    def test_store_twice(self):
+        cache = ResultCache(self.directory)
+        self.store(cache, 1.0)
+        self.store(cache, 1.0)
+        self.assertEqual(len(cache), 1)
+
+    def test_evict_least_recently_used(self):
+        cache = ResultCache(self.directory, max_entries=2)
+        keys = [self.store(cache, 1.0, {"i": i}) for i in range(2)]
+        for i, key in enumerate(keys):
+            os.utime(os.path.join(self.directory, key, "metadata.json"), (i, i))
+        cache.load(keys[0], self.mesh_seq().solutions)
+        self.store(cache, 1.0, {"i": 2})
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(os.path.isdir(os.path.join(self.directory, keys[0])))
+        self.assertFalse(os.path.isdir(os.path.join(self.directory, keys[1])))
+
+    def test_evict_max_size(self):
+        cache = ResultCache(self.directory, max_size=1.0e-06)
+        self.store(cache, 1.0)
+        self.assertEqual(len(cache), 0)
+
+    def test_clear(self):
+        cache = ResultCache(self.directory)
+        self.store(cache, 1.0)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_solve_forward_cached(self):
+        cache = ResultCache(self.directory)
+        self.store(cache, 3.0)
+        mesh_seq = self.mesh_seq(result_cache=cache)
+        solutions = mesh_seq.solve_forward()
+        f = solutions["field"]["forward"][0][0]
+        self.assertTrue(np.allclose(f.dat.data_ro, 3.0))
+
+    def test_solve_forward_cached_set_meshes(self):
+        cache = ResultCache(self.directory)
+        mesh = UnitSquareMesh(2, 2, diagonal="right")
+        self.store(cache, 3.0, mesh=mesh)
+        mesh_seq = self.mesh_seq(result_cache=cache)
+        f = mesh_seq.solutions["field"]["forward"][0][0]
+        self.assertEqual(f.function_space().mesh(), self.mesh)
+        mesh_seq.set_meshes([mesh, mesh])
+        solutions = mesh_seq.solve_forward()
+        f = solutions["field"]["forward"][0][0]
+        self.assertEqual(f.function_space().mesh(), mesh)
+        self.assertTrue(np.allclose(f.dat.data_ro, 3.0))
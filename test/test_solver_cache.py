@@ -0,0 +1,184 @@
+"""
+Testing for solver caching.
+"""
+
+import unittest
+
+from firedrake import (
+    Constant,
+    DirichletBC,
+    Function,
+    FunctionSpace,
+    TestFunction,
+    TrialFunction,
+    UnitSquareMesh,
+    dx,
+    errornorm,
+    grad,
+    inner,
+    solve,
+)
+
+from goalie.mesh_seq import MeshSeq
+from goalie.solver_cache import SolverCache
+from goalie.time_partition import TimePartition
+
+
+class TestSolverCache(unittest.TestCase):
+    """
+    Unit tests for :class:`SolverCache`.
+    """
+
+    def setUp(self):
+        self.mesh = UnitSquareMesh(4, 4)
+        self.V = FunctionSpace(self.mesh, "CG", 1)
+
+    def equation(self, value):
+        u, v = TrialFunction(self.V), TestFunction(self.V)
+        f = Function(self.V).assign(value)
+        return inner(grad(u), grad(v)) * dx + u * v * dx == f * v * dx
+
+    def solve(self, cache, value):
+        uh = Function(self.V)
+        bc = DirichletBC(self.V, Constant(value), 1)
+        cache.get(self.equation(value), uh, bcs=bc).solve()
+        return uh
+
+    def test_reuse(self):
+        cache = SolverCache()
+        self.solve(cache, 1.0)
+        cache.release()
+        self.solve(cache, 2.0)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_reuse_solution(self):
+        uh1 = self.solve(SolverCache(), 2.0)
+        cache = SolverCache()
+        self.solve(cache, 1.0)
+        cache.release()
+        uh2 = self.solve(cache, 2.0)
+        self.assertEqual(cache.hits, 1)
+        self.assertAlmostEqual(errornorm(uh1, uh2), 0.0)
+
+    def test_claimed(self):
+        expected = [self.solve(SolverCache(), value) for value in (1.0, 2.0)]
+        cache = SolverCache()
+        for _ in range(2):
+            uh = [self.solve(cache, value) for value in (1.0, 2.0)]
+            for uh_, expected_ in zip(uh, expected):
+                self.assertAlmostEqual(errornorm(expected_, uh_), 0.0)
+            cache.release()
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 2)
+
+    def test_different_parameters(self):
+        cache = SolverCache()
+        uh = Function(self.V)
+        cache.get(self.equation(1.0), uh, solver_parameters={"ksp_type": "cg"})
+        cache.get(self.equation(1.0), uh, solver_parameters={"ksp_type": "gmres"})
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.misses, 2)
+
+    def test_invalidate(self):
+        cache = SolverCache()
+        self.solve(cache, 1.0)
+        cache.invalidate(UnitSquareMesh(1, 1))
+        self.assertEqual(len(cache), 1)
+        cache.invalidate(self.mesh)
+        self.assertEqual(len(cache), 0)
+
+    def test_iteration_counts(self):
+        cache = SolverCache()
+        uh = Function(self.V)
+        solver_parameters = {"ksp_type": "cg", "pc_type": "none"}
+        solver = cache.get(self.equation(1.0), uh, solver_parameters=solver_parameters)
+        solver.solve()
+        self.assertEqual(cache.num_solves, 1)
+        self.assertGreater(cache.linear_iterations, 0)
+        its = cache.linear_iterations
+        cache.invalidate()
+        self.assertEqual(cache.num_solves, 1)
+        self.assertEqual(cache.linear_iterations, its)
+
+    def test_relax_tolerances(self):
+        cache = SolverCache()
+        solver = cache.get(self.equation(1.0), Function(self.V))
+        ksp = solver.snes.getKSP()
+        rtol = ksp.getTolerances()[0]
+        solver.relax_tolerances(1.0e-02)
+        self.assertAlmostEqual(ksp.getTolerances()[0], 1.0e-02)
+        solver.relax_tolerances()
+        self.assertAlmostEqual(ksp.getTolerances()[0], rtol)
+
+    def test_mesh_seq_invalidate(self):
+        time_partition = TimePartition(1.0, 1, 0.5, ["field"])
+        mesh_seq = MeshSeq(time_partition, [self.mesh])
+        mesh_seq.get_cached_solver(self.equation(1.0), Function(self.V))
+        self.assertEqual(len(mesh_seq._solver_cache), 1)
+        mesh_seq[0] = UnitSquareMesh(1, 1)
+        self.assertEqual(len(mesh_seq._solver_cache), 0)
+
+
+class TestReusedFactorisationPC(unittest.TestCase):
+    """
+    Unit tests for :class:`ReusedFactorisationPC`.
+    """
+
+    def setUp(self):
+        self.mesh = UnitSquareMesh(4, 4)
+        self.V = FunctionSpace(self.mesh, "CG", 1)
+        u, v = TrialFunction(self.V), TestFunction(self.V)
+        self.a = inner(grad(u), grad(v)) * dx + u * v * dx
+        self.v = v
+
+    def solve(self, value, solver_parameters):
+        uh = Function(self.V)
+        f = Function(self.V).assign(value)
+        solve(self.a == f * self.v * dx, uh, solver_parameters=solver_parameters)
+        return uh
+
+    def test_reuse(self):
+        cache = SolverCache()
+        sp = cache.factorisation_parameters("key", self.mesh)
+        for value in (1.0, 2.0):
+            uh = self.solve(value, sp)
+            expected = self.solve(value, {"ksp_type": "preonly", "pc_type": "lu"})
+            self.assertAlmostEqual(errornorm(expected, uh), 0.0)
+        self.assertEqual(len(cache._factorisations), 1)
+        self.assertIsNotNone(cache._factorisations["key"][1])
+
+    def test_krylov(self):
+        sp = SolverCache().factorisation_parameters("key", self.mesh)
+        self.assertEqual(sp["ksp_type"], "gmres")
+
+    def test_separate_caches(self):
+        cache1, cache2 = SolverCache(), SolverCache()
+        self.solve(1.0, cache1.factorisation_parameters("key", self.mesh))
+        self.assertIsNone(cache2._factorisations.get("key"))
+
+    def test_clear(self):
+        cache = SolverCache()
+        self.solve(1.0, cache.factorisation_parameters("key", self.mesh))
+        cache.clear_factorisation("other")
+        self.assertEqual(len(cache._factorisations), 1)
+        cache.clear_factorisation("key")
+        self.assertEqual(len(cache._factorisations), 0)
+
+    def test_invalidate(self):
+        cache = SolverCache()
+        self.solve(1.0, cache.factorisation_parameters("key", self.mesh))
+        cache.invalidate(UnitSquareMesh(1, 1))
+        self.assertEqual(len(cache._factorisations), 1)
+        cache.invalidate(self.mesh)
+        self.assertEqual(len(cache._factorisations), 0)
+
+    def test_mesh_seq_invalidate(self):
+        time_partition = TimePartition(1.0, 1, 0.5, ["field"])
+        mesh_seq = MeshSeq(time_partition, [self.mesh])
+        cache = mesh_seq._solver_cache
+        self.solve(1.0, cache.factorisation_parameters("key", self.mesh))
+        mesh_seq.set_meshes([UnitSquareMesh(1, 1)])
+        self.assertEqual(len(cache._factorisations), 0)
@@ -4,6 +4,8 @@ Testing for the time partition objects.
 
 import unittest
 
+from parameterized import parameterized
+
 from goalie.time_partition import TimeInstant, TimeInterval, TimePartition
 
 
@@ -341,5 +343,87 @@ class TestSlicing(unittest.TestCase):
         self.assertEqual(tp0.field_names, tp12.field_names)
 
 
+class TestCoarsening(unittest.TestCase):
+    r"""
+    Unit tests for coarsening :class:`~.TimePartition`\s.
+    """
+
+    def setUp(self):
+        self.time_partition = TimePartition(
+            1.0, 2, [0.125, 0.0625], ["field"], num_timesteps_per_export=[2, 4]
+        )
+
+    @parameterized.expand([0, 1.0])
+    def test_invalid_factor(self, factor):
+        with self.assertRaises(ValueError) as cm:
+            self.time_partition.coarsen(factor)
+        msg = f"Coarsening factor should be a positive integer, not {factor}."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_indivisible_factor(self):
+        with self.assertRaises(ValueError) as cm:
+            self.time_partition.coarsen(4)
+        msg = (
+            "Coarsening factor 4 does not divide the number of timesteps per export on"
+            " subinterval 0: 2."
+        )
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_unit_factor(self):
+        self.assertEqual(self.time_partition.coarsen(1), self.time_partition)
+
+    def test_coarsen(self):
+        tp = self.time_partition.coarsen(2)
+        self.assertEqual(tp.timesteps, [0.25, 0.125])
+        self.assertEqual(tp.num_timesteps_per_subinterval, [2, 4])
+        self.assertEqual(tp.num_timesteps_per_export, [1, 2])
+        self.assertEqual(
+            tp.num_exports_per_subinterval,
+            self.time_partition.num_exports_per_subinterval,
+        )
+        self.assertEqual(tp.subintervals, self.time_partition.subintervals)
+
+
+class TestResampling(unittest.TestCase):
+    r"""
+    Unit tests for resampling :class:`~.TimePartition`\s.
+    """
+
+    def setUp(self):
+        self.time_partition = TimePartition(
+            1.0, 2, [0.125, 0.0625], ["field"], num_timesteps_per_export=[2, 4]
+        )
+
+    def test_length_error(self):
+        with self.assertRaises(ValueError) as cm:
+            self.time_partition.resample([1, 2, 3])
+        msg = "Number of timesteps per export does not match num_subintervals: 3 != 2."
+        self.assertEqual(str(cm.exception), msg)
+
+    @parameterized.expand([0, 1.0])
+    def test_invalid_value(self, tspe):
+        with self.assertRaises(ValueError) as cm:
+            self.time_partition.resample([1, tspe])
+        msg = (
+            "Number of timesteps per export on subinterval 1 should be a positive"
+            f" integer, not {tspe}."
+        )
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_unchanged(self):
+        self.assertEqual(self.time_partition.resample([2, 4]), self.time_partition)
+
+    def test_resample(self):
+        tp = self.time_partition.resample([1, 8])
+        self.assertEqual(tp.timesteps, [0.25, 0.03125])
+        self.assertEqual(tp.num_timesteps_per_subinterval, [2, 16])
+        self.assertEqual(tp.num_timesteps_per_export, [1, 8])
+        self.assertEqual(
+            tp.num_exports_per_subinterval,
+            self.time_partition.num_exports_per_subinterval,
+        )
+        self.assertEqual(tp.subintervals, self.time_partition.subintervals)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -21,6 +21,27 @@ scalar_norm_types = pointwise_norm_types + integral_scalar_norm_types
 # ---------------------------
 
 
+class TestAttrDict(unittest.TestCase):
+    """
+    Unit tests for :class:`AttrDict`.
+    """
+
+    def test_getattr(self):
+        d = AttrDict({"a": 1})
+        self.assertEqual(d.a, 1)
+        self.assertFalse(hasattr(d, "b"))
+
+    def test_setattr(self):
+        d = AttrDict()
+        d.a = 1
+        self.assertEqual(d["a"], 1)
+        del d.a
+        self.assertNotIn("a", d)
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(AttrDict(), "__dict__"))
+
+
 class TestEffectivityIndex(unittest.TestCase):
     """
     Unit tests for :func:`effectivity_index`.
@@ -10,7 +10,16 @@ import unittest
 import pyadjoint
 import pytest
 from animate.utility import errornorm, norm
-from firedrake import Cofunction, UnitTriangleMesh
+from firedrake import (
+    Cofunction,
+    Function,
+    FunctionSpace,
+    TestFunction,
+    UnitTriangleMesh,
+    dx,
+    inner,
+    solve,
+)
 
 from goalie_adjoint import *
 
@@ -39,6 +48,17 @@ class TestAdjointMeshSeqGeneric(unittest.TestCase):
         )
         self.assertEqual(str(cm.exception), msg)
 
+    def test_adjoint_method_error(self):
+        with self.assertRaises(ValueError) as cm:
+            AdjointMeshSeq(
+                self.time_interval,
+                self.meshes,
+                qoi_type="end_time",
+                adjoint_method="blah",
+            )
+        msg = "Adjoint method 'blah' not recognised. Choose from 'tape' or 'tape_free'."
+        self.assertEqual(str(cm.exception), msg)
+
     def test_get_qoi_notimplemented_error(self):
         mesh_seq = AdjointMeshSeq(self.time_interval, self.meshes, qoi_type="end_time")
         with self.assertRaises(NotImplementedError) as cm:
@@ -46,6 +66,54 @@ class TestAdjointMeshSeqGeneric(unittest.TestCase):
         msg = "'get_qoi' is not implemented."
         self.assertEqual(str(cm.exception), msg)
 
+    def test_tape_free_time_dependent_error(self):
+        time = Function(FunctionSpace(self.meshes[0], "R", 0), name="time")
+
+        def get_function_spaces(mesh):
+            return {"field": FunctionSpace(mesh, "DG", 0)}
+
+        def get_form(mesh_seq):
+            def form(index):
+                u, u_ = mesh_seq.fields["field"]
+                v = TestFunction(mesh_seq.function_spaces["field"][index])
+                return {"field": inner(u - u_ - time, v) * dx}
+
+            return form
+
+        def get_solver(mesh_seq):
+            def solver(index):
+                u, u_ = mesh_seq.fields["field"]
+                F = mesh_seq.form(index)["field"]
+                for _ in range(2):
+                    time.assign(time + 0.5)
+                    solve(F == 0, u, ad_block_tag="field")
+                    yield
+                    u_.assign(u)
+
+            return solver
+
+        def get_qoi(mesh_seq, index):
+            return lambda: mesh_seq.fields["field"][0] * dx
+
+        mesh_seq = AdjointMeshSeq(
+            self.time_interval,
+            self.meshes,
+            get_function_spaces=get_function_spaces,
+            get_form=get_form,
+            get_solver=get_solver,
+            get_qoi=get_qoi,
+            qoi_type="end_time",
+            adjoint_method="tape_free",
+        )
+        with self.assertRaises(NotImplementedError) as cm:
+            mesh_seq.solve_adjoint()
+        msg = (
+            "Tape-free adjoint solves require the coefficients of the form to be"
+            " time-independent, but 'time' changed on the 0th subinterval."
+        )
+        self.assertEqual(str(cm.exception), msg)
+        pyadjoint.get_working_tape().clear_tape()
+
 
 # ---------------------------
 # standard tests for pytest
@@ -224,6 +292,153 @@ def test_adjoint_same_mesh(problem, qoi_type, debug=False):
     tape.clear_tape()
 
 
+@pytest.mark.slow
+@pytest.mark.parametrize("num_subintervals", [1, 2])
+def test_adjoint_tape_free(qoi_type, num_subintervals):
+    """
+    Check that tape-free adjoint solves give the same result as those based on the
+    pyadjoint tape.
+
+    :arg qoi_type: is the QoI evaluated at the end time
+        or as a time integral?
+    :arg num_subintervals: the number of subintervals to use
+    """
+    test_case = importlib.import_module("burgers")
+    time_partition = TimePartition(
+        test_case.end_time,
+        num_subintervals,
+        test_case.dt,
+        test_case.fields,
+        num_timesteps_per_export=test_case.dt_per_export,
+    )
+    solutions = {}
+    for adjoint_method in ("tape", "tape_free"):
+        mesh_seq = AdjointMeshSeq(
+            time_partition,
+            test_case.mesh,
+            get_function_spaces=test_case.get_function_spaces,
+            get_initial_condition=test_case.get_initial_condition,
+            get_form=test_case.get_form,
+            get_solver=test_case.get_solver,
+            get_qoi=test_case.get_qoi,
+            qoi_type=qoi_type,
+            adjoint_method=adjoint_method,
+        )
+        solutions[adjoint_method] = mesh_seq.solve_adjoint(get_adj_values=True)
+    for field in time_partition.field_names:
+        for label in ("forward", "adjoint", "adjoint_next", "adj_value"):
+            for i in range(num_subintervals):
+                for expected, computed in zip(
+                    solutions["tape"][field][label][i],
+                    solutions["tape_free"][field][label][i],
+                ):
+                    expected_norm = norm(expected)
+                    err = errornorm(expected, computed)
+                    if not np.isclose(expected_norm, 0.0):
+                        err /= expected_norm
+                    assert np.isclose(err, 0.0)
+    pyadjoint.get_working_tape().clear_tape()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("num_subintervals", [1, 2])
+def test_adjoint_reuse_tape(qoi_type, num_subintervals):
+    """
+    Check that replaying stored tapes gives the same result as annotating afresh.
+
+    :arg qoi_type: is the QoI evaluated at the end time
+        or as a time integral?
+    :arg num_subintervals: the number of subintervals to use
+    """
+    test_case = importlib.import_module("burgers")
+    time_partition = TimePartition(
+        test_case.end_time,
+        num_subintervals,
+        test_case.dt,
+        test_case.fields,
+        num_timesteps_per_export=test_case.dt_per_export,
+    )
+    mesh_seq = AdjointMeshSeq(
+        time_partition,
+        test_case.mesh,
+        get_function_spaces=test_case.get_function_spaces,
+        get_initial_condition=test_case.get_initial_condition,
+        get_form=test_case.get_form,
+        get_solver=test_case.get_solver,
+        get_qoi=test_case.get_qoi,
+        qoi_type=qoi_type,
+    )
+    expected = mesh_seq.solve_adjoint(get_adj_values=True)
+    J_expected = float(mesh_seq.J)
+    expected = {
+        field: {
+            label: [
+                [f.copy(deepcopy=True) for f in fs] for fs in expected[field][label]
+            ]
+            for label in ("forward", "adjoint", "adj_value")
+        }
+        for field in time_partition.field_names
+    }
+    for _ in range(2):
+        computed = mesh_seq.solve_adjoint(get_adj_values=True, reuse_tape=True)
+        assert np.isclose(J_expected, float(mesh_seq.J))
+        for field in time_partition.field_names:
+            for label in ("forward", "adjoint", "adj_value"):
+                for i in range(num_subintervals):
+                    for e, c in zip(
+                        expected[field][label][i], computed[field][label][i]
+                    ):
+                        err = errornorm(e, c)
+                        assert np.isclose(err, 0.0)
+    assert len(mesh_seq._tapes) == num_subintervals
+    pyadjoint.get_working_tape().clear_tape()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("num_subintervals", [1, 2])
+def test_indicate_errors_streaming(qoi_type, num_subintervals):
+    """
+    Check that streaming the error indication gives the same indicators as computing
+    them after both adjoint solves.
+
+    :arg qoi_type: is the QoI evaluated at the end time
+        or as a time integral?
+    :arg num_subintervals: the number of subintervals to use
+    """
+    test_case = importlib.import_module("burgers")
+    time_partition = TimePartition(
+        test_case.end_time,
+        num_subintervals,
+        test_case.dt,
+        test_case.fields,
+        num_timesteps_per_export=test_case.dt_per_export,
+    )
+    mesh_seq = GoalOrientedMeshSeq(
+        time_partition,
+        test_case.mesh,
+        get_function_spaces=test_case.get_function_spaces,
+        get_initial_condition=test_case.get_initial_condition,
+        get_form=test_case.get_form,
+        get_solver=test_case.get_solver,
+        get_qoi=test_case.get_qoi,
+        qoi_type=qoi_type,
+    )
+    _, expected = mesh_seq.indicate_errors()
+    expected = {
+        field: [[f.copy(deepcopy=True) for f in fs] for fs in by_field]
+        for field, by_field in expected.items()
+    }
+    solutions, computed = mesh_seq.indicate_errors(streaming=True)
+    for field, by_field in expected.items():
+        for i in range(num_subintervals):
+            for e, c in zip(by_field[i], computed[field][i]):
+                assert np.isclose(errornorm(e, c), 0.0)
+
+            # The solution data are freed once the indicators have been computed
+            assert np.isclose(norm(solutions[field]["forward"][i][0]), 0.0)
+    pyadjoint.get_working_tape().clear_tape()
+
+
 def plot_solutions(problem, qoi_type, debug=True):
     """
     Plot the forward and adjoint solutions, their lagged
@@ -267,3 +267,20 @@ class TestGoalOrientedMeshSeq(TestAdjointMeshSeq):
         mesh_seq.check_estimator_convergence = MagicMock(return_value=estimator)
         mesh_seq.fixed_point_iteration(empty_adaptor, parameters=self.parameters)
         self.assertTrue(np.allclose(mesh_seq.check_convergence, True))
+
+    @parameterized.expand([(False,), (True,)])
+    def test_streaming_error(self, timestep_adaptation):
+        self.parameters.timestep_adaptation = timestep_adaptation
+        mesh_seq = self.mesh_seq(time_partition=TimePartition(1.0, 1, 0.5, []))
+        with self.assertRaises(ValueError) as cm:
+            mesh_seq.fixed_point_iteration(
+                empty_adaptor,
+                parameters=self.parameters,
+                indicator_kwargs={"streaming": True},
+            )
+        msg = (
+            "Streaming error indication cannot be used in the fixed point iteration,"
+            " since it frees the solution data required by the adaptor, timestep"
+            " adaptation and the restoration of the best iteration."
+        )
+        self.assertEqual(str(cm.exception), msg)
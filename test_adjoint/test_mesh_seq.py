@@ -6,10 +6,12 @@ import logging
 import unittest
 from unittest.mock import patch
 
+import numpy as np
 import pyadjoint
 import pytest
 from animate.utility import norm
 from firedrake import (
+    DirichletBC,
     Function,
     FunctionSpace,
     SpatialCoordinate,
@@ -19,6 +21,9 @@ from firedrake import (
     UnitTriangleMesh,
     VectorFunctionSpace,
     dx,
+    errornorm,
+    grad,
+    inner,
     solve,
 )
 from parameterized import parameterized
@@ -167,6 +172,36 @@ class TestBlockLogic(unittest.TestCase):
         solve_block = MockSolveBlock()
         self.assertIsNone(mesh_seq._dependency("field", 0, solve_block))
 
+    @patch("firedrake.adjoint_utils.blocks.solving.GenericSolveBlock")
+    def test_output_position_reused(self, MockSolveBlock):
+        function_space = FunctionSpace(self.mesh, "DG", 0)
+        solve_block = MockSolveBlock()
+        solve_block._outputs = [
+            BlockVariable(Function(function_space, name="field2")),
+            BlockVariable(Function(function_space, name="field")),
+        ]
+        self.mesh_seq._output("field", 0, solve_block)
+        self.assertEqual(self.mesh_seq._output_positions[("field", 0)], 1)
+        solve_block._outputs.reverse()
+        out = self.mesh_seq._output("field", 0, solve_block)
+        self.assertEqual(out.output.name(), "field")
+        self.assertEqual(self.mesh_seq._output_positions[("field", 0)], 0)
+
+    @patch("firedrake.adjoint_utils.blocks.solving.GenericSolveBlock")
+    def test_dependency_position_reused(self, MockSolveBlock):
+        function_space = FunctionSpace(self.mesh, "DG", 0)
+        solve_block = MockSolveBlock()
+        solve_block._dependencies = [
+            BlockVariable(Function(function_space, name="field")),
+            BlockVariable(Function(function_space, name="field_old")),
+        ]
+        self.mesh_seq._dependency("field", 0, solve_block)
+        self.assertEqual(self.mesh_seq._dependency_positions[("field", 0)], 1)
+        solve_block._dependencies.reverse()
+        dep = self.mesh_seq._dependency("field", 0, solve_block)
+        self.assertEqual(dep.output.name(), "field_old")
+        self.assertEqual(self.mesh_seq._dependency_positions[("field", 0)], 0)
+
 
 class TestGetSolveBlocks(unittest.TestCase):
     """
@@ -266,6 +301,29 @@ class TestGetSolveBlocks(unittest.TestCase):
             mesh_seq.get_solve_blocks("field", 0)
         self.assertEqual(str(cm.exception), msg)
 
+    def test_index_reused(self):
+        fs = self.mesh_seq.function_spaces["field"][0]
+        u = Function(fs, name="field")
+        self.arbitrary_solve(u)
+        blocks = self.mesh_seq.get_solve_blocks("field", 0)
+        index = self.mesh_seq._block_index
+        self.assertEqual(len(blocks), 1)
+        self.assertIs(self.mesh_seq.get_solve_blocks("field", 0), blocks)
+        self.assertIs(self.mesh_seq._block_index, index)
+        self.assertIn(("field", 0), index["validated"])
+
+    def test_index_rebuilt(self):
+        fs = self.mesh_seq.function_spaces["field"][0]
+        u = Function(fs, name="field")
+        self.arbitrary_solve(u)
+        self.mesh_seq.get_solve_blocks("field", 0)
+        index = self.mesh_seq._block_index
+        pyadjoint.get_working_tape().clear_tape()
+        self.arbitrary_solve(u)
+        blocks = self.mesh_seq.get_solve_blocks("field", 0)
+        self.assertIsNot(self.mesh_seq._block_index, index)
+        self.assertEqual(len(blocks), 1)
+
     def test_incompatible_timesteps(self):
         time_interval = TimeInterval(1.0, [0.5], ["field"])
         mesh_seq = AdjointMeshSeq(
@@ -358,6 +416,21 @@ class TestGlobalEnrichment(TrivialGoalOrientedBaseClass):
         msg = "h-enrichment is not supported for shallow-copied meshes."
         self.assertEqual(str(cm.exception), msg)
 
+    def test_h_enrichment_shared_meshes(self):
+        mesh_seq = GoalOrientedMeshSeq(
+            TimePartition(1.0, 2, 0.5, "field"),
+            UnitTriangleMesh(),
+            get_function_spaces=self.get_function_spaces_decorator("CG", 1, 0),
+            get_qoi=self.constant_qoi,
+            qoi_type="end_time",
+            share_meshes=True,
+        )
+        mesh_seq_e = mesh_seq.get_enriched_mesh_seq(enrichment_method="h")
+        self.assertEqual(len(mesh_seq_e._hierarchies), 1)
+        self.assertEqual(mesh_seq_e._hierarchies[0][0], mesh_seq[0])
+        self.assertEqual(mesh_seq_e[0], mesh_seq_e[1])
+        self.assertEqual(mesh_seq_e[0].num_cells(), 4)
+
     @parameterized.expand([[1], [2]])
     def test_h_enrichment_mesh(self, num_enrichments):
         """
@@ -448,6 +521,28 @@ class TestGlobalEnrichment(TrivialGoalOrientedBaseClass):
         self.assertEqual(element.degree() + num_enrichments, enriched_element.degree())
         self.assertEqual(element.value_shape, enriched_element.value_shape)
 
+    def test_h_enrichment_multigrid(self):
+        mesh_seq = self.go_mesh_seq(self.get_function_spaces_decorator("CG", 1, 0))
+        mesh_seq_e = mesh_seq.get_enriched_mesh_seq(enrichment_method="h")
+        expected = {"ksp_type": "gmres", "ksp_rtol": 1.0e-05, "pc_type": "mg"}
+        self.assertEqual(mesh_seq_e.multigrid_parameters, expected)
+        self.assertEqual(len(mesh_seq_e._hierarchies), 1)
+        self.assertEqual(mesh_seq_e._hierarchies[0][0], mesh_seq[0])
+        self.assertEqual(mesh_seq_e._hierarchies[0][-1], mesh_seq_e[0])
+
+    @parameterized.expand([[1], [2]])
+    def test_p_enrichment_multigrid(self, degree):
+        mesh_seq = self.go_mesh_seq(self.get_function_spaces_decorator("CG", degree, 0))
+        mesh_seq_e = mesh_seq.get_enriched_mesh_seq(enrichment_method="p")
+        expected = {
+            "ksp_type": "gmres",
+            "ksp_rtol": 1.0e-05,
+            "pc_type": "python",
+            "pc_python_type": "firedrake.PMGPC",
+            "pmg_mg_coarse_degree": degree,
+        }
+        self.assertEqual(mesh_seq_e.multigrid_parameters, expected)
+
     @parameterized.expand(
         [
             ("DG", 0, 0, "h", 1),
@@ -492,3 +587,188 @@ class TestGlobalEnrichment(TrivialGoalOrientedBaseClass):
         target = Function(mesh_seq_e.function_spaces["field"][0])
         transfer(source, target)
         self.assertAlmostEqual(norm(source), norm(target))
+
+
+class TestLocalisedEnrichment(TrivialGoalOrientedBaseClass):
+    """
+    Unit tests for element marking in localised enrichment of a
+    :class:`GoalOrientedMeshSeq`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.meshes = [UnitSquareMesh(2, 2)]
+
+    @staticmethod
+    def get_function_spaces(mesh):
+        return {"field": FunctionSpace(mesh, "CG", 1)}
+
+    @parameterized.expand([[0.0], [1.5]])
+    def test_marking_fraction_error(self, fraction):
+        mesh_seq = self.go_mesh_seq(self.get_function_spaces)
+        with self.assertRaises(ValueError) as cm:
+            mesh_seq._mark_elements(fraction)
+        msg = f"Marking fraction should lie in (0, 1], not {fraction}."
+        self.assertEqual(str(cm.exception), msg)
+
+    def test_mark_no_indicators(self):
+        mesh_seq = self.go_mesh_seq(self.get_function_spaces)
+        self.assertIsNone(mesh_seq._mark_elements(0.5))
+
+    @parameterized.expand([[0.25, 2], [0.5, 4], [1.0, 8]])
+    def test_mark_elements(self, fraction, expected):
+        mesh_seq = self.go_mesh_seq(self.get_function_spaces)
+        indicator = mesh_seq.indicators[self.field][0][0]
+        indicator.dat.data[:] = range(8)
+        markers = mesh_seq._mark_elements(fraction)
+        self.assertEqual(len(markers), 1)
+        self.assertEqual(sum(markers[0].dat.data), expected)
+        self.assertTrue(all(markers[0].dat.data[8 - expected :] == 1))
+
+    @parameterized.expand([[0.0, 0], [1.0, 8]])
+    def test_patch_indicator_uniform(self, value, expected):
+        mesh_seq = self.go_mesh_seq(self.get_function_spaces)
+        marker = Function(FunctionSpace(mesh_seq[0], "DG", 0)).assign(value)
+        patch = mesh_seq._patch_indicator(marker)
+        self.assertEqual(sum(patch.dat.data), expected)
+
+    def test_patch_indicator_neighbours(self):
+        mesh_seq = self.go_mesh_seq(self.get_function_spaces)
+        marker = Function(FunctionSpace(mesh_seq[0], "DG", 0))
+        marker.dat.data[0] = 1
+        patch = mesh_seq._patch_indicator(marker)
+        self.assertEqual(patch.dat.data[0], 1)
+        self.assertTrue(1 < sum(patch.dat.data) < 8)
+
+    @staticmethod
+    def get_form(mesh_seq):
+        def form(index):
+            u = mesh_seq.fields["field"]
+            v = TestFunction(mesh_seq.function_spaces["field"][index])
+            return {"field": (inner(grad(u), grad(v)) - v) * dx}
+
+        return form
+
+    @staticmethod
+    def get_solver(mesh_seq):
+        def solver(index):
+            u = mesh_seq.fields["field"]
+            fs = mesh_seq.function_spaces["field"][index]
+            F = mesh_seq.form(index)["field"]
+            bc = DirichletBC(fs, 0, "on_boundary")
+            solve(F == 0, u, bcs=bc, ad_block_tag="field")
+            yield
+
+        return solver
+
+    @staticmethod
+    def get_bcs(mesh_seq):
+        def bcs(index):
+            fs = mesh_seq.function_spaces["field"][index]
+            return {"field": [DirichletBC(fs, 0, (1, 2, 3, 4))]}
+
+        return bcs
+
+    @staticmethod
+    def get_qoi(mesh_seq, index):
+        return lambda: mesh_seq.fields["field"] * dx
+
+    def localised_mesh_seq(self, mesh):
+        return GoalOrientedMeshSeq(
+            self.time_interval,
+            mesh,
+            get_function_spaces=self.get_function_spaces,
+            get_form=self.get_form,
+            get_solver=self.get_solver,
+            get_bcs=self.get_bcs,
+            get_qoi=self.get_qoi,
+            qoi_type="steady",
+        )
+
+    @parameterized.expand([["h"], ["p"]])
+    def test_indicate_errors_localised(self, enrichment_method):
+        mesh_seq = self.localised_mesh_seq(UnitSquareMesh(4, 4))
+        enrichment_kwargs = {"enrichment_method": enrichment_method}
+        _, expected = mesh_seq.indicate_errors(enrichment_kwargs=enrichment_kwargs)
+        expected = [f.copy(deepcopy=True) for f in expected[self.field][0]]
+
+        # With every element marked, the submesh covers the whole domain and the
+        # result should coincide with that of global enrichment
+        enrichment_kwargs.update({"localised": True, "marking_fraction": 1.0})
+        _, computed = mesh_seq.indicate_errors(enrichment_kwargs=enrichment_kwargs)
+        for e, c in zip(expected, computed[self.field][0]):
+            self.assertTrue(np.isclose(errornorm(e, c) / norm(e), 0.0))
+        pyadjoint.get_working_tape().clear_tape()
+
+    @parameterized.expand([["h"], ["p"]])
+    def test_indicate_errors_localised_partial(self, enrichment_method):
+        mesh_seq = self.localised_mesh_seq(UnitSquareMesh(8, 8))
+        enrichment_kwargs = {"enrichment_method": enrichment_method}
+        mesh_seq.indicate_errors(enrichment_kwargs=enrichment_kwargs)
+        patch = mesh_seq._patch_indicator(mesh_seq._mark_elements(0.05)[0])
+
+        # The enriched adjoint problem is only solved on the patch around the marked
+        # elements, so the error indicators vanish elsewhere
+        enrichment_kwargs.update({"localised": True, "marking_fraction": 0.05})
+        _, computed = mesh_seq.indicate_errors(enrichment_kwargs=enrichment_kwargs)
+        indicator = computed[self.field][0][0].dat.data_ro
+        outside = patch.dat.data_ro < 0.5
+        self.assertTrue(outside.any())
+        self.assertTrue(np.allclose(indicator[outside], 1.0e-16))
+        self.assertTrue(np.any(indicator[~outside] > 1.0e-16))
+        pyadjoint.get_working_tape().clear_tape()
+
+
+class TestMultigridEnrichment(TrivialGoalOrientedBaseClass):
+    """
+    Unit tests for multigrid preconditioning of the enriched adjoint solves of a
+    :class:`GoalOrientedMeshSeq`.
+    """
+
+    def mesh_seq(self):
+        return GoalOrientedMeshSeq(
+            self.time_interval,
+            UnitSquareMesh(8, 8),
+            get_function_spaces=TestLocalisedEnrichment.get_function_spaces,
+            get_form=TestLocalisedEnrichment.get_form,
+            get_solver=TestLocalisedEnrichment.get_solver,
+            get_qoi=TestLocalisedEnrichment.get_qoi,
+            qoi_type="steady",
+        )
+
+    def indicate_errors(self, enrichment_method, multigrid, solver_parameters=None):
+        mesh_seq = self.mesh_seq()
+        enrichment_kwargs = {
+            "enrichment_method": enrichment_method,
+            "multigrid": multigrid,
+        }
+        solver_kwargs = {"adj_solver_kwargs": {"solver_parameters": solver_parameters}}
+        _, indicators = mesh_seq.indicate_errors(
+            enrichment_kwargs=enrichment_kwargs,
+            solver_kwargs=solver_kwargs if solver_parameters else None,
+        )
+        pyadjoint.get_working_tape().clear_tape()
+        return indicators[self.field][0]
+
+    @parameterized.expand([["h"], ["p"]])
+    def test_converged(self, enrichment_method):
+        expected = self.indicate_errors(enrichment_method, False)
+
+        # The preconditioned enriched adjoint solves should converge within a few
+        # iterations, without falling back to the direct solver
+        with self.assertNoLogs("goalie", level="WARNING"):
+            computed = self.indicate_errors(
+                enrichment_method, True, solver_parameters={"ksp_max_it": 10}
+            )
+        for e, c in zip(expected, computed):
+            self.assertLess(errornorm(e, c) / norm(e), 1.0e-03)
+
+    @parameterized.expand([["h"], ["p"]])
+    def test_fallback(self, enrichment_method):
+        expected = self.indicate_errors(enrichment_method, False)
+        solver_parameters = {"ksp_max_it": 1, "ksp_rtol": 1.0e-12}
+        with self.assertLogs("goalie", level="WARNING") as cm:
+            computed = self.indicate_errors(enrichment_method, True, solver_parameters)
+        self.assertIn("Falling back to the solver parameters", cm.output[0])
+        for e, c in zip(expected, computed):
+            self.assertTrue(np.isclose(errornorm(e, c) / norm(e), 0.0))
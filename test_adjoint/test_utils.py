@@ -140,3 +140,61 @@ class TestAdjointUtils(unittest.TestCase):
         mesh_seq.qoi_values = np.ones(mesh_seq.params.miniter + 1)
         mesh_seq.qoi_values[-1] = 100.0
         self.assertFalse(mesh_seq.check_qoi_convergence())
+
+
+class TestSubintervalConvergence(unittest.TestCase):
+    """
+    Unit tests for :meth:`~.GoalOrientedMeshSeq.check_subinterval_convergence`.
+    """
+
+    def mesh_seq(self, **parameters):
+        time_partition = TimePartition(1.0, 2, [0.5, 0.5], ["field"])
+        mesh = UnitSquareMesh(1, 1)
+        mesh_seq = GoalOrientedMeshSeq(
+            time_partition, [mesh, mesh], qoi_type="end_time"
+        )
+        mesh_seq.params = GoalOrientedAdaptParameters(parameters)
+        mesh_seq.fp_iteration = mesh_seq.params.miniter
+        num_values = mesh_seq.params.miniter + 1
+        mesh_seq.subinterval_estimator_values = [np.ones(2) for _ in range(num_values)]
+        mesh_seq.subinterval_qoi_values = [np.ones(2) for _ in range(num_values)]
+        return mesh_seq
+
+    def test_values_lt_miniter(self):
+        mesh_seq = self.mesh_seq()
+        mesh_seq.subinterval_estimator_values.pop()
+        mesh_seq.subinterval_qoi_values.pop()
+        self.assertFalse(mesh_seq.check_subinterval_convergence().any())
+
+    def test_values_constant(self):
+        mesh_seq = self.mesh_seq()
+        self.assertTrue(mesh_seq.check_subinterval_convergence().all())
+
+    def test_estimator_not_converged(self):
+        mesh_seq = self.mesh_seq()
+        mesh_seq.subinterval_estimator_values[-1] = np.array([1.0, 2.0])
+        converged = mesh_seq.check_subinterval_convergence()
+        self.assertEqual(list(converged), [True, False])
+
+    def test_qoi_not_converged(self):
+        mesh_seq = self.mesh_seq()
+        mesh_seq.subinterval_qoi_values[-1] = np.array([1.0, 2.0])
+        converged = mesh_seq.check_subinterval_convergence()
+        self.assertEqual(list(converged), [True, False])
+
+    def test_qoi_tolerance_strict(self):
+        mesh_seq = self.mesh_seq(qoi_rtol=0.5)
+        mesh_seq.subinterval_qoi_values[-1] = np.array([1.0, 1.5])
+        converged = mesh_seq.check_subinterval_convergence()
+        self.assertEqual(list(converged), [True, False])
+
+    def test_only_early_subintervals(self):
+        mesh_seq = self.mesh_seq()
+        mesh_seq.subinterval_estimator_values[-1] = np.array([2.0, 1.0])
+        self.assertFalse(mesh_seq.check_subinterval_convergence().any())
+
+    def test_negligible_fraction(self):
+        mesh_seq = self.mesh_seq(estimator_fraction=0.1)
+        mesh_seq.subinterval_estimator_values[-1] = np.array([0.01, 2.0])
+        converged = mesh_seq.check_subinterval_convergence()
+        self.assertEqual(list(converged), [True, False])